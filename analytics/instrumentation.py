@@ -0,0 +1,297 @@
+"""
+J-Genix Studio - Call Instrumentation
+Times service and workflow calls and feeds PerformanceMonitor and pluggable exporters
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from business.concurrency_limiter import get_current_caller
+
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+# INSTRUMENTATION=0 turns every instrumented() wrapper into a single flag check
+_enabled = os.getenv("INSTRUMENTATION", "1").lower() not in ("0", "false", "off", "no")
+
+_current_call: contextvars.ContextVar[Optional["CallRecord"]] = contextvars.ContextVar(
+    "instrumented_call", default=None
+)
+
+# Raised for bad input rather than an upstream failure; recorded as 400 so
+# they don't trip the monitor's server_error alert
+CLIENT_ERRORS: Tuple[type, ...] = (ValueError, TypeError, KeyError)
+
+
+@dataclass
+class CallRecord:
+    """What one instrumented call did
+
+    HTTP, retry and cache counts noted inside nested instrumented calls roll
+    up into the enclosing record, so a workflow's record covers all its
+    service calls. ``http_status`` is the last status seen by this call
+    itself, not by its children.
+    """
+    name: str
+    started_at: float
+    trace_id: Optional[str] = None
+    user_id: Optional[str] = None
+    tier_name: Optional[str] = None
+    parent: Optional[str] = None
+    duration_ms: float = 0.0
+    ok: bool = True
+    error: Optional[str] = None
+    client_error: bool = False
+    http_status: Optional[int] = None
+    http_calls: int = 0
+    retries: int = 0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def status_code(self) -> int:
+        """HTTP-style status for PerformanceMonitor: the upstream status, else 200/400/500 by outcome"""
+        if self.http_status is not None:
+            return self.http_status
+        if self.ok:
+            return 200
+        return 400 if self.client_error else 500
+
+
+class Exporter:
+    """Receives every finished CallRecord; subclasses ship them somewhere"""
+
+    def export(self, record: CallRecord):
+        raise NotImplementedError
+
+    def shutdown(self):
+        """Flush and release resources"""
+
+
+class LoggingExporter(Exporter):
+    """Logs one line per call"""
+
+    def __init__(self, level: int = logging.INFO):
+        self.level = level
+
+    def export(self, record: CallRecord):
+        logger.log(
+            self.level, "%s %.1fms status=%s http=%d retries=%d out=%dB in=%dB cache=%d/%d%s%s",
+            record.name, record.duration_ms, record.status_code, record.http_calls, record.retries,
+            record.bytes_out, record.bytes_in, record.cache_hits, record.cache_hits + record.cache_misses,
+            f" error={record.error}" if record.error else "",
+            f" trace={record.trace_id}" if record.trace_id else ""
+        )
+
+
+# Swapped as a whole so export() can iterate without a lock
+_exporters: Tuple[Exporter, ...] = ()
+_feed_monitor = True
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    """Turn instrumentation on or off for the whole process"""
+    global _enabled
+    _enabled = enabled
+
+
+def add_exporter(exporter: Exporter) -> Exporter:
+    """Register an exporter for every finished call"""
+    global _exporters
+    _exporters = _exporters + (exporter,)
+    return exporter
+
+
+def remove_exporter(exporter: Exporter):
+    global _exporters
+    _exporters = tuple(e for e in _exporters if e is not exporter)
+
+
+def get_exporters() -> List[Exporter]:
+    return list(_exporters)
+
+
+def set_monitor_feed(enabled: bool):
+    """Whether finished calls are also recorded in the shared PerformanceMonitor"""
+    global _feed_monitor
+    _feed_monitor = enabled
+
+
+def current_call() -> Optional[CallRecord]:
+    """The innermost instrumented call running in this context, if any"""
+    return _current_call.get() if _enabled else None
+
+
+def note_http(response, bytes_in: Optional[int] = None):
+    """Attribute a requests.Response to the current call and trace
+
+    Pass ``bytes_in`` for streamed responses, whose ``content`` must not be
+    touched here. A second response within one call counts as a retry.
+    """
+    record = current_call()
+    traced = tracing.current_span() is not None
+    if record is None and not traced:
+        return
+    body = getattr(getattr(response, "request", None), "body", None)
+    bytes_out = len(body) if body else 0
+    if bytes_in is None:
+        bytes_in = len(response.content or b"")
+    if traced:
+        tracing.add_http_span(response, bytes_out, bytes_in)
+    if record is None:
+        return
+    if record.http_calls:
+        record.retries += 1
+    record.http_calls += 1
+    record.http_status = response.status_code
+    record.bytes_out += bytes_out
+    record.bytes_in += bytes_in
+
+
+def note_retry():
+    """Count a retry that didn't get a response (connection error, timeout)"""
+    record = current_call()
+    if record is not None:
+        record.retries += 1
+
+
+def note_cache(hit: bool):
+    """Count a cache lookup made by the current call"""
+    record = current_call()
+    if record is None:
+        return
+    if hit:
+        record.cache_hits += 1
+    else:
+        record.cache_misses += 1
+
+
+@contextmanager
+def instrument(name: str, **attributes) -> Iterator[Optional[CallRecord]]:
+    """Time the block as one call named ``name``; yields its record (None when disabled)"""
+    if not _enabled:
+        yield None
+        return
+
+    parent = _current_call.get()
+    caller = get_current_caller()
+    record = CallRecord(
+        name=name,
+        started_at=time.time(),
+        trace_id=tracing.current_trace_id(),
+        user_id=caller[0] if caller else None,
+        tier_name=caller[1] if caller else None,
+        parent=parent.name if parent else None,
+        attributes=attributes
+    )
+    token = _current_call.set(record)
+    start = time.perf_counter()
+    try:
+        with tracing.span(name, **attributes) as call_span:
+            try:
+                yield record
+            finally:
+                if call_span is not None:
+                    _annotate(call_span, record)
+    except BaseException as e:
+        record.ok = False
+        record.error = type(e).__name__
+        record.client_error = _is_client_error(e)
+        raise
+    finally:
+        record.duration_ms = (time.perf_counter() - start) * 1000
+        _current_call.reset(token)
+        if parent is not None:
+            _roll_up(parent, record)
+        _export(record)
+
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """Decorator recording each call of the function (see ``instrument``)
+
+    ``name`` defaults to the function's module and qualified name.
+    """
+    def decorator(func: Callable) -> Callable:
+        call_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with instrument(call_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with instrument(call_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _annotate(call_span, record: CallRecord):
+    """Copy the call's traffic and cache counts onto its span"""
+    for key, value in (("jgenix.http_calls", record.http_calls), ("jgenix.retries", record.retries),
+                       ("jgenix.bytes_out", record.bytes_out), ("jgenix.bytes_in", record.bytes_in),
+                       ("jgenix.cache_hits", record.cache_hits), ("jgenix.cache_misses", record.cache_misses)):
+        if value:
+            call_span.set_attribute(key, value)
+    if record.user_id:
+        call_span.set_attribute("enduser.id", record.user_id)
+    if record.tier_name:
+        call_span.set_attribute("jgenix.tier", record.tier_name)
+
+
+def _is_client_error(e: BaseException) -> bool:
+    if not isinstance(e, CLIENT_ERRORS):
+        return False
+    # requests' JSONDecodeError is a ValueError but means the upstream sent a bad body
+    requests = sys.modules.get("requests")
+    return requests is None or not isinstance(e, requests.RequestException)
+
+
+def _roll_up(parent: CallRecord, child: CallRecord):
+    parent.http_calls += child.http_calls
+    parent.retries += child.retries
+    parent.bytes_out += child.bytes_out
+    parent.bytes_in += child.bytes_in
+    parent.cache_hits += child.cache_hits
+    parent.cache_misses += child.cache_misses
+
+
+def _export(record: CallRecord):
+    """Hand a finished record to the monitor and exporters; never raises into the caller"""
+    if _feed_monitor:
+        try:
+            from .monitoring import get_performance_monitor
+            get_performance_monitor().record_request(
+                record.name, record.duration_ms, record.status_code, user_id=record.user_id
+            )
+        except Exception as e:
+            logger.warning(f"PerformanceMonitor rejected {record.name}: {str(e)}")
+
+    for exporter in _exporters:
+        try:
+            exporter.export(record)
+        except Exception as e:
+            logger.warning(f"Exporter {type(exporter).__name__} failed: {str(e)}")
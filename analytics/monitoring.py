@@ -4,12 +4,14 @@ ProductAI Pro - Analytics and Monitoring System
 
 import os
 import json
+import threading
+from fnmatch import fnmatchcase
 import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
-import requests
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +35,7 @@ class AnalyticsTracker:
         self.db = database_connection
         self.events_buffer = []
         self.buffer_size = 100
+        self.events_tracked = 0
         
         # Initialize analytics services
         self.google_analytics_id = os.getenv('GA_MEASUREMENT_ID')
@@ -54,6 +57,7 @@ class AnalyticsTracker:
         
         # Add to buffer
         self.events_buffer.append(event)
+        self.events_tracked += 1
         
         # Flush buffer if full
         if len(self.events_buffer) >= self.buffer_size:
@@ -108,6 +112,7 @@ class AnalyticsTracker:
     
     def _send_to_ga4(self, event: UserEvent):
         """Send event to Google Analytics 4"""
+        import requests
         try:
             payload = {
                 "client_id": event.user_id,
@@ -129,6 +134,7 @@ class AnalyticsTracker:
     
     def _send_to_mixpanel(self, event: UserEvent):
         """Send event to Mixpanel"""
+        import requests
         try:
             payload = {
                 "event": event.event_type,
@@ -149,6 +155,7 @@ class AnalyticsTracker:
     
     def _send_to_amplitude(self, event: UserEvent):
         """Send event to Amplitude"""
+        import requests
         try:
             payload = {
                 "api_key": self.amplitude_api_key,
@@ -172,58 +179,88 @@ class AnalyticsTracker:
 class PerformanceMonitor:
     """Monitor application performance and health"""
     
-    def __init__(self):
+    def __init__(self, max_samples: int = 10000):
+        # Per-endpoint history is capped so a long-running process doesn't grow without bound
+        self.max_samples = max_samples
         self.metrics = {}
-        self.alerts = []
+        self.alerts = deque(maxlen=1000)
+        # Alerts raised since start by (type, severity); unlike the deque this never drops
+        self.alert_counts: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
         
         # Performance thresholds
         self.thresholds = {
             "response_time_ms": 5000,
             "error_rate_percent": 5.0,
             "memory_usage_percent": 80.0,
-            "cpu_usage_percent": 80.0
+            "cpu_usage_percent": 80.0,
+            "open_files_percent": 90.0,
+            "gc_pause_ms": 500.0
         }
+        
+        # Response time thresholds by endpoint name pattern (first match wins,
+        # None skips the check); anything unmatched uses "response_time_ms".
+        # Workflows aggregate their service calls, which are checked themselves.
+        self.response_time_thresholds = {
+            "workflow.*": None,
+            "bria.*": 30000,
+            "copywriter.*": 20000
+        }
+        
+        # Alerts are delivered from a background thread, never the request path
+        self._notifications = deque(maxlen=100)
+        self._notify_wake = threading.Event()
+        self._notifier: Optional[threading.Thread] = None
     
     def record_request(self, endpoint: str, response_time_ms: float, 
                       status_code: int, user_id: str = None):
         """Record API request metrics"""
         timestamp = datetime.now()
         
-        # Store in metrics
-        if endpoint not in self.metrics:
-            self.metrics[endpoint] = {
-                "requests": [],
-                "errors": [],
-                "response_times": []
-            }
-        
-        self.metrics[endpoint]["requests"].append({
-            "timestamp": timestamp,
-            "response_time_ms": response_time_ms,
-            "status_code": status_code,
-            "user_id": user_id
-        })
-        
-        if status_code >= 400:
-            self.metrics[endpoint]["errors"].append({
+        with self._lock:
+            # Store in metrics
+            if endpoint not in self.metrics:
+                self.metrics[endpoint] = {
+                    "requests": deque(maxlen=self.max_samples),
+                    "errors": deque(maxlen=self.max_samples),
+                    "response_times": deque(maxlen=self.max_samples)
+                }
+            
+            self.metrics[endpoint]["requests"].append({
                 "timestamp": timestamp,
+                "response_time_ms": response_time_ms,
                 "status_code": status_code,
                 "user_id": user_id
             })
-        
-        self.metrics[endpoint]["response_times"].append(response_time_ms)
+            
+            if status_code >= 400:
+                self.metrics[endpoint]["errors"].append({
+                    "timestamp": timestamp,
+                    "status_code": status_code,
+                    "user_id": user_id
+                })
+            
+            self.metrics[endpoint]["response_times"].append(response_time_ms)
         
         # Check for alerts
         self._check_performance_alerts(endpoint, response_time_ms, status_code)
     
+    def response_time_threshold(self, endpoint: str) -> Optional[float]:
+        """Response time threshold in ms for an endpoint, or None if it isn't checked"""
+        for pattern, threshold in self.response_time_thresholds.items():
+            if fnmatchcase(endpoint, pattern):
+                return threshold
+        return self.thresholds["response_time_ms"]
+    
     def _check_performance_alerts(self, endpoint: str, response_time_ms: float, status_code: int):
         """Check if performance metrics exceed thresholds"""
         # Response time alert
-        if response_time_ms > self.thresholds["response_time_ms"]:
+        threshold = self.response_time_threshold(endpoint)
+        if threshold is not None and response_time_ms > threshold:
             self._create_alert("high_response_time", {
                 "endpoint": endpoint,
                 "response_time_ms": response_time_ms,
-                "threshold": self.thresholds["response_time_ms"]
+                "threshold": threshold
             })
         
         # Error rate alert
@@ -233,6 +270,10 @@ class PerformanceMonitor:
                 "status_code": status_code
             })
     
+    def record_alert(self, alert_type: str, data: Dict[str, Any]):
+        """Raise an alert detected outside the request path (e.g. by the resource sampler)"""
+        self._create_alert(alert_type, data)
+    
     def _create_alert(self, alert_type: str, data: Dict[str, Any]):
         """Create performance alert"""
         alert = {
@@ -242,11 +283,37 @@ class PerformanceMonitor:
             "severity": self._get_alert_severity(alert_type)
         }
         
-        self.alerts.append(alert)
+        key = (alert_type, alert["severity"])
+        with self._lock:
+            self.alerts.append(alert)
+            self.alert_counts[key] = self.alert_counts.get(key, 0) + 1
         logger.warning(f"Performance alert: {alert_type} - {data}")
         
         # Send to monitoring service (e.g., PagerDuty, Slack)
-        self._send_alert_notification(alert)
+        if os.getenv('SLACK_WEBHOOK_URL'):
+            self._queue_notification(alert)
+    
+    def alert_totals(self) -> Dict[Tuple[str, str], int]:
+        """Alerts raised since start by (type, severity)"""
+        with self._lock:
+            return dict(self.alert_counts)
+    
+    def _queue_notification(self, alert: Dict[str, Any]):
+        """Hand an alert to the notifier thread; the oldest are dropped if it falls behind"""
+        self._notifications.append(alert)
+        if self._notifier is None:
+            with self._lock:
+                if self._notifier is None:
+                    self._notifier = threading.Thread(target=self._notify_loop, name="alert-notifier", daemon=True)
+                    self._notifier.start()
+        self._notify_wake.set()
+    
+    def _notify_loop(self):
+        while True:
+            self._notify_wake.wait()
+            self._notify_wake.clear()
+            while self._notifications:
+                self._send_alert_notification(self._notifications.popleft())
     
     def _get_alert_severity(self, alert_type: str) -> str:
         """Get alert severity level"""
@@ -260,6 +327,7 @@ class PerformanceMonitor:
     
     def _send_alert_notification(self, alert: Dict[str, Any]):
         """Send alert notification to monitoring services"""
+        import requests
         # Slack notification
         slack_webhook = os.getenv('SLACK_WEBHOOK_URL')
         if slack_webhook:
@@ -284,9 +352,13 @@ class PerformanceMonitor:
         cutoff_time = datetime.now() - timedelta(hours=hours)
         summary = {}
         
-        for endpoint, data in self.metrics.items():
-            recent_requests = [r for r in data["requests"] if r["timestamp"] > cutoff_time]
-            recent_errors = [e for e in data["errors"] if e["timestamp"] > cutoff_time]
+        with self._lock:
+            snapshot = {endpoint: (list(data["requests"]), list(data["errors"]))
+                        for endpoint, data in self.metrics.items()}
+        
+        for endpoint, (requests_seen, errors_seen) in snapshot.items():
+            recent_requests = [r for r in requests_seen if r["timestamp"] > cutoff_time]
+            recent_errors = [e for e in errors_seen if e["timestamp"] > cutoff_time]
             
             if recent_requests:
                 response_times = [r["response_time_ms"] for r in recent_requests]
@@ -301,6 +373,36 @@ class PerformanceMonitor:
         
         return summary
 
+_performance_monitor: Optional[PerformanceMonitor] = None
+_performance_monitor_lock = threading.Lock()
+
+def get_performance_monitor() -> PerformanceMonitor:
+    """Get the process-wide performance monitor"""
+    global _performance_monitor
+    if _performance_monitor is None:
+        with _performance_monitor_lock:
+            if _performance_monitor is None:
+                _performance_monitor = PerformanceMonitor()
+    return _performance_monitor
+
+def set_performance_monitor(monitor: PerformanceMonitor):
+    """Replace the process-wide performance monitor"""
+    global _performance_monitor
+    with _performance_monitor_lock:
+        _performance_monitor = monitor
+
+_analytics_tracker: Optional[AnalyticsTracker] = None
+_analytics_tracker_lock = threading.Lock()
+
+def get_analytics_tracker() -> AnalyticsTracker:
+    """Get the process-wide analytics tracker"""
+    global _analytics_tracker
+    if _analytics_tracker is None:
+        with _analytics_tracker_lock:
+            if _analytics_tracker is None:
+                _analytics_tracker = AnalyticsTracker()
+    return _analytics_tracker
+
 class BusinessMetricsTracker:
     """Track business-specific metrics"""
     
@@ -0,0 +1,253 @@
+"""
+J-Genix Studio - Sampling Profiler
+Samples live threads' stacks into flamegraph-ready folded stacks, for the next N reruns or a worker
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_INTERVAL = 0.01  # 100 Hz keeps the sampler's GIL time around 1% of a busy thread
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PATH_PREFIXES = sorted({p for p in (_REPO_ROOT, sys.prefix, sys.base_prefix) if p}, key=len, reverse=True)
+
+
+def profile_dir() -> str:
+    """Where profiles are written (PROFILE_DIR, default ./profiles)"""
+    return os.getenv("PROFILE_DIR", os.path.join(_REPO_ROOT, "profiles"))
+
+
+def _short_path(path: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if path.startswith(prefix):
+            path = path[len(prefix):].lstrip(os.sep)
+            break
+    # site-packages/streamlit/... -> streamlit/...
+    marker = "site-packages" + os.sep
+    return path.split(marker, 1)[-1]
+
+
+class SamplingProfiler:
+    """Aggregates the stacks of a set of threads, sampled from a background thread
+
+    Each sample reads ``sys._current_frames()`` and walks only the attached
+    threads' frames, so the profiled code runs unmodified. Stacks are kept
+    as folded strings ("outer;inner;leaf" -> samples), the input format of
+    flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, label: str = "profile", max_depth: int = 200):
+        self.interval = interval
+        self.label = label
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampled_seconds = 0.0
+        self.path: Optional[str] = None
+        self._threads: Set[int] = set()
+        self._lock = threading.Lock()
+        self._frame_names: Dict[Tuple[object, int], str] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def attach(self, thread_ident: Optional[int] = None):
+        """Start sampling a thread (the calling thread by default)"""
+        with self._lock:
+            self._threads.add(thread_ident or threading.get_ident())
+            if self._sampler is None:
+                self._stop.clear()
+                self._sampler = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._sampler.start()
+
+    def detach(self, thread_ident: Optional[int] = None):
+        """Stop sampling a thread; the sampler thread exits when none are left"""
+        with self._lock:
+            self._threads.discard(thread_ident or threading.get_ident())
+            sampler = self._sampler if not self._threads else None
+            if sampler is not None:
+                self._sampler = None
+                self._stop.set()
+        if sampler is not None and sampler is not threading.current_thread():
+            sampler.join()
+
+    def is_attached(self, thread_ident: Optional[int] = None) -> bool:
+        with self._lock:
+            return (thread_ident or threading.get_ident()) in self._threads
+
+    def _frame_name(self, frame) -> str:
+        code = frame.f_code
+        # Keyed on the code object itself: Streamlit recompiles app.py every run, so ids get reused
+        key = (code, frame.f_lineno)
+        name = self._frame_names.get(key)
+        if name is None:
+            name = self._frame_names[key] = f"{code.co_name} ({_short_path(code.co_filename)}:{frame.f_lineno})"
+        return name
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            with self._lock:
+                threads = list(self._threads)
+            frames = sys._current_frames()
+            for ident in threads:
+                frame = frames.get(ident)
+                names = []
+                while frame is not None and len(names) < self.max_depth:
+                    names.append(self._frame_name(frame))
+                    frame = frame.f_back
+                if names:
+                    self.stacks[";".join(reversed(names))] += 1
+                    self.samples += 1
+            del frames
+            self.sampled_seconds += time.perf_counter() - started
+
+    def folded(self) -> str:
+        """Folded stacks, one "frame;frame;frame count" line each"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def hotspots(self, limit: int = 15) -> List[Dict[str, object]]:
+        """Frames by self samples (time at the top of the stack) and total samples"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [{
+            "frame": frame,
+            "self_pct": 100.0 * count / self.samples if self.samples else 0.0,
+            "total_pct": 100.0 * total[frame] / self.samples if self.samples else 0.0,
+            "samples": count
+        } for frame, count in own.most_common(limit)]
+
+    def save(self, directory: Optional[str] = None) -> str:
+        """Write the folded stacks to ``<directory>/<label>-<timestamp>.folded``"""
+        directory = directory or profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "-" for c in self.label)
+        path = os.path.join(directory, f"{safe_label}-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        self.path = path
+        return path
+
+
+class RerunProfiler:
+    """Profiles the next ``reruns`` script runs, optionally of a single session
+
+    The app wraps each run in ``rerun()``. Nested runs on the same thread
+    (a tab fragment inside a full run) count once. The profile is saved
+    when the last rerun finishes.
+    """
+
+    def __init__(self, reruns: int, session_id: Optional[str] = None,
+                 interval: float = DEFAULT_INTERVAL, label: str = "reruns"):
+        self.session_id = session_id
+        self.remaining = reruns
+        self.completed = 0
+        self.profiler = SamplingProfiler(interval=interval, label=label)
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.remaining <= 0 and not self.profiler._threads
+
+    @contextmanager
+    def rerun(self, session_id: Optional[str] = None) -> Iterator[bool]:
+        """Sample the calling thread for the block if this run is one to profile"""
+        with self._lock:
+            take = (self.remaining > 0 and not self.profiler.is_attached()
+                    and (self.session_id is None or self.session_id == session_id))
+            if take:
+                self.remaining -= 1
+        if not take:
+            yield False
+            return
+
+        self.profiler.attach()
+        try:
+            yield True
+        finally:
+            self.profiler.detach()
+            with self._lock:
+                self.completed += 1
+                finished = self.remaining <= 0 and not self.profiler._threads
+            if finished:
+                self.profiler.save()
+
+
+_rerun_profiler: Optional[RerunProfiler] = None
+_thread_profiles: List[SamplingProfiler] = []
+_registry_lock = threading.Lock()
+
+
+def arm_rerun_profiler(reruns: int, session_id: Optional[str] = None,
+                       interval: float = DEFAULT_INTERVAL) -> RerunProfiler:
+    """Profile the next ``reruns`` script runs in this process (replaces any armed profiler)"""
+    global _rerun_profiler
+    label = f"reruns-{session_id[:8]}" if session_id else "reruns-all"
+    with _registry_lock:
+        _rerun_profiler = RerunProfiler(reruns, session_id, interval, label)
+        return _rerun_profiler
+
+
+def get_rerun_profiler() -> Optional[RerunProfiler]:
+    return _rerun_profiler
+
+
+@contextmanager
+def profile_rerun(session_id: Optional[str] = None) -> Iterator[bool]:
+    """Wrap one script run; samples it if an armed profiler wants it (cheap otherwise)"""
+    profiler = _rerun_profiler
+    if profiler is None or profiler.remaining <= 0:
+        yield False
+        return
+    with profiler.rerun(session_id) as sampled:
+        yield sampled
+
+
+def list_threads() -> List[Tuple[int, str]]:
+    """(ident, name) of live threads, for choosing a worker to profile"""
+    return sorted(((t.ident, t.name) for t in threading.enumerate() if t.ident is not None),
+                  key=lambda item: item[1])
+
+
+def profile_thread(thread_ident: int, seconds: float, interval: float = DEFAULT_INTERVAL,
+                   label: Optional[str] = None) -> SamplingProfiler:
+    """Sample a running thread (e.g. a job worker) for ``seconds``, then save; returns immediately"""
+    names = dict(list_threads())
+    profiler = SamplingProfiler(interval=interval, label=label or f"thread-{names.get(thread_ident, thread_ident)}")
+    profiler.attach(thread_ident)
+
+    def finish():
+        profiler.detach(thread_ident)
+        profiler.save()
+
+    timer = threading.Timer(seconds, finish)
+    timer.daemon = True
+    timer.start()
+    with _registry_lock:
+        _thread_profiles.append(profiler)
+        del _thread_profiles[:-20]
+    return profiler
+
+
+def get_thread_profiles() -> List[SamplingProfiler]:
+    """Worker profiles started with profile_thread, oldest first"""
+    with _registry_lock:
+        return list(_thread_profiles)
+
+
+def list_profiles(limit: int = 20) -> List[str]:
+    """Saved profile paths, newest first"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".folded")]
+    return sorted(paths, key=os.path.getmtime, reverse=True)[:limit]
@@ -0,0 +1,360 @@
+"""
+J-Genix Studio - Prometheus Exporter
+Serves call, queue, cache and resource metrics in the Prometheus text format on a side port (METRICS_PORT)
+"""
+
+import logging
+import os
+import sys
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import instrumentation
+from .instrumentation import CallRecord, Exporter
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "jgenix"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; Bria generations take a few seconds, cache hits well under one
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    """One metric family's HELP/TYPE header and samples, rendered in order"""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = f"{PREFIX}_{name}"
+        self.kind = kind
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, Any], float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels):
+        self.samples.append((suffix, labels, value))
+        return self
+
+    def render(self) -> Iterable[str]:
+        if not self.samples:
+            return
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for suffix, labels, value in self.samples:
+            yield f"{self.name}{suffix}{_labels(labels)} {_number(value)}"
+
+
+class _EndpointStats:
+    """Running totals for one instrumented call name"""
+
+    __slots__ = ("calls", "bucket_counts", "duration_sum", "bytes_out", "bytes_in",
+                 "http_calls", "retries", "cache_hits", "cache_misses")
+
+    def __init__(self, bucket_count: int):
+        self.calls: Dict[str, int] = {}
+        self.bucket_counts = [0] * bucket_count
+        self.duration_sum = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.http_calls = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class PrometheusExporter(Exporter):
+    """Aggregates CallRecords into counters and latency histograms
+
+    Each record costs a dictionary lookup and a bisect under a lock, and a
+    scrape only walks the aggregates, so scraping every few seconds is
+    cheap whatever the traffic. A workflow's traffic counters include the
+    calls it made, so sum over ``endpoint=~"bria\\..*|copywriter\\..*"``
+    for totals.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointStats] = {}
+
+    def export(self, record: CallRecord):
+        seconds = record.duration_ms / 1000
+        with self._lock:
+            stats = self._endpoints.get(record.name)
+            if stats is None:
+                stats = self._endpoints[record.name] = _EndpointStats(len(self.buckets))
+            status = str(record.status_code)
+            stats.calls[status] = stats.calls.get(status, 0) + 1
+            # Non-cumulative here; made cumulative when rendered
+            index = bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                stats.bucket_counts[index] += 1
+            stats.duration_sum += seconds
+            stats.bytes_out += record.bytes_out
+            stats.bytes_in += record.bytes_in
+            stats.http_calls += record.http_calls
+            stats.retries += record.retries
+            stats.cache_hits += record.cache_hits
+            stats.cache_misses += record.cache_misses
+
+    def render(self) -> str:
+        """The full exposition: call metrics plus queue, cache and monitor gauges"""
+        families = self._call_families()
+        for collect in (_limiter_families, _scheduler_families, _cache_families, _monitor_families,
+                        _resource_families):
+            try:
+                families.extend(collect())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collect.__name__} failed: {str(e)}")
+        lines = [line for family in families for line in family.render()]
+        return "\n".join(lines) + "\n"
+
+    def _call_families(self) -> List[_Family]:
+        calls = _Family("calls_total", "counter", "Instrumented service and workflow calls by status")
+        duration = _Family("call_duration_seconds", "histogram", "Call wall time, including limiter waits")
+        bytes_out = _Family("call_bytes_sent_total", "counter", "Request body bytes sent upstream")
+        bytes_in = _Family("call_bytes_received_total", "counter", "Response body bytes received")
+        http_calls = _Family("upstream_requests_total", "counter", "HTTP requests made to upstream APIs")
+        retries = _Family("call_retries_total", "counter", "Upstream retries and fallbacks")
+        cache = _Family("call_cache_lookups_total", "counter", "Cache lookups made by calls, by result")
+
+        with self._lock:
+            snapshot = [(name, stats.calls.copy(), list(stats.bucket_counts), stats.duration_sum,
+                         stats.bytes_out, stats.bytes_in, stats.http_calls, stats.retries,
+                         stats.cache_hits, stats.cache_misses)
+                        for name, stats in sorted(self._endpoints.items())]
+
+        for (name, by_status, bucket_counts, duration_sum, sent, received,
+             upstream, retried, hits, misses) in snapshot:
+            for status, count in sorted(by_status.items()):
+                calls.add(count, endpoint=name, status=status)
+            cumulative = 0
+            for bound, count in zip(self.buckets, bucket_counts):
+                cumulative += count
+                duration.add(cumulative, "_bucket", endpoint=name, le=_number(float(bound)))
+            total = sum(by_status.values())
+            duration.add(total, "_bucket", endpoint=name, le="+Inf")
+            duration.add(duration_sum, "_sum", endpoint=name)
+            duration.add(total, "_count", endpoint=name)
+            bytes_out.add(sent, endpoint=name)
+            bytes_in.add(received, endpoint=name)
+            http_calls.add(upstream, endpoint=name)
+            retries.add(retried, endpoint=name)
+            if hits or misses:
+                cache.add(hits, endpoint=name, result="hit")
+                cache.add(misses, endpoint=name, result="miss")
+        return [calls, duration, bytes_out, bytes_in, http_calls, retries, cache]
+
+
+def _limiter_families() -> List[_Family]:
+    from business.concurrency_limiter import get_limiter_metrics
+
+    in_flight = _Family("limiter_in_flight", "gauge", "Calls holding a limiter slot")
+    capacity = _Family("limiter_max_in_flight", "gauge", "Node-wide limiter capacity")
+    queued = _Family("limiter_queue_depth", "gauge", "Calls waiting for a limiter slot")
+    queued_by_tier = _Family("limiter_queue_depth_by_tier", "gauge", "Calls waiting for a limiter slot, by tier")
+    acquired = _Family("limiter_acquired_total", "counter", "Limiter slots granted")
+    timeouts = _Family("limiter_timeouts_total", "counter", "Limiter waits that timed out")
+    for name, metrics in sorted(get_limiter_metrics().items()):
+        in_flight.add(metrics["in_flight"], limiter=name)
+        capacity.add(metrics["max_in_flight"], limiter=name)
+        queued.add(metrics["queue_depth"], limiter=name)
+        for tier, depth in sorted(metrics["queue_depth_by_tier"].items()):
+            queued_by_tier.add(depth, limiter=name, tier=tier)
+        acquired.add(metrics["acquired_total"], limiter=name)
+        timeouts.add(metrics["timeouts_total"], limiter=name)
+    return [in_flight, capacity, queued, queued_by_tier, acquired, timeouts]
+
+
+def _scheduler_families() -> List[_Family]:
+    # Only report a scheduler the app has already created
+    module = sys.modules.get("workflows.job_scheduler")
+    scheduler = getattr(module, "_scheduler", None)
+    if scheduler is None:
+        return []
+    metrics = scheduler.get_metrics()
+    workers = _Family("scheduler_workers", "gauge", "Job scheduler worker threads").add(metrics["workers"])
+    running = _Family("scheduler_running", "gauge", "Jobs running").add(metrics["running"])
+    queued = _Family("scheduler_queue_depth", "gauge", "Jobs waiting").add(metrics["queued"])
+    queued_by_tier = _Family("scheduler_queue_depth_by_tier", "gauge", "Jobs waiting, by tier")
+    for tier, depth in sorted(metrics["queued_by_tier"].items()):
+        queued_by_tier.add(depth, tier=tier)
+    completed = _Family("scheduler_jobs_completed_total", "counter", "Finished jobs by outcome")
+    for status, count in sorted(metrics["completed"].items()):
+        completed.add(count, status=status)
+    return [workers, running, queued, queued_by_tier, completed]
+
+
+def _cache_families() -> List[_Family]:
+    caches: Dict[str, Dict[str, Any]] = {}
+    image_cache = getattr(sys.modules.get("services.image_cache"), "_image_cache", None)
+    if image_cache is not None:
+        stats = image_cache.get_stats()
+        caches["images"] = stats["images"]
+        caches["thumbnails"] = stats["thumbnails"]
+    decode_cache = getattr(sys.modules.get("services.image_decode"), "_decode_cache", None)
+    if decode_cache is not None:
+        stats = decode_cache.get_stats()
+        caches["canvas_backgrounds"] = stats["backgrounds"]
+        caches["upload_previews"] = stats["previews"]
+    if not caches:
+        return []
+
+    lookups = _Family("cache_lookups_total", "counter", "Cache lookups by result")
+    evictions = _Family("cache_evictions_total", "counter", "Entries evicted to stay under budget")
+    hit_ratio = _Family("cache_hit_ratio", "gauge", "Hits over lookups since start")
+    size = _Family("cache_bytes", "gauge", "Bytes held")
+    budget = _Family("cache_max_bytes", "gauge", "Byte budget")
+    entries = _Family("cache_entries", "gauge", "Entries held")
+    for name, stats in caches.items():
+        lookups.add(stats["hits"], cache=name, result="hit")
+        lookups.add(stats["misses"], cache=name, result="miss")
+        evictions.add(stats["evictions"], cache=name)
+        hit_ratio.add(stats["hit_rate"], cache=name)
+        size.add(stats["bytes"], cache=name)
+        budget.add(stats["max_bytes"], cache=name)
+        entries.add(stats["entries"], cache=name)
+    return [lookups, evictions, hit_ratio, size, budget, entries]
+
+
+def _monitor_families() -> List[_Family]:
+    module = sys.modules.get("analytics.monitoring")
+    if module is None:
+        return []
+    families = []
+    monitor = getattr(module, "_performance_monitor", None)
+    if monitor is not None:
+        alerts = _Family("performance_alerts_total", "counter", "PerformanceMonitor alerts raised, by type")
+        for (alert_type, severity), count in sorted(monitor.alert_totals().items()):
+            alerts.add(count, type=alert_type, severity=severity)
+        families.append(alerts)
+    tracker = getattr(module, "_analytics_tracker", None)
+    if tracker is not None:
+        families.append(_Family("analytics_events_total", "counter", "Events passed to AnalyticsTracker")
+                        .add(tracker.events_tracked))
+        families.append(_Family("analytics_events_buffered", "gauge", "Events waiting to be flushed")
+                        .add(len(tracker.events_buffer)))
+    return families
+
+
+def _resource_families() -> List[_Family]:
+    sampler = getattr(sys.modules.get("analytics.resource_sampler"), "_sampler", None)
+    sample = sampler.latest if sampler is not None else None
+    if sample is None:
+        return []
+    families = []
+    for name, help_text, value in (
+        ("process_cpu_percent", "Process CPU over the last interval, of the CPUs available to it",
+         sample.process_cpu_percent),
+        ("host_cpu_percent", "Host CPU busy over the last interval", sample.host_cpu_percent),
+        ("process_resident_memory_bytes", "Process RSS", sample.rss_bytes),
+        ("memory_used_bytes", "Container working set (or host used memory)", sample.memory_used_bytes),
+        ("memory_limit_bytes", "Container memory.max (or host total)", sample.memory_limit_bytes),
+        ("memory_usage_percent", "Used over limit", sample.memory_usage_percent),
+        ("process_open_fds", "Open file descriptors", sample.open_fds),
+        ("process_max_fds", "File descriptor soft limit", sample.fd_limit),
+        ("process_threads", "Process threads", sample.threads),
+        ("gc_pause_max_milliseconds", "Longest GC pause in the last interval", sample.gc_pause_max_ms),
+    ):
+        if value is not None:
+            families.append(_Family(name, "gauge", help_text).add(value))
+    collections = _Family("gc_collections_total", "counter", "Garbage collections by generation")
+    for generation, count in enumerate(sample.gc_collections):
+        collections.add(count, generation=generation)
+    families.append(collections)
+    families.append(_Family("gc_pause_seconds_total", "counter", "Time spent in garbage collection")
+                    .add(sampler.gc_tracker.total_ms / 1000))
+    return families
+
+
+_exporter: Optional[PrometheusExporter] = None
+_server: Optional[ThreadingHTTPServer] = None
+_bind_failed = False
+_server_lock = threading.Lock()
+
+
+def get_prometheus_exporter() -> PrometheusExporter:
+    """Get the process-wide exporter, registering it with instrumentation on first use"""
+    global _exporter
+    if _exporter is None:
+        with _server_lock:
+            if _exporter is None:
+                _exporter = instrumentation.add_exporter(PrometheusExporter())
+    return _exporter
+
+
+def _handler_class(exporter: PrometheusExporter):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = exporter.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # one line per scrape is noise
+
+    return MetricsHandler
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics on a daemon thread (METRICS_PORT, METRICS_HOST)
+
+    Safe to call on every Streamlit rerun: the server starts once per
+    process. Returns None when no port is configured or it can't be bound.
+    """
+    global _server, _bind_failed
+    if port is None:
+        port = int(os.getenv("METRICS_PORT", "0") or 0)
+    if not port or _bind_failed:
+        return None
+    if _server is not None:
+        return _server
+
+    exporter = get_prometheus_exporter()
+    with _server_lock:
+        if _server is None:
+            host = host or os.getenv("METRICS_HOST", "0.0.0.0")
+            try:
+                server = ThreadingHTTPServer((host, port), _handler_class(exporter))
+            except OSError as e:
+                # Usually another app process already serves this port; don't retry every rerun
+                _bind_failed = True
+                logger.warning(f"Metrics server not started on {host}:{port}: {str(e)}")
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            logger.info(f"Serving Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+            _server = server
+    return _server
+
+
+def stop_metrics_server():
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.shutdown()
+            _server.server_close()
+            _server = None
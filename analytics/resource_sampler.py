@@ -0,0 +1,380 @@
+"""
+J-Genix Studio - Resource Sampler
+Samples process and host CPU, memory, file descriptors, threads and GC pauses, and alerts on PerformanceMonitor thresholds
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .monitoring import PerformanceMonitor, get_performance_monitor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 15.0
+# Re-raise an alert that stays over threshold at most this often
+DEFAULT_REALERT_SECONDS = 300.0
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    if value is None or value == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _read_keyed(path: str) -> Dict[str, int]:
+    """``key value`` lines (memory.stat, /proc/meminfo) as a dict; units are dropped"""
+    values = {}
+    for line in (_read(path) or "").splitlines():
+        parts = line.replace(":", " ").split()
+        if len(parts) >= 2 and parts[1].isdigit():
+            values[parts[0]] = int(parts[1])
+    return values
+
+
+def _process_stat() -> Optional[Tuple[int, int, int]]:
+    """(utime + stime in ticks, threads, rss pages) from /proc/self/stat"""
+    stat = _read("/proc/self/stat")
+    if stat is None:
+        return None
+    # The command name may contain spaces; fields after it are fixed
+    fields = stat[stat.rindex(")") + 2:].split()
+    return int(fields[11]) + int(fields[12]), int(fields[17]), int(fields[21])
+
+
+def _host_cpu_ticks() -> Optional[Tuple[int, int]]:
+    """(busy, total) jiffies across all CPUs from /proc/stat"""
+    line = (_read("/proc/stat") or "").split("\n", 1)[0]
+    if not line.startswith("cpu "):
+        return None
+    ticks = [int(v) for v in line.split()[1:]]
+    idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)  # idle + iowait
+    total = sum(ticks[:8])  # guest time is already counted in user
+    return total - idle, total
+
+
+def _cgroup_memory() -> Tuple[Optional[int], Optional[int]]:
+    """(working set bytes, limit bytes) of this container's cgroup, v2 or v1
+
+    The working set leaves out inactive page cache, which the kernel
+    reclaims before it OOM-kills, matching what Kubernetes evicts on.
+    """
+    limit = _read_int(os.path.join(_CGROUP_ROOT, "memory.max"))
+    if limit is not None or os.path.exists(os.path.join(_CGROUP_ROOT, "memory.current")):
+        usage = _read_int(os.path.join(_CGROUP_ROOT, "memory.current"))
+        inactive = _read_keyed(os.path.join(_CGROUP_ROOT, "memory.stat")).get("inactive_file", 0)
+    else:
+        v1 = os.path.join(_CGROUP_ROOT, "memory")
+        limit = _read_int(os.path.join(v1, "memory.limit_in_bytes"))
+        usage = _read_int(os.path.join(v1, "memory.usage_in_bytes"))
+        inactive = _read_keyed(os.path.join(v1, "memory.stat")).get("total_inactive_file", 0)
+    if usage is not None:
+        usage = max(usage - inactive, 0)
+    return usage, limit
+
+
+def _available_cpus() -> float:
+    """CPUs this process may use: the cgroup CPU quota if set, else its affinity mask"""
+    quota = _read(os.path.join(_CGROUP_ROOT, "cpu.max"))
+    if quota and not quota.startswith("max"):
+        limit, period = quota.split()[:2]
+        return int(limit) / int(period)
+    v1_quota = _read_int(os.path.join(_CGROUP_ROOT, "cpu", "cpu.cfs_quota_us"))
+    v1_period = _read_int(os.path.join(_CGROUP_ROOT, "cpu", "cpu.cfs_period_us"))
+    if v1_quota and v1_quota > 0 and v1_period:
+        return v1_quota / v1_period
+    if hasattr(os, "sched_getaffinity"):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+def _open_fds() -> Optional[int]:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def _fd_limit() -> Optional[int]:
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        return soft if soft != resource.RLIM_INFINITY else None
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+class GCPauseTracker:
+    """Times every garbage collection through ``gc.callbacks``
+
+    Collections run on whichever thread triggered them and stop the whole
+    interpreter, so each pause is added to that request's latency.
+    """
+
+    def __init__(self, max_pauses: int = 10000):
+        self.pauses: Deque[Tuple[float, float, int]] = deque(maxlen=max_pauses)  # (ended_at, ms, generation)
+        self.collections = [0, 0, 0]
+        self.total_ms = 0.0
+        self._started: Dict[int, float] = {}
+
+    def _callback(self, phase: str, info: Dict[str, Any]):
+        thread = threading.get_ident()
+        if phase == "start":
+            self._started[thread] = time.perf_counter()
+            return
+        started = self._started.pop(thread, None)
+        if started is None:
+            return
+        pause_ms = (time.perf_counter() - started) * 1000
+        generation = info.get("generation", 0)
+        self.pauses.append((time.time(), pause_ms, generation))
+        self.collections[generation] += 1
+        self.total_ms += pause_ms
+
+    def install(self):
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def since(self, timestamp: float) -> List[float]:
+        """Pause lengths in ms of collections that ended after ``timestamp``"""
+        return [ms for ended_at, ms, _ in list(self.pauses) if ended_at > timestamp]
+
+
+@dataclass
+class ResourceSample:
+    """One reading; fields are None where the platform doesn't expose them"""
+    timestamp: float
+    process_cpu_percent: Optional[float] = None  # of the CPUs available to the process
+    host_cpu_percent: Optional[float] = None
+    available_cpus: Optional[float] = None
+    rss_bytes: Optional[int] = None
+    memory_used_bytes: Optional[int] = None  # cgroup working set, else host used memory
+    memory_limit_bytes: Optional[int] = None  # cgroup memory.max, else host MemTotal
+    memory_usage_percent: Optional[float] = None
+    open_fds: Optional[int] = None
+    fd_limit: Optional[int] = None
+    threads: Optional[int] = None
+    gc_collections: List[int] = field(default_factory=list)
+    gc_pauses: int = 0  # since the previous sample
+    gc_pause_total_ms: float = 0.0
+    gc_pause_max_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ResourceSampler:
+    """Samples resources on a background thread and raises resource_exhaustion alerts
+
+    Memory and CPU are checked against ``monitor.thresholds``
+    (``memory_usage_percent``, ``cpu_usage_percent``), plus
+    ``open_files_percent`` and ``gc_pause_ms``. An alert fires when a value
+    first crosses its threshold and again every ``realert_seconds`` while
+    it stays over, so a slow leak pages once rather than every sample.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, monitor: Optional[PerformanceMonitor] = None,
+                 history: int = 240, realert_seconds: float = DEFAULT_REALERT_SECONDS):
+        self.interval = interval
+        self.monitor = monitor
+        self.realert_seconds = realert_seconds
+        self.history: Deque[ResourceSample] = deque(maxlen=history)
+        self.gc_tracker = GCPauseTracker()
+        self._last_cpu: Optional[Tuple[float, int]] = None
+        self._last_host: Optional[Tuple[int, int]] = None
+        self._last_sample_at = time.time()
+        self._alerted_at: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def latest(self) -> Optional[ResourceSample]:
+        return self.history[-1] if self.history else None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.gc_tracker.install()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self.gc_tracker.uninstall()
+
+    def _run(self):
+        while True:
+            try:
+                self.check(self.sample())
+            except Exception as e:
+                logger.warning(f"Resource sample failed: {str(e)}")
+            if self._stop.wait(self.interval):
+                return
+
+    def sample(self) -> ResourceSample:
+        """Take a reading and append it to ``history``
+
+        CPU percentages are averages since the previous reading, so the
+        first one has none.
+        """
+        now = time.time()
+        sample = ResourceSample(timestamp=now, available_cpus=_available_cpus())
+
+        stat = _process_stat()
+        if stat is not None:
+            cpu_ticks, sample.threads, rss_pages = stat
+            sample.rss_bytes = rss_pages * _PAGE_SIZE
+            wall = time.monotonic()
+            if self._last_cpu is not None and wall > self._last_cpu[0]:
+                cpu_seconds = (cpu_ticks - self._last_cpu[1]) / _CLOCK_TICKS
+                sample.process_cpu_percent = 100.0 * cpu_seconds / (wall - self._last_cpu[0]) / sample.available_cpus
+            self._last_cpu = (wall, cpu_ticks)
+        else:
+            sample.threads = threading.active_count()
+
+        host = _host_cpu_ticks()
+        if host is not None:
+            if self._last_host is not None and host[1] > self._last_host[1]:
+                sample.host_cpu_percent = 100.0 * (host[0] - self._last_host[0]) / (host[1] - self._last_host[1])
+            self._last_host = host
+
+        meminfo = _read_keyed("/proc/meminfo")
+        host_total = meminfo.get("MemTotal", 0) * 1024 or None
+        used, limit = _cgroup_memory()
+        if limit is not None and (host_total is None or limit < host_total):
+            sample.memory_used_bytes, sample.memory_limit_bytes = used, limit
+        elif host_total is not None and "MemAvailable" in meminfo:
+            # No container limit (v1 reports a huge number): the host is the limit
+            sample.memory_used_bytes = host_total - meminfo["MemAvailable"] * 1024
+            sample.memory_limit_bytes = host_total
+        if sample.memory_used_bytes is not None and sample.memory_limit_bytes:
+            sample.memory_usage_percent = 100.0 * sample.memory_used_bytes / sample.memory_limit_bytes
+
+        sample.open_fds = _open_fds()
+        sample.fd_limit = _fd_limit()
+
+        pauses = self.gc_tracker.since(self._last_sample_at)
+        sample.gc_collections = list(self.gc_tracker.collections)
+        sample.gc_pauses = len(pauses)
+        sample.gc_pause_total_ms = sum(pauses)
+        sample.gc_pause_max_ms = max(pauses, default=0.0)
+        self._last_sample_at = now
+
+        self.history.append(sample)
+        return sample
+
+    def rss_growth_mb_per_hour(self, min_span_seconds: float = 300.0) -> Optional[float]:
+        """RSS trend over the retained history; a steady positive value is a leak
+
+        None until the history spans ``min_span_seconds``; shorter windows
+        extrapolate one burst of allocation into a huge hourly rate.
+        """
+        samples = [s for s in list(self.history) if s.rss_bytes is not None]
+        if len(samples) < 2 or samples[-1].timestamp - samples[0].timestamp < min_span_seconds:
+            return None
+        growth = samples[-1].rss_bytes - samples[0].rss_bytes
+        return growth / (1024 * 1024) / ((samples[-1].timestamp - samples[0].timestamp) / 3600)
+
+    def check(self, sample: ResourceSample) -> List[str]:
+        """Raise alerts for thresholds the sample exceeds; returns the resources alerted on"""
+        monitor = self.monitor or get_performance_monitor()
+        thresholds = monitor.thresholds
+        open_files_percent = (100.0 * sample.open_fds / sample.fd_limit
+                              if sample.open_fds is not None and sample.fd_limit else None)
+        checks = (
+            ("memory", sample.memory_usage_percent, thresholds.get("memory_usage_percent")),
+            ("cpu", sample.process_cpu_percent, thresholds.get("cpu_usage_percent")),
+            ("open_files", open_files_percent, thresholds.get("open_files_percent")),
+            ("gc_pause", sample.gc_pause_max_ms, thresholds.get("gc_pause_ms")),
+        )
+        alerted = []
+        for resource_name, value, threshold in checks:
+            if value is None or threshold is None or value <= threshold:
+                self._alerted_at.pop(resource_name, None)
+                continue
+            last = self._alerted_at.get(resource_name)
+            if last is not None and sample.timestamp - last < self.realert_seconds:
+                continue
+            self._alerted_at[resource_name] = sample.timestamp
+            data = {"resource": resource_name, "value": round(value, 1), "threshold": threshold}
+            if resource_name == "memory":
+                growth = self.rss_growth_mb_per_hour()
+                data.update({
+                    "used_mb": round(sample.memory_used_bytes / (1024 * 1024), 1),
+                    "limit_mb": round(sample.memory_limit_bytes / (1024 * 1024), 1),
+                    "rss_mb": round(sample.rss_bytes / (1024 * 1024), 1) if sample.rss_bytes else None,
+                    "rss_growth_mb_per_hour": round(growth, 1) if growth is not None else None
+                })
+            elif resource_name == "open_files":
+                data.update({"open_fds": sample.open_fds, "fd_limit": sample.fd_limit})
+            monitor.record_alert("resource_exhaustion", data)
+            alerted.append(resource_name)
+        return alerted
+
+
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> Optional[ResourceSampler]:
+    """The running sampler, if start_resource_sampler has been called"""
+    return _sampler
+
+
+def start_resource_sampler(interval: Optional[float] = None) -> Optional[ResourceSampler]:
+    """Start the process-wide sampler every RESOURCE_SAMPLE_INTERVAL seconds (off when unset or 0)
+
+    Safe to call on every Streamlit rerun: the sampler starts once per process.
+    """
+    global _sampler
+    if interval is None:
+        interval = float(os.getenv("RESOURCE_SAMPLE_INTERVAL") or 0)
+    if interval <= 0:
+        return None
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = ResourceSampler(interval=interval)
+                sampler.start()
+                _sampler = sampler
+    return _sampler
+
+
+def stop_resource_sampler():
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None:
+            _sampler.stop()
+            _sampler = None
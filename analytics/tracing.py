@@ -0,0 +1,348 @@
+"""
+J-Genix Studio - Request Tracing
+Parent/child spans per user action, exported as OTLP JSON to a file or an OTLP/HTTP collector
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "jgenix-studio")
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class _Trace:
+    """State shared by every span of one trace"""
+
+    __slots__ = ("trace_id", "spans_started")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans_started = 0
+
+
+class Span:
+    """One timed operation; times are Unix nanoseconds"""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message")
+
+    def __init__(self, name: str, trace: _Trace, parent_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None,
+                 start_ns: Optional[int] = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.status = STATUS_OK
+        self.status_message = ""
+        trace.spans_started += 1
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:500]
+
+    def end(self, end_ns: Optional[int] = None):
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        _processor.on_end(self)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest in its JSON encoding"""
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+        "scopeSpans": [{
+            "scope": {"name": "analytics.tracing"},
+            "spans": [{
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _otlp_attributes(span.attributes),
+                "status": {"code": span.status, **({"message": span.status_message} if span.status_message else {})}
+            } for span in spans]
+        }]
+    }]}
+
+
+class SpanExporter:
+    """Ships batches of finished spans somewhere"""
+
+    def export(self, spans: List[Span]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        """Release resources"""
+
+
+class OTLPFileExporter(SpanExporter):
+    """Appends one OTLP JSON request per line (the collector's otlpjsonfile receiver format)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        line = json.dumps(to_otlp(spans), separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class OTLPHTTPExporter(SpanExporter):
+    """POSTs OTLP JSON to a collector's /v1/traces endpoint"""
+
+    def __init__(self, endpoint: str, headers: Optional[Dict[str, str]] = None, timeout: float = 10.0):
+        self.endpoint = endpoint
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        import requests
+        response = requests.post(self.endpoint, data=json.dumps(to_otlp(spans)), headers=self.headers,
+                                 timeout=self.timeout)
+        response.raise_for_status()
+
+
+class _BatchProcessor:
+    """Queues finished spans and exports them in batches from a background thread
+
+    Spans are never exported on the request path. When the exporter can't
+    keep up, the oldest queued spans are dropped rather than growing memory.
+    """
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 512, interval: float = 5.0):
+        self.exporter: Optional[SpanExporter] = None
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self.exported = 0
+        self._queue: Deque[Span] = deque(maxlen=max_queue)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_exporter(self, exporter: Optional[SpanExporter]):
+        previous, self.exporter = self.exporter, exporter
+        if previous is not None:
+            self.flush(previous)
+            previous.shutdown()
+        if exporter is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def on_end(self, span: Span):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(span)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self, exporter: Optional[SpanExporter] = None):
+        exporter = exporter or self.exporter
+        with self._lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                if exporter is None:
+                    continue
+                try:
+                    exporter.export(batch)
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.dropped += len(batch)
+                    logger.warning(f"Trace export failed, dropped {len(batch)} spans: {str(e)}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+_processor = _BatchProcessor()
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_tracing(exporter: Optional[SpanExporter] = None) -> bool:
+    """Enable tracing with ``exporter``, or from the environment on the first call
+
+    OTEL_EXPORTER_OTLP_TRACES_ENDPOINT (or OTEL_EXPORTER_OTLP_ENDPOINT plus
+    /v1/traces) sends to a collector; TRACES_FILE appends to a local file.
+    With neither, tracing stays off and spans cost a context-variable read.
+    Returns whether tracing is enabled.
+    """
+    global _configured
+    with _configure_lock:
+        if exporter is None and _configured:
+            return is_enabled()
+        _configured = True
+        if exporter is None:
+            endpoint = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+            if not endpoint and os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+                endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT").rstrip("/") + "/v1/traces"
+            if endpoint:
+                exporter = OTLPHTTPExporter(endpoint)
+            elif os.getenv("TRACES_FILE"):
+                exporter = OTLPFileExporter(os.getenv("TRACES_FILE"))
+        _processor.set_exporter(exporter)
+        return exporter is not None
+
+
+def is_enabled() -> bool:
+    return _processor.exporter is not None
+
+
+def flush():
+    """Export every queued span now"""
+    _processor.flush()
+
+
+def get_tracing_stats() -> Dict[str, int]:
+    return {"queued": len(_processor._queue), "exported": _processor.exported, "dropped": _processor.dropped}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """The correlation ID of the user action being served, if it is traced"""
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+@contextmanager
+def start_trace(name: str, correlation_id: Optional[str] = None, drop_if_empty: bool = False,
+                **attributes) -> Iterator[Optional[Span]]:
+    """Open the root span of a trace for one user action
+
+    ``correlation_id`` (32 hex chars) becomes the trace ID, so it can be
+    matched against logs; a fresh one is made otherwise. With
+    ``drop_if_empty`` the root is not exported unless a child span was
+    started, which keeps reruns that did nothing out of the traces.
+    """
+    if not is_enabled():
+        yield None
+        return
+    if _current_span.get() is not None:
+        # Already inside a traced action: nest instead of starting a second trace
+        with span(name, **attributes) as child:
+            yield child
+        return
+
+    trace = _Trace(correlation_id or uuid.uuid4().hex)
+    root = Span(name, trace, attributes=attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.set_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        if not drop_if_empty or trace.spans_started > 1 or root.status == STATUS_ERROR:
+            root.end()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Optional[Span]]:
+    """Time the block as a child of the current span; a no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, parent.trace, parent.span_id, kind, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.set_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def add_http_span(response, bytes_out: int = 0, bytes_in: int = 0):
+    """Record a finished requests.Response as a client span under the current span
+
+    requests only times the exchange up to the response headers
+    (``response.elapsed``), so the span ends when this is called and
+    starts that long before it, less any body download time.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return
+    from urllib.parse import urlsplit
+
+    end_ns = time.time_ns()
+    elapsed = getattr(response, "elapsed", None)
+    start_ns = end_ns - int(elapsed.total_seconds() * 1e9) if elapsed is not None else end_ns
+    request = getattr(response, "request", None)
+    method = getattr(request, "method", None) or "HTTP"
+    parts = urlsplit(getattr(response, "url", "") or "")
+    child = Span(f"{method} {parts.path or '/'}", parent.trace, parent.span_id, KIND_CLIENT, {
+        "http.request.method": method,
+        "server.address": parts.hostname,
+        "url.path": parts.path,
+        "http.response.status_code": response.status_code,
+        "http.request.body.size": bytes_out,
+        "http.response.body.size": bytes_in,
+    }, start_ns=start_ns)
+    if response.status_code >= 400:
+        child.status = STATUS_ERROR
+        child.status_message = f"HTTP {response.status_code}"
+    child.end(end_ns)
+
+
+atexit.register(flush)
@@ -0,0 +1,321 @@
+"""
+Ad-set throughput benchmark
+
+Runs workflows.generate_ad_set (HD image, download, packshot, shadow and
+lifestyle shot) for --items products at each concurrency level against an
+in-process BriaStubServer with injected latency. Every level runs in a fresh
+worker process, so its peak RSS and open sockets are its own, and the server's
+threads don't compete with the client for the GIL.
+
+Per level it reports items/sec, p50/p99 latency for the whole item and for
+each stage, peak RSS, peak open sockets (from /proc/self/fd), and the TCP
+connections the server accepted per item, which shows whether connections
+are pooled. The scaling curve is items/sec against concurrency, with
+speedup and efficiency relative to the lowest level.
+
+Service calls go through the "bria" concurrency limiter, capped at
+BRIA_MAX_CONCURRENCY (8 by default), so levels above the cap queue in the
+limiter rather than at the server, and that wait counts towards the stage
+latencies. Use --bria-max-concurrency to raise the cap when sizing workers.
+
+Usage:
+    python -m benchmarks.bench_ad_set_throughput [--items 32] [--levels 1,4,16,64]
+        [--latency lognormal:200,0.5] [--bria-max-concurrency 64]
+        [--output benchmarks/results/ad_set_throughput.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results", "ad_set_throughput.json")
+
+PRODUCTS = [
+    "Insulated steel water bottle, matte black",
+    "Ceramic pour-over coffee dripper, white",
+    "Leather weekender bag, cognac brown",
+    "Wireless earbuds in a charging case",
+    "Bamboo cutting board with juice groove",
+    "Running shoe, neon green mesh upper",
+    "Scented soy candle in an amber jar",
+    "Stainless chef's knife, walnut handle",
+]
+
+AD_SET_CONFIG = {
+    "create_packshot": True,
+    "add_shadow": True,
+    "lifestyle_shot": True,
+    "scene_description": "on a marble kitchen counter, morning light",
+}
+
+# stage -> name generate_ad_set calls it by
+STAGES = {
+    "hd_image": "generate_hd_image",
+    "download": "fetch_image_bytes",
+    "packshot": "create_packshot",
+    "shadow": "add_shadow",
+    "lifestyle": "lifestyle_shot_by_text",
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def open_sockets() -> Optional[int]:
+    """Socket file descriptors held by this process (None without /proc)"""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return None
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass  # closed while listing
+    return count
+
+
+def peak_rss_mib() -> float:
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024  # bytes on macOS, KiB elsewhere
+
+
+def current_rss_mib() -> Optional[float]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class SocketSampler:
+    """Background thread tracking the peak number of open sockets"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="socket-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, open_sockets() or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "SocketSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def time_stages(module, timings: Dict[str, List[float]], lock: threading.Lock):
+    """Wrap the service calls generate_ad_set makes so each one is timed"""
+    def timed(stage, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    timings[stage].append(elapsed)
+        return wrapper
+
+    for stage, name in STAGES.items():
+        setattr(module, name, timed(stage, getattr(module, name)))
+
+
+def run_level(items: int, concurrency: int) -> Dict[str, Any]:
+    """Worker side: run one concurrency level in this process"""
+    import workflows.generate_ad_set as ad_set_module
+    from business.concurrency_limiter import LIMITER_MAX_IN_FLIGHT
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+    time_stages(ad_set_module, timings, threading.Lock())
+
+    def run_item(index):
+        start = time.perf_counter()
+        try:
+            ad_set_module.generate_ad_set("stub-token", prompt=PRODUCTS[index % len(PRODUCTS)],
+                                          config=AD_SET_CONFIG)
+            error = None
+        except Exception as e:
+            error = str(e)
+        return time.perf_counter() - start, error
+
+    rss_before = current_rss_mib()
+    sockets_before = open_sockets()
+    with SocketSampler() as sampler:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(run_item, range(items)))
+        wall = time.perf_counter() - started
+
+    latencies = [elapsed for elapsed, error in outcomes if error is None]
+    errors = [error for _, error in outcomes if error is not None]
+    return {
+        "concurrency": concurrency,
+        "items": items,
+        "completed": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "wall_s": wall,
+        "items_per_s": len(latencies) / wall,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000 if latencies else None,
+            "p99": percentile(latencies, 99) * 1000 if latencies else None,
+        },
+        "stages_ms": {
+            stage: {"p50": percentile(values, 50) * 1000, "p99": percentile(values, 99) * 1000, "calls": len(values)}
+            for stage, values in timings.items()
+        },
+        "rss_before_mib": rss_before,
+        "peak_rss_mib": peak_rss_mib(),
+        "sockets_before": sockets_before,
+        "peak_sockets": sampler.peak,
+        "sockets_after": open_sockets(),
+        "bria_max_concurrency": LIMITER_MAX_IN_FLIGHT["bria"],
+    }
+
+
+def spawn_level(items: int, concurrency: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """Run one level in a fresh interpreter and parse its JSON line"""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_ad_set_throughput", "--worker",
+         "--items", str(items), "--concurrency", str(concurrency)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Concurrency {concurrency} worker failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def benchmark(items: int, levels: List[int], config, bria_max_concurrency: Optional[int]) -> List[Dict[str, Any]]:
+    from benchmarks.bria_stub_server import BriaStubServer
+
+    results = []
+    with BriaStubServer(config) as server:
+        env = dict(os.environ, BRIA_API_BASE_URL=server.url, HF_API_BASE_URL=server.url,
+                   BRIA_API_KEY="stub-token", JOB_STORE="memory")
+        if bria_max_concurrency:
+            env["BRIA_MAX_CONCURRENCY"] = str(bria_max_concurrency)
+
+        for concurrency in levels:
+            before = server.stats()
+            level = spawn_level(items, concurrency, env)
+            after = server.stats()
+            level["server_requests"] = sum(after["requests"].values()) - sum(before["requests"].values())
+            level["server_connections"] = after["connections"] - before["connections"]
+            level["connections_per_item"] = level["server_connections"] / max(level["completed"], 1)
+            results.append(level)
+            print(f"  concurrency {concurrency:3d}: {level['items_per_s']:.2f} items/s", file=sys.stderr)
+
+    base = results[0]
+    for level in results:
+        speedup = level["items_per_s"] / base["items_per_s"] if base["items_per_s"] else 0.0
+        level["speedup"] = speedup
+        level["efficiency"] = speedup / (level["concurrency"] / base["concurrency"])
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print(f"{'conc':>5} {'items/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6} {'RSS MiB':>8} "
+          f"{'sockets':>7} {'conn/item':>9} {'speedup':>8} {'eff':>5}")
+    for level in results:
+        latency = level["latency_ms"]
+        print(f"{level['concurrency']:5d} {level['items_per_s']:8.2f} {latency['p50'] or 0:8.0f} "
+              f"{latency['p99'] or 0:8.0f} {level['errors']:6d} {level['peak_rss_mib']:8.1f} "
+              f"{level['peak_sockets']:7d} {level['connections_per_item']:9.1f} "
+              f"{level['speedup']:7.2f}x {level['efficiency']:5.0%}")
+
+    print("\nStage latency p50 / p99 ms")
+    print(f"{'conc':>5} " + " ".join(f"{stage:>15}" for stage in STAGES))
+    for level in results:
+        cells = []
+        for stage in STAGES:
+            timing = level["stages_ms"].get(stage)
+            cells.append(f"{timing['p50']:7.0f}/{timing['p99']:<7.0f}" if timing else f"{'-':>15}")
+        print(f"{level['concurrency']:5d} " + " ".join(cells))
+
+    print("\nScaling curve (items/s)")
+    top = max(level["items_per_s"] for level in results) or 1.0
+    for level in results:
+        bar = "#" * max(1, int(round(40 * level["items_per_s"] / top)))
+        print(f"{level['concurrency']:5d} {bar} {level['items_per_s']:.2f}")
+
+    cap = results[0]["bria_max_concurrency"]
+    if any(level["concurrency"] > cap for level in results):
+        print(f"\nNote: Bria calls are capped at {cap} in flight (BRIA_MAX_CONCURRENCY); "
+              f"higher levels queue in the limiter.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=32, help="Products per concurrency level")
+    parser.add_argument("--levels", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--latency", default="lognormal:200,0.5", help="Stub latency of every API call (ms spec)")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="PATH=SPEC",
+                        help="Stub latency for paths starting with PATH (repeatable)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls answered with 500")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--bria-max-concurrency", type=int, help="BRIA_MAX_CONCURRENCY for the workers")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--concurrency", type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    if args.worker:
+        print(json.dumps(run_level(args.items, args.concurrency)))
+        return
+
+    from benchmarks.bria_stub_server import StubConfig
+
+    levels = sorted(int(level) for level in args.levels.split(","))
+    config = StubConfig(
+        latency=args.latency,
+        endpoint_latency=dict(item.split("=", 1) for item in args.endpoint_latency),
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"Running {args.items} ad sets per level at concurrency {levels} (latency {args.latency})", file=sys.stderr)
+    results = benchmark(args.items, levels, config, args.bria_max_concurrency)
+    print_report(results)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "items": args.items,
+            "latency": args.latency,
+            "endpoint_latency": args.endpoint_latency,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+            "levels": results,
+        }, f, indent=2)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+App rerun-cost benchmark
+
+Drives app.py headlessly with Streamlit's AppTest through a scripted,
+realistic interaction on each tab, with every outbound request answered by
+benchmarks.http_stub. Each rerun is measured for wall time, CPU time,
+outbound requests and, in a separate tracemalloc pass so tracing overhead
+doesn't skew the timings, peak and retained allocations.
+
+Results go to a JSON file. Pass --baseline to compare against an earlier
+run on the same machine: any change in request counts, and time or
+allocation increases beyond --tolerance that are also outside the
+run-to-run noise of either run, are listed (and fail the run with --check).
+
+AppTest cannot upload files, so the Lifestyle Shot, Generative Fill and
+Erase Elements scenarios cover opening the tab only.
+
+Usage:
+    python -m benchmarks.bench_app_reruns [--repeats 5] [--scenario logo]
+        [--output benchmarks/results/app_reruns.json]
+        [--baseline benchmarks/baselines/app_reruns.json] [--tolerance 0.25] [--check]
+
+    # Make a local baseline from a clean checkout first (not committed;
+    # timings only compare on the machine that produced them)
+    python -m benchmarks.bench_app_reruns --output benchmarks/baselines/app_reruns.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "benchmarks", "results", "app_reruns.json")
+
+TABS = {
+    "generate_image": "🎨 Generate Image",
+    "logo": "🏢 Logo Generation",
+    "brand_kit": "🎯 Brand Kit",
+    "lifestyle": "🖼️ Lifestyle Shot",
+    "generative_fill": "🔧 Generative Fill",
+    "erase": "🗑️ Erase Elements",
+    "copywriter": "📝 Free AI Copywriter",
+}
+
+
+def by_label(elements, label):
+    """The widget with this label (for widgets the app doesn't key)"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def open_tab(name):
+    def step(at):
+        at.session_state["active_tab"] = TABS[name]
+    return step
+
+
+# scenario -> [(step name, action on the AppTest before its rerun)]
+SCENARIOS = {
+    "generate_image": [
+        ("open tab", open_tab("generate_image")),
+        ("type prompt", lambda at: at.text_area(key="prompt_input").input("a red bicycle leaning on a brick wall")),
+        ("change style", lambda at: by_label(at.selectbox, "Image Style").set_value("Digital Art")),
+        ("enhance prompt", lambda at: at.button(key="enhance_button").click()),
+        ("generate", lambda at: by_label(at.button, "🎨 Generate Images").click()),
+        ("rerun with result", lambda at: by_label(at.slider, "Number of images").set_value(2)),
+    ],
+    "logo": [
+        ("open tab", open_tab("logo")),
+        ("type prompt", lambda at: at.text_area(key="logo_prompt_input").input("TechCorp software company, modern and clean")),
+        ("change style", lambda at: by_label(at.selectbox, "Logo Style").set_value("minimalist")),
+        ("generate", lambda at: at.button(key="generate_logo_btn").click()),
+        ("rerun with result", lambda at: by_label(at.selectbox, "Color Scheme").set_value("vibrant")),
+    ],
+    "brand_kit": [
+        ("open tab", open_tab("brand_kit")),
+        ("type brand name", lambda at: at.text_input(key="brand_name_input").input("Acme")),
+        ("choose URL source", lambda at: at.radio(key="logo_source_radio").set_value("Use Existing Logo URL")),
+        ("type logo URL", lambda at: at.text_input(key="logo_url_input").input("https://results.stub.local/logo.png")),
+        ("create brand kit", lambda at: at.button(key="create_from_url").click()),
+    ],
+    "lifestyle": [("open tab", open_tab("lifestyle"))],
+    "generative_fill": [("open tab", open_tab("generative_fill"))],
+    "erase": [("open tab", open_tab("erase"))],
+    "copywriter": [
+        ("open tab", open_tab("copywriter")),
+        ("type description", lambda at: at.text_area(key="free_copy_image_desc_tab").input("Insulated steel water bottle, keeps drinks cold for 24 hours")),
+        ("change tone", lambda at: at.selectbox(key="free_tone_tab").set_value("casual")),
+        ("generate copy", lambda at: at.button(key="generate_free_single_copy_tab").click()),
+        ("generate variations", lambda at: at.button(key="generate_free_copy_variations_tab").click()),
+    ],
+}
+
+
+def run_scenario(steps, stub, trace_allocations=False):
+    """Run one scenario in a fresh session; measurements per step"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=120)
+    at.run()  # initial page load, not measured
+
+    results = []
+    for name, action in steps:
+        action(at)
+        calls_before = stub.count()
+        if trace_allocations:
+            tracemalloc.reset_peak()
+            current_before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        at.run()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+        # A scenario that hits an error path isn't measuring what it claims to
+        failures = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+        if failures:
+            raise RuntimeError(f"Step {name!r} failed: {failures[0]}")
+
+        step = {
+            "step": name,
+            "wall_ms": wall * 1000,
+            "cpu_ms": cpu * 1000,
+            "requests": stub.count() - calls_before,
+            "requests_by_endpoint": stub.counts(since=calls_before),
+        }
+        if trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            step["alloc_peak_kib"] = (peak - current_before) / 1024
+            step["alloc_retained_kib"] = (current - current_before) / 1024
+        results.append(step)
+    return results
+
+
+def benchmark(scenarios, repeats):
+    from benchmarks.http_stub import HTTPStub
+
+    report = {}
+    with HTTPStub() as stub:
+        for scenario in scenarios:
+            steps = SCENARIOS[scenario]
+            runs = [run_scenario(steps, stub) for _ in range(repeats)]
+
+            tracemalloc.start()
+            try:
+                traced = run_scenario(steps, stub, trace_allocations=True)
+            finally:
+                tracemalloc.stop()
+
+            report[scenario] = []
+            for index, (name, _) in enumerate(steps):
+                samples = [run[index] for run in runs]
+                report[scenario].append({
+                    "step": name,
+                    "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+                    "cpu_ms": statistics.median(s["cpu_ms"] for s in samples),
+                    # Spread across repeats, so comparisons can tell noise from change
+                    "wall_ms_stdev": statistics.pstdev(s["wall_ms"] for s in samples),
+                    "cpu_ms_stdev": statistics.pstdev(s["cpu_ms"] for s in samples),
+                    "requests": samples[0]["requests"],
+                    "requests_by_endpoint": samples[0]["requests_by_endpoint"],
+                    "alloc_peak_kib": traced[index]["alloc_peak_kib"],
+                    "alloc_retained_kib": traced[index]["alloc_retained_kib"],
+                })
+    return report
+
+
+def compare(report, baseline, tolerance):
+    """Regressions against a baseline report, as printable lines"""
+    regressions = []
+    for scenario, steps in report.items():
+        baseline_steps = {s["step"]: s for s in baseline.get("scenarios", {}).get(scenario, [])}
+        for step in steps:
+            old = baseline_steps.get(step["step"])
+            if old is None:
+                continue
+            label = f"{scenario} / {step['step']}"
+            if step["requests_by_endpoint"] != old["requests_by_endpoint"]:
+                regressions.append(f"{label}: requests {old['requests_by_endpoint']} -> {step['requests_by_endpoint']}")
+            for metric in ("wall_ms", "cpu_ms", "alloc_peak_kib"):
+                # Ignore noise on steps that are tiny to begin with
+                floor = 5.0 if metric.endswith("_ms") else 64.0
+                # and increases within three standard deviations of either run's spread
+                noise = 3 * max(old.get(f"{metric}_stdev", 0.0), step.get(f"{metric}_stdev", 0.0))
+                if (step[metric] > max(old[metric], floor) * (1 + tolerance)
+                        and step[metric] - old[metric] > noise):
+                    regressions.append(f"{label}: {metric} {old[metric]:.1f} -> {step[metric]:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Run only this scenario (repeatable)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative increase in time and peak allocations")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if anything regressed")
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+    # Stub credentials and process-local job storage; the stub answers everything
+    os.environ.setdefault("BRIA_API_KEY", "stub-token")
+    os.environ.setdefault("JOB_STORE", "memory")
+
+    report = benchmark(args.scenario or list(SCENARIOS), args.repeats)
+
+    print(f"{'scenario':<16} {'step':<22} {'wall ms':>8} {'cpu ms':>8} {'reqs':>5} {'peak KiB':>9} {'kept KiB':>9}")
+    for scenario, steps in report.items():
+        for step in steps:
+            print(f"{scenario:<16} {step['step']:<22} {step['wall_ms']:8.1f} {step['cpu_ms']:8.1f} "
+                  f"{step['requests']:5d} {step['alloc_peak_kib']:9.0f} {step['alloc_retained_kib']:9.0f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": args.repeats,
+            "scenarios": report,
+        }, f, indent=2, ensure_ascii=False)
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions and args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
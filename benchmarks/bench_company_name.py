@@ -0,0 +1,147 @@
+"""
+Company-name extraction fuzz and benchmark
+
+Checks the single-pass compiled extractor in services.logo_generation against
+the original three-search implementation (kept here as an oracle) over a
+corpus of real prompts plus randomly generated ones, then times both.
+Exits non-zero if any prompt extracts a different name or method.
+
+Usage:
+    python -m benchmarks.bench_company_name [--fuzz 20000] [--rounds 50] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+from services.logo_generation import _parse_company_name
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "logo_prompts.txt")
+
+
+def legacy_extract(prompt: str) -> str:
+    """Original _extract_company_name, before the single-pass scanner"""
+    if not prompt or not prompt.strip():
+        return "Company"
+    cleaned_prompt = prompt.strip()
+    words = cleaned_prompt.split()
+    if len(words) == 1 and len(words[0]) > 1 and words[0].isalpha():
+        return words[0]
+    quoted_match = re.search(r'["\']([^"\']+)["\']', cleaned_prompt)
+    if quoted_match:
+        return quoted_match.group(1).strip()
+    name_pattern = re.search(r'(?:company|brand|business)\s+(?:name|called)\s+(?:is\s+)?([A-Za-z0-9\s&]+?)(?:\s|,|$)', cleaned_prompt, re.IGNORECASE)
+    if name_pattern:
+        return name_pattern.group(1).strip()
+    for_pattern = re.search(r'for\s+([A-Za-z0-9\s&]+?)\s+(?:company|brand|business|corp|inc|llc)', cleaned_prompt, re.IGNORECASE)
+    if for_pattern:
+        return for_pattern.group(1).strip()
+    company_words = []
+    for word in words[:5]:
+        if word.lower() in ['logo', 'design', 'for', 'company', 'brand', 'business', 'create', 'make', 'generate', 'a', 'an', 'the']:
+            continue
+        if len(word) > 1 and word.isalpha():
+            company_words.append(word)
+        else:
+            break
+    if company_words:
+        company_name = ' '.join(company_words[:3])
+        company_name = re.sub(r'\s+(inc|llc|corp|ltd|co)\.?$', '', company_name, flags=re.IGNORECASE)
+        return company_name.strip()
+    first_word = words[0] if words else "Company"
+    if len(first_word) > 1 and first_word.isalpha():
+        return first_word
+    return "Company"
+
+
+def legacy_method(prompt: str) -> str:
+    """Original _get_extraction_method"""
+    if not prompt or not prompt.strip():
+        return "empty_prompt"
+    cleaned_prompt = prompt.strip()
+    if re.search(r'["\']([^"\']+)["\']', cleaned_prompt):
+        return "quoted_name"
+    elif re.search(r'(?:company|brand|business)\s+(?:name|called)\s+(?:is\s+)?([A-Za-z0-9\s&]+?)(?:\s|,|$)', cleaned_prompt, re.IGNORECASE):
+        return "explicit_name_pattern"
+    elif re.search(r'for\s+([A-Za-z0-9\s&]+?)\s+(?:company|brand|business|corp|inc|llc)', cleaned_prompt, re.IGNORECASE):
+        return "for_company_pattern"
+    return "capitalized_words"
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if not line.startswith("#")]
+
+
+# Tokens biased towards the extractor's edge cases: quotes, keywords, suffixes, punctuation
+FUZZ_TOKENS = [
+    '"', "'", "for", "For", "FOR", "company", "Company", "brand", "business", "name", "called",
+    "is", "corp", "inc", "llc", "ltd", "co", "Co.", "&", ",", "logo", "the", "a", "Acme",
+    "Blue", "Harbor", "Nimbus", "42", "O'Neil", "café", "x", " ", "  ", "\t", "-"
+]
+
+
+def fuzz_prompts(count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        tokens = rng.choices(FUZZ_TOKENS, k=rng.randint(0, 12))
+        yield "".join(t + (" " if rng.random() < 0.7 else "") for t in tokens)
+
+
+def check(prompts) -> int:
+    mismatches = 0
+    for prompt in prompts:
+        expected = (legacy_extract(prompt), legacy_method(prompt))
+        actual = _parse_company_name.__wrapped__(prompt)
+        if actual != expected:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  MISMATCH {prompt!r}: expected {expected}, got {actual}")
+    return mismatches
+
+
+def measure(func, prompts, rounds: int) -> float:
+    """CPU microseconds per prompt"""
+    start = time.process_time()
+    for _ in range(rounds):
+        for prompt in prompts:
+            func(prompt)
+    return (time.process_time() - start) / (rounds * len(prompts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fuzz", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    corpus_mismatches = check(corpus)
+    fuzz_mismatches = check(fuzz_prompts(args.fuzz, args.seed))
+    print(f"Equivalence: {len(corpus)} corpus prompts, {corpus_mismatches} mismatches; "
+          f"{args.fuzz} fuzz prompts, {fuzz_mismatches} mismatches")
+    if corpus_mismatches or fuzz_mismatches:
+        sys.exit(1)
+
+    # generate_logo, _build_logo_prompt and validation each extracted name and method
+    def legacy_per_generation(prompt):
+        for _ in range(3):
+            legacy_extract(prompt)
+        legacy_method(prompt)
+
+    legacy = measure(legacy_per_generation, corpus, args.rounds)
+    uncached = measure(_parse_company_name.__wrapped__, corpus, args.rounds)
+    cached = measure(_parse_company_name, corpus, args.rounds)
+
+    print(f"Company-name extraction per generation ({len(corpus)} prompts x {args.rounds} rounds)")
+    print(f"  legacy (3x extract + method) : {legacy:8.2f} us")
+    print(f"  single pass, uncached        : {uncached:8.2f} us")
+    print(f"  single pass, memoized        : {cached:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+App cold-start benchmark
+
+Imports app.py in fresh interpreters under ``python -X importtime`` and
+reports the median total import time, the slowest top-level imports, and
+which heavy optional dependencies were loaded. With --first-render it also
+runs the first page render through Streamlit's AppTest and lists the heavy
+modules that render pulled in.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs 5] [--first-render]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that should only load when a feature needs them
+HEAVY_MODULES = ("requests", "numpy", "PIL.Image", "stripe", "streamlit_drawable_canvas")
+
+_RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "exceptions": [str(e.value) for e in at.exception],
+    "loaded": [m for m in %r if m in sys.modules]
+}))
+""" % (HEAVY_MODULES,)
+
+
+def import_profile():
+    """Import app in a fresh interpreter; returns {module: (self_us, cumulative_us, depth)}"""
+    script = "import sys\ntry:\n    import app\nfinally:\n    print(','.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    loaded = proc.stdout.strip().splitlines()[-1].split(",") if proc.stdout.strip() else []
+    return profile, [m for m in loaded if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--first-render", action="store_true")
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        profile, loaded = import_profile()
+        totals.append(profile.get("app", (0, 0, 0))[1] / 1000)
+
+    print(f"import app: median {statistics.median(totals):.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"heavy modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    print("slowest imports made directly by app:")
+    direct = sorted(((cum, name) for name, (_, cum, depth) in profile.items() if depth == 1), reverse=True)
+    for cumulative_us, name in direct[:10]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.first_render:
+        proc = subprocess.run([sys.executable, "-c", _RENDER_SCRIPT], cwd=REPO_ROOT,
+                              capture_output=True, text=True, env={**os.environ, "JOB_STORE": "memory"})
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"first render: {result['seconds'] * 1000:.0f} ms, "
+              f"heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+        if result["exceptions"]:
+            print(f"  render raised: {result['exceptions']}")
+
+
+if __name__ == "__main__":
+    main()
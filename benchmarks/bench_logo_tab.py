@@ -0,0 +1,84 @@
+"""
+Logo tab per-rerun CPU benchmark
+
+Measures the catalog, label lookup and prompt building work the Logo
+Generation tab does on every Streamlit rerun, comparing the rebuilt-list +
+linear-scan pattern against the frozen catalogs, indexes and cached prompt
+builder.
+
+Usage:
+    python -m benchmarks.bench_logo_tab [--reruns 20000]
+"""
+
+import argparse
+import time
+
+from services.logo_generation import (
+    COLOR_SCHEME_INDEX,
+    LOGO_STYLE_INDEX,
+    LOGO_TYPE_INDEX,
+    _build_logo_negative_prompt,
+    _build_logo_prompt,
+    get_color_scheme_options,
+    get_logo_style_options,
+    get_logo_type_options
+)
+
+PROMPT = "GreenLeaf organic foods, modern and clean"
+SELECTION = ("modern", "combination", "earth_tones")
+
+
+def rerun_linear_scan():
+    """One rerun the way the tab used to do it: rebuild lists and scan per label"""
+    catalogs = [
+        [dict(opt) for opt in get_logo_style_options()],
+        [dict(opt) for opt in get_logo_type_options()],
+        [dict(opt) for opt in get_color_scheme_options()]
+    ]
+    for options, selected in zip(catalogs, SELECTION):
+        values = [opt["value"] for opt in options]
+        # selectbox calls format_func once per option
+        for value in values:
+            next(opt["label"] for opt in options if opt["value"] == value)
+        next(opt["description"] for opt in options if opt["value"] == selected)
+
+    _build_logo_prompt.__wrapped__(PROMPT, *SELECTION)
+    _build_logo_negative_prompt("")
+
+
+def rerun_indexed():
+    """One rerun with frozen catalogs, O(1) indexes and the cached prompt builder"""
+    for index, selected in zip((LOGO_STYLE_INDEX, LOGO_TYPE_INDEX, COLOR_SCHEME_INDEX), SELECTION):
+        for value in tuple(index):
+            index[value]["label"]
+        index[selected]["description"]
+
+    _build_logo_prompt(PROMPT, *SELECTION)
+    _build_logo_negative_prompt("")
+
+
+def measure(func, reruns: int) -> float:
+    """CPU microseconds per call"""
+    func()  # warm caches
+    start = time.process_time()
+    for _ in range(reruns):
+        func()
+    return (time.process_time() - start) / reruns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=20000)
+    args = parser.parse_args()
+
+    before = measure(rerun_linear_scan, args.reruns)
+    after = measure(rerun_indexed, args.reruns)
+
+    print(f"Logo tab catalog + prompt work per rerun ({args.reruns} reruns)")
+    print(f"  rebuilt lists + linear scans : {before:8.2f} us")
+    print(f"  frozen catalogs + indexes    : {after:8.2f} us")
+    print(f"  speedup                      : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Generative Fill mask pipeline benchmark
+
+Compares the original canvas-to-mask conversion (astype copy, RGBA -> L,
+8-bit PNG at canvas size) with services.mask_pipeline (alpha threshold,
+1-bit mask scaled to the source image, 1-bit PNG) on synthetic brush
+strokes, reporting CPU time and payload size.
+
+Usage:
+    python -m benchmarks.bench_mask_pipeline [--repeats 10]
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from services.mask_pipeline import canvas_to_mask_png
+
+# (label, canvas size, source image size)
+SCENARIOS = [
+    ("800px canvas, 800px source", (800, 600), (800, 600)),
+    ("800px canvas, 4K source", (800, 450), (3840, 2160)),
+    ("4K canvas, 4K source", (3840, 2160), (3840, 2160)),
+]
+
+
+def synthetic_canvas(size, seed: int = 0) -> np.ndarray:
+    """RGBA canvas with a few thick freehand strokes, as st_canvas returns it"""
+    width, height = size
+    canvas = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    rng = np.random.default_rng(seed)
+    for _ in range(6):
+        points = [tuple(p) for p in rng.integers(0, [width, height], size=(12, 2))]
+        draw.line(points, fill=(255, 255, 255, 255), width=max(4, width // 40), joint="curve")
+    return np.asarray(canvas)
+
+
+def legacy_mask(image_data: np.ndarray, source_size) -> bytes:
+    """Original Generative Fill tab conversion (ignores source_size)"""
+    mask_img = Image.fromarray(image_data.astype('uint8'), mode='RGBA')
+    mask_img = mask_img.convert('L')
+    mask_bytes = io.BytesIO()
+    mask_img.save(mask_bytes, format='PNG')
+    return mask_bytes.getvalue()
+
+
+def measure(func, image_data, source_size, repeats: int):
+    """CPU milliseconds per call and payload bytes"""
+    payload = func(image_data, source_size)
+    start = time.process_time()
+    for _ in range(repeats):
+        func(image_data, source_size)
+    return (time.process_time() - start) / repeats * 1000, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<28} {'pipeline':<10} {'cpu ms':>9} {'bytes':>10} {'mask size':>12}")
+    for label, canvas_size, source_size in SCENARIOS:
+        image_data = synthetic_canvas(canvas_size)
+        for name, func in (("legacy", legacy_mask), ("1-bit", canvas_to_mask_png)):
+            cpu_ms, size = measure(func, image_data, source_size, args.repeats)
+            mask_size = Image.open(io.BytesIO(func(image_data, source_size))).size
+            print(f"{label:<28} {name:<10} {cpu_ms:9.2f} {size:10d} {'%dx%d' % mask_size:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Preview decoding benchmark
+
+Compares full-resolution decode + resize (how the canvas background and
+previews were built) with services.image_decode's draft()/reduce() path
+on a synthetic 20 MP JPEG, for the 800px canvas background, the 1024px
+upload preview and the 320px thumbnail. Memory is reported as the size of
+the bitmap the JPEG decoder produces, which dominates peak usage.
+
+Usage:
+    python -m benchmarks.bench_preview_decode [--repeats 5] [--megapixels 20]
+"""
+
+import argparse
+import io
+import time
+
+from PIL import Image
+
+from services.image_decode import DEFAULT_CANVAS_MAX_WIDTH, DEFAULT_PREVIEW_SIZE, canvas_size, decode_preview, fit_size
+from services.image_cache import DEFAULT_THUMBNAIL_SIZE
+
+TARGETS = [
+    ("canvas background", "canvas"),
+    ("upload preview", DEFAULT_PREVIEW_SIZE),
+    ("thumbnail", DEFAULT_THUMBNAIL_SIZE),
+]
+
+
+def synthetic_jpeg(megapixels: float) -> bytes:
+    """A noisy gradient photo-like JPEG, so decode cost is realistic"""
+    width = int((megapixels * 1e6 * 3 / 2) ** 0.5)
+    height = width * 2 // 3
+    noise = Image.effect_noise((width, height), 40)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge("RGB", (noise, gradient, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+def legacy_decode(data: bytes, target):
+    """Full decode, then resize"""
+    img = Image.open(io.BytesIO(data))
+    size = canvas_size(img.size, DEFAULT_CANVAS_MAX_WIDTH) if target == "canvas" else fit_size(img.size, target)
+    return img.resize(size)
+
+
+def draft_decode(data: bytes, target):
+    """draft()/reduce() preview path"""
+    if target == "canvas":
+        with Image.open(io.BytesIO(data)) as probe:
+            size = canvas_size(probe.size, DEFAULT_CANVAS_MAX_WIDTH)
+        return decode_preview(data, size)
+    return decode_preview(data, target)
+
+
+def target_size(data: bytes, target):
+    with Image.open(io.BytesIO(data)) as probe:
+        if target == "canvas":
+            return canvas_size(probe.size, DEFAULT_CANVAS_MAX_WIDTH)
+        return fit_size(probe.size, target)
+
+
+def decoded_mb(data: bytes, size, use_draft: bool) -> float:
+    """Size of the bitmap libjpeg decodes into, in MB"""
+    with Image.open(io.BytesIO(data)) as img:
+        if use_draft:
+            img.draft("RGB", size)
+        return img.width * img.height * len(img.getbands()) / 1e6
+
+
+def measure(func, data, target, repeats):
+    """CPU milliseconds per decode"""
+    func(data, target)
+    start = time.process_time()
+    for _ in range(repeats):
+        func(data, target)
+    return (time.process_time() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--megapixels", type=float, default=20)
+    args = parser.parse_args()
+
+    data = synthetic_jpeg(args.megapixels)
+    with Image.open(io.BytesIO(data)) as probe:
+        print(f"Source: {probe.size[0]}x{probe.size[1]} JPEG, {len(data) / 1e6:.1f} MB")
+
+    print(f"{'target':<20} {'full ms':>9} {'draft ms':>9} {'speedup':>8} {'full MB':>8} {'draft MB':>9}")
+    for label, target in TARGETS:
+        full_ms = measure(legacy_decode, data, target, args.repeats)
+        draft_ms = measure(draft_decode, data, target, args.repeats)
+        size = target_size(data, target)
+        full_mb, draft_mb = decoded_mb(data, size, False), decoded_mb(data, size, True)
+        print(f"{label:<20} {full_ms:9.1f} {draft_ms:9.1f} {full_ms / draft_ms:7.1f}x {full_mb:8.1f} {draft_mb:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
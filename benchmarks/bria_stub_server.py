@@ -0,0 +1,260 @@
+"""
+Local Bria API stand-in server
+
+Serves the Bria endpoints the service wrappers call (product packshot,
+shadow and lifestyle shots, gen_fill, erase_foreground, text-to-image HD,
+prompt_enhancer), the Hugging Face inference endpoint, and the result
+images they point to. Nothing is generated and no credits are spent.
+Latency, error rates and 429s are injected from seeded distributions, so
+load tests and tail-latency measurements are reproducible.
+
+Requests with "sync": false get their result URLs right away (after the
+injected latency), but the images 404 until --async-delay has passed, as
+they do on Bria's CDN. Point the app or the services at it with:
+
+    BRIA_API_BASE_URL=http://127.0.0.1:8765 HF_API_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Latency specs are in milliseconds: "fixed:300", "uniform:100,900" or
+"lognormal:800,0.6" (median, sigma). GET /__stats returns request and
+connection counts.
+
+Usage:
+    python -m benchmarks.bria_stub_server [--port 8765] [--latency lognormal:800,0.6]
+        [--endpoint-latency /v1/prompt_enhancer=fixed:150] [--async-delay uniform:1000,4000]
+        [--error-rate 0.01] [--rate-limit-rate 0.02] [--max-in-flight 32] [--seed 1]
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from benchmarks.http_stub import STUB_COPY, CannedBackend, json_reply
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> Sampler:
+    """Turn a latency spec (milliseconds) into a sampler returning seconds"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma) / 1000
+    raise ValueError(f"Bad latency spec {spec!r}; use fixed:MS, uniform:LO,HI or lognormal:MEDIAN,SIGMA")
+
+
+class StubConfig:
+    """Fault and latency injection settings"""
+
+    def __init__(self, latency: str = "fixed:0", endpoint_latency: Optional[Dict[str, str]] = None,
+                 async_delay: str = "fixed:0", error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 max_in_flight: int = 0, seed: Optional[int] = None):
+        self.latency = parse_latency(latency)
+        self.endpoint_latency = {path: parse_latency(spec) for path, spec in (endpoint_latency or {}).items()}
+        self.async_delay = parse_latency(async_delay)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_in_flight = max_in_flight
+        self.seed = seed
+
+
+class _ServerBackend(CannedBackend):
+    """Canned responses whose async result images become ready after a delay"""
+
+    def __init__(self, config: StubConfig, result_base: str, rng: random.Random, rng_lock: threading.Lock):
+        super().__init__(result_base=result_base)
+        self.config = config
+        self._rng = rng
+        self._rng_lock = rng_lock
+        self._ready_at: Dict[str, float] = {}
+
+    def result_url(self, payload: Dict[str, Any]) -> str:
+        url = super().result_url(payload)
+        if payload.get("sync") is False:
+            with self._rng_lock:
+                delay = self.config.async_delay(self._rng)
+            self._ready_at[url.rsplit("/", 1)[-1]] = time.monotonic() + delay
+        return url
+
+    def result_ready(self, name: str) -> bool:
+        return time.monotonic() >= self._ready_at.get(name, 0)
+
+
+class BriaStubServer:
+    """ThreadingHTTPServer wrapper; usable as a context manager from benchmarks
+
+    ``url`` is the base URL to put in BRIA_API_BASE_URL and HF_API_BASE_URL.
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 verbose: bool = False):
+        self.config = config or StubConfig()
+        self.verbose = verbose
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections = 0
+        self.counts: Counter = Counter()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.backend = _ServerBackend(self.config, self.url, self._rng, self._rng_lock)
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BriaStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="bria-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "BriaStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": dict(self.counts), "in_flight": self.in_flight, "peak_in_flight": self.peak_in_flight,
+                    "connections": self.connections}
+
+    def _roll(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _latency(self, path: str) -> float:
+        sampler = next((s for prefix, s in self.config.endpoint_latency.items() if path.startswith(prefix)),
+                       self.config.latency)
+        with self._rng_lock:
+            return sampler(self._rng)
+
+    def respond(self, method: str, path: str, body: Optional[bytes]) -> Tuple[int, Dict[str, str], bytes]:
+        """Route one request, applying fault and latency injection to API calls"""
+        path = path.split("?", 1)[0]
+        if path == "/__stats":
+            return json_reply(self.stats())
+        if path.startswith("/results/"):
+            name = path.rsplit("/", 1)[-1]
+            if not self.backend.result_ready(name):
+                return json_reply({"error": "Result not ready"}, status=404)
+            image = self.backend.image_bytes()
+            return 200, {"Content-Type": "image/png", "Content-Length": str(len(image))}, b"" if method == "HEAD" else image
+
+        with self._lock:
+            over_limit = self.config.max_in_flight and self.in_flight > self.config.max_in_flight
+        if over_limit or self._roll() < self.config.rate_limit_rate:
+            return 429, {"Content-Type": "application/json", "Retry-After": "1"}, b'{"error": "Too many requests"}'
+
+        time.sleep(self._latency(path))
+        if self._roll() < self.config.error_rate:
+            return json_reply({"error": "Injected server error"}, status=500)
+
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return json_reply({"error": "Invalid JSON body"}, status=400)
+        if path.startswith("/models/"):
+            return json_reply([{"generated_text": STUB_COPY}])
+        return self.backend.bria(path, payload)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                key = f"{self.command} {self.path.split('?', 1)[0]}"
+                if self.path.startswith("/results/"):
+                    key = f"{self.command} /results/*"
+                with server._lock:
+                    server.counts[key] += 1
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                try:
+                    status, headers, content = server.respond(self.command, self.path, body)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() != "content-length":
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_HEAD = _serve
+
+            def log_message(self, format, *args):
+                if server.verbose:
+                    super().log_message(format, *args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0", help="Latency of every API call")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="PATH=SPEC",
+                        help="Latency for paths starting with PATH (repeatable)")
+    parser.add_argument("--async-delay", default="fixed:0", help="Time until async result images are available")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of API calls answered with 429")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="Answer 429 above this many concurrent calls (0 = no limit)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency,
+        endpoint_latency=dict(item.split("=", 1) for item in args.endpoint_latency),
+        async_delay=args.async_delay,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_in_flight=args.max_in_flight,
+        seed=args.seed,
+    )
+    server = BriaStubServer(config, args.host, args.port, verbose=args.verbose)
+    print(f"Bria stand-in listening on {server.url}")
+    print(f"  BRIA_API_BASE_URL={server.url} HF_API_BASE_URL={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
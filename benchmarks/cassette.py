@@ -0,0 +1,338 @@
+"""
+HTTP record/replay cassettes
+
+Records every request the services make (Bria, Hugging Face, OpenAI,
+Anthropic and result-image downloads) with its response and timing into a
+gzipped JSON Lines cassette, then replays it offline with the original
+timings or time-scaled. Recordings are safe to share: API tokens and
+secrets in headers, query strings and bodies are redacted, and base64
+image payloads and image responses are stored as SHA-256 + length only.
+Replayed images are a valid placeholder PNG padded to the recorded length,
+so transfer sizes and decode paths stay realistic.
+
+Requests are matched by method and URL path, in recorded order per path.
+A recorded sequence can be replayed repeatedly to drive throughput runs.
+
+Usage:
+    # Record real traffic (needs BRIA_API_KEY and network access)
+    python -m benchmarks.cassette record benchmarks/cassettes/ad_set.jsonl.gz --workflow ad_set
+    # Replay it offline: 20 runs, 4 at a time, at half the recorded latency
+    python -m benchmarks.cassette replay benchmarks/cassettes/ad_set.jsonl.gz --workflow ad_set \\
+        --runs 20 --concurrency 4 --time-scale 0.5
+    python -m benchmarks.cassette info benchmarks/cassettes/ad_set.jsonl.gz
+"""
+
+import argparse
+import base64
+import binascii
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests.adapters import HTTPAdapter
+
+from benchmarks.http_stub import build_response
+
+CASSETTE_VERSION = 1
+REDACTED = "<redacted>"
+
+# Lower-cased header, query and body field names whose values are credentials
+SECRET_NAMES = {
+    "api_token", "api_key", "api-key", "x-api-key", "authorization", "proxy-authorization",
+    "cookie", "set-cookie", "api_secret", "token", "access_token", "key", "secret",
+}
+# Response headers worth keeping; the rest is CDN noise
+KEPT_RESPONSE_HEADERS = {"content-type", "content-length", "retry-after"}
+# Strings this long made only of base64 characters are image payloads
+_BASE64_PAYLOAD = re.compile(r"^(data:[\w/+.-]+;base64,)?[A-Za-z0-9+/=\s]{512,}$")
+
+
+def _blob(data: bytes) -> Dict[str, Any]:
+    return {"$blob": hashlib.sha256(data).hexdigest(), "length": len(data)}
+
+
+def scrub(value: Any) -> Any:
+    """Redact secrets and replace base64 payloads in a decoded JSON value"""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SECRET_NAMES else scrub(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [scrub(v) for v in value]
+    if isinstance(value, str) and _BASE64_PAYLOAD.match(value):
+        try:
+            return _blob(base64.b64decode(value.split(",", 1)[-1], validate=False))
+        except (binascii.Error, ValueError):
+            return _blob(value.encode("utf-8"))
+    return value
+
+
+def scrub_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, REDACTED if k.lower() in SECRET_NAMES else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="<>")))
+
+
+def match_key(method: str, url: str) -> str:
+    # Host is left out so a cassette recorded against one base URL (see
+    # services/endpoints.py) replays against any other
+    return f"{method} {urlsplit(url).path}"
+
+
+def encode_body(data: Optional[bytes], content_type: str) -> Optional[Dict[str, Any]]:
+    """Store a body as scrubbed JSON, text, or a blob reference for binary data"""
+    if not data:
+        return None
+    if "json" in content_type or data[:1] in (b"{", b"["):
+        try:
+            return {"json": scrub(json.loads(data))}
+        except ValueError:
+            pass
+    if content_type.startswith("text/"):
+        return {"text": data.decode("utf-8", errors="replace")}
+    return _blob(data)
+
+
+def placeholder_bytes(length: int) -> bytes:
+    """A decodable PNG padded with trailing zeros to ``length`` bytes"""
+    from PIL import Image
+    output = io.BytesIO()
+    Image.new("RGB", (64, 64), (102, 126, 234)).save(output, format="PNG")
+    png = output.getvalue()
+    return png + b"\0" * max(0, length - len(png))
+
+
+def decode_body(body: Optional[Dict[str, Any]]) -> bytes:
+    if not body:
+        return b""
+    if "json" in body:
+        return json.dumps(body["json"]).encode("utf-8")
+    if "text" in body:
+        return body["text"].encode("utf-8")
+    return placeholder_bytes(body["length"])
+
+
+class Recorder:
+    """Wraps the real HTTPAdapter.send and appends each exchange to a cassette"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._original_send = None
+        self._started = 0.0
+
+    def __enter__(self) -> "Recorder":
+        recorder = self
+        original = self._original_send = HTTPAdapter.send
+        self._started = time.monotonic()
+
+        def send(adapter, request, **kwargs):
+            offset = time.monotonic() - recorder._started
+            start = time.perf_counter()
+            response = original(adapter, request, **kwargs)
+            content = response.content  # read fully so the elapsed time covers the body
+            recorder._add(request, response, content, offset, time.perf_counter() - start)
+            return response
+
+        HTTPAdapter.send = send
+        return self
+
+    def __exit__(self, *exc_info):
+        HTTPAdapter.send = self._original_send
+        self.save()
+
+    def _add(self, request, response, content: bytes, offset: float, elapsed: float):
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        entry = {
+            "method": request.method,
+            "url": scrub_url(request.url),
+            "request_headers": {k: REDACTED if k.lower() in SECRET_NAMES else v for k, v in request.headers.items()},
+            "request_body": encode_body(body, request.headers.get("Content-Type", "")),
+            "status": response.status_code,
+            "reason": response.reason,
+            "response_headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_RESPONSE_HEADERS},
+            "response_body": encode_body(content, response.headers.get("Content-Type", "")),
+            "offset_s": round(offset, 4),
+            "elapsed_s": round(elapsed, 4),
+        }
+        with self._lock:
+            self.entries.append(entry)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION, "entries": len(entries)}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def load_cassette(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version {header.get('version')} in {path}")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+class Player:
+    """Serves recorded responses in place of the network
+
+    ``time_scale`` multiplies the recorded latencies (0 replays instantly).
+    With ``cycle`` the recording restarts for a path once its responses are
+    used up, so one recording can drive many runs; without it an
+    exhausted or unknown request raises LookupError.
+    """
+
+    def __init__(self, path: str, time_scale: float = 1.0, cycle: bool = True):
+        self.path = path
+        self.time_scale = time_scale
+        self.cycle = cycle
+        self.header, self.entries = load_cassette(path)
+        self._recorded: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in self.entries:
+            self._recorded[match_key(entry["method"], entry["url"])].append(entry)
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._original_send = None
+        self._bodies: Dict[int, bytes] = {}
+        self.served = 0
+
+    def __enter__(self) -> "Player":
+        player = self
+        self._original_send = HTTPAdapter.send
+
+        def send(adapter, request, **kwargs):
+            return player._send(request)
+
+        HTTPAdapter.send = send
+        return self
+
+    def __exit__(self, *exc_info):
+        HTTPAdapter.send = self._original_send
+
+    def _next_entry(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                if key not in self._recorded or (key in self._queues and not self.cycle):
+                    raise LookupError(f"No recorded response left for {key} in {self.path}")
+                queue = self._queues[key] = deque(self._recorded[key])
+            self.served += 1
+            return queue.popleft()
+
+    def _send(self, request):
+        entry = self._next_entry(match_key(request.method, request.url))
+        if self.time_scale:
+            time.sleep(entry["elapsed_s"] * self.time_scale)
+        with self._lock:
+            content = self._bodies.get(id(entry))
+            if content is None:
+                content = self._bodies[id(entry)] = decode_body(entry["response_body"])
+        headers = dict(entry["response_headers"])
+        if "Content-Length" in headers or "content-length" in headers:
+            headers = {k: v for k, v in headers.items() if k.lower() != "content-length"}
+            headers["Content-Length"] = str(len(content))
+        return build_response(request, entry["status"], headers, content, reason=entry.get("reason"))
+
+
+def run_workflow(name: str, prompt: str, api_key: str) -> Any:
+    """One unit of work for record/replay runs"""
+    if name == "ad_set":
+        from workflows.generate_ad_set import generate_ad_set
+        result = generate_ad_set(api_key, prompt=prompt, config={
+            "create_packshot": True, "add_shadow": True, "lifestyle_shot": True,
+            "scene_description": "on a marble kitchen counter, morning light",
+        })
+        return result
+    if name == "hd":
+        import services
+        return services.generate_hd_image(api_key, prompt)
+    if name == "logo":
+        import services
+        return services.generate_logo(prompt, api_key, num_results=1)
+    if name == "copy":
+        import services
+        return services.generate_marketing_copy_free(prompt)
+    raise ValueError(f"Unknown workflow {name!r}")
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay", "info"])
+    parser.add_argument("cassette")
+    parser.add_argument("--workflow", choices=["ad_set", "hd", "logo", "copy"], default="ad_set")
+    parser.add_argument("--prompt", default="Insulated steel water bottle, matte black, studio product photo")
+    parser.add_argument("--runs", type=int, default=10, help="Replay: workflow runs")
+    parser.add_argument("--concurrency", type=int, default=1, help="Replay: runs in parallel")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Replay: multiply recorded latencies")
+    args = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, repo_root)
+
+    if args.mode == "info":
+        header, entries = load_cassette(args.cassette)
+        by_key = defaultdict(list)
+        for entry in entries:
+            by_key[match_key(entry["method"], entry["url"])].append(entry["elapsed_s"] * 1000)
+        print(f"{args.cassette}: {header['entries']} exchanges, {os.path.getsize(args.cassette) / 1024:.1f} KiB")
+        for key, latencies in sorted(by_key.items()):
+            print(f"  {len(latencies):4d}x  median {statistics.median(latencies):8.1f} ms  {key}")
+        return
+
+    if args.mode == "record":
+        api_key = os.getenv("BRIA_API_KEY")
+        if not api_key and args.workflow != "copy":
+            sys.exit("BRIA_API_KEY is required to record")
+        with Recorder(args.cassette) as recorder:
+            started = time.perf_counter()
+            run_workflow(args.workflow, args.prompt, api_key)
+            elapsed = time.perf_counter() - started
+        print(f"Recorded {len(recorder.entries)} exchanges in {elapsed:.2f}s to {args.cassette}")
+        return
+
+    from services.image_cache import get_image_cache
+
+    latencies = []
+    with Player(args.cassette, time_scale=args.time_scale) as player:
+        def timed_run(_):
+            # Every run should pay for its image downloads; a warm process-wide
+            # cache would otherwise turn later runs into cache hits.
+            cache = get_image_cache()
+            cache.images.clear()
+            cache.thumbnails.clear()
+            start = time.perf_counter()
+            run_workflow(args.workflow, args.prompt, "replay-token")
+            return time.perf_counter() - start
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            latencies = list(pool.map(timed_run, range(args.runs)))
+        wall = time.perf_counter() - started
+
+    print(f"Replayed {player.served} exchanges for {args.runs} {args.workflow} runs "
+          f"(concurrency {args.concurrency}, time scale {args.time_scale})")
+    print(f"  throughput {args.runs / wall:.2f} runs/s")
+    print(f"  latency p50 {_percentile(latencies, 50) * 1000:.0f} ms, "
+          f"p95 {_percentile(latencies, 95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+In-process HTTP stub for benchmarks
+
+Patches requests' HTTPAdapter.send so every outbound call the app and the
+services make is answered locally with a canned Bria, Hugging Face, OpenAI,
+Anthropic or result-image response, and recorded. Nothing leaves the
+process, so benchmarks run offline and can count exactly which requests
+each interaction made.
+
+Usage:
+    from benchmarks.http_stub import HTTPStub
+
+    with HTTPStub() as stub:
+        services.generate_hd_image("token", "a red bicycle")
+    print(stub.counts())
+"""
+
+import io
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+BRIA_HOST = "engine.prod.bria-api.com"
+HF_HOST = "api-inference.huggingface.co"
+RESULT_HOST = "results.stub.local"
+
+STUB_COPY = ("Crafted for everyday performance, this product pairs clean design with "
+             "durable materials so it looks as good on day one hundred as on day one.")
+
+# (status, headers, body)
+StubReply = Tuple[int, Dict[str, str], bytes]
+
+
+def json_reply(payload: Any, status: int = 200) -> StubReply:
+    return status, {"Content-Type": "application/json"}, json.dumps(payload).encode("utf-8")
+
+
+def build_response(request: requests.PreparedRequest, status: int, headers: Dict[str, str],
+                   content: bytes, reason: Optional[str] = None) -> requests.Response:
+    """A fully read requests.Response, as HTTPAdapter.send would return it"""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason or ("OK" if status < 400 else "Stubbed Error")
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = request.url
+    response.request = request
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(content)
+    response._content = content
+    response._content_consumed = True  # iter_content() then slices _content instead of reading raw
+    return response
+
+
+class CannedBackend:
+    """Builds plausible responses for every endpoint the services call
+
+    Generation endpoints return fresh result URLs under ``result_base``
+    (RESULT_HOST by default), which serve one small PNG. The response
+    shapes follow what the service wrappers and app.py parse, not the full
+    Bria schema.
+    """
+
+    def __init__(self, image_size: Tuple[int, int] = (512, 512), result_base: str = f"https://{RESULT_HOST}"):
+        self.image_size = image_size
+        self.result_base = result_base.rstrip("/")
+        self._counter = itertools.count(1)
+        self._image: Optional[bytes] = None
+        self._image_lock = threading.Lock()
+
+    def result_url(self, payload: Dict[str, Any]) -> str:
+        return f"{self.result_base}/results/{next(self._counter):06d}.png"
+
+    def image_bytes(self) -> bytes:
+        with self._image_lock:
+            if self._image is None:
+                from PIL import Image
+                output = io.BytesIO()
+                Image.new("RGB", self.image_size, (102, 126, 234)).save(output, format="PNG")
+                self._image = output.getvalue()
+            return self._image
+
+    def handle(self, method: str, url: str, body: Optional[bytes]) -> StubReply:
+        """Answer one request, routed by host"""
+        parts = urlsplit(url)
+        try:
+            payload = json.loads(body) if body else {}
+        except (TypeError, ValueError):
+            payload = {}
+
+        if parts.hostname == RESULT_HOST:
+            image = self.image_bytes()
+            headers = {"Content-Type": "image/png", "Content-Length": str(len(image))}
+            return 200, headers, b"" if method == "HEAD" else image
+        if parts.hostname == BRIA_HOST:
+            return self.bria(parts.path, payload)
+        if parts.hostname == HF_HOST:
+            return json_reply([{"generated_text": STUB_COPY}])
+        if parts.hostname == "api.openai.com":
+            return json_reply({"choices": [{"message": {"role": "assistant", "content": STUB_COPY}}]})
+        if parts.hostname == "api.anthropic.com":
+            return json_reply({"content": [{"type": "text", "text": STUB_COPY}]})
+        if method == "GET" and parts.path.lower().endswith((".png", ".jpg", ".jpeg", ".webp")):
+            return self.handle(method, f"https://{RESULT_HOST}{parts.path}", None)
+        return json_reply({"error": f"No stub for {method} {url}"}, status=404)
+
+    def bria(self, path: str, payload: Dict[str, Any]) -> StubReply:
+        """Answer a Bria API call"""
+        num_results = int(payload.get("num_results") or 1)
+        if path == "/v1/prompt_enhancer":
+            prompt = payload.get("prompt", "")
+            return json_reply({"prompt variations": f"{prompt}, studio lighting, highly detailed, sharp focus"})
+        if path.startswith("/v1/text-to-image/"):
+            return json_reply({"result": [
+                {"urls": [self.result_url(payload)], "seed": 1000 + i, "uuid": f"stub-{i}"} for i in range(num_results)
+            ]})
+        if path.startswith("/v1/product/lifestyle_shot_by_"):
+            return json_reply({"result": [[self.result_url(payload), 1000 + i, f"stub-{i}"] for i in range(num_results)]})
+        if path in ("/v1/product/packshot", "/v1/product/shadow", "/v1/erase_foreground"):
+            return json_reply({"result_url": self.result_url(payload)})
+        if path == "/v1/gen_fill":
+            return json_reply({"urls": [self.result_url(payload) for _ in range(num_results)]})
+        return json_reply({"error": f"Unknown Bria endpoint {path}"}, status=404)
+
+
+class HTTPStub:
+    """Context manager that routes all requests traffic to a CannedBackend
+
+    Every call is recorded as (method, host, path). ``latency`` adds a
+    fixed delay per request to model network time; leave it at 0 when
+    measuring the app's own CPU cost. ``routes`` can override individual
+    (method, host, path) triples with a callable returning a StubReply.
+    """
+
+    def __init__(self, backend: Optional[CannedBackend] = None, latency: float = 0.0):
+        self.backend = backend or CannedBackend()
+        self.latency = latency
+        self.routes: Dict[Tuple[str, str, str], Callable[[requests.PreparedRequest], StubReply]] = {}
+        self.calls: List[Tuple[str, str, str]] = []
+        self._lock = threading.Lock()
+        self._original_send = None
+
+    def __enter__(self) -> "HTTPStub":
+        stub = self
+        self._original_send = HTTPAdapter.send
+
+        def send(adapter, request, **kwargs):
+            return stub._send(request)
+
+        HTTPAdapter.send = send
+        return self
+
+    def __exit__(self, *exc_info):
+        HTTPAdapter.send = self._original_send
+        self._original_send = None
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self.calls)
+
+    def counts(self, since: int = 0) -> Dict[str, int]:
+        """Requests per "METHOD host/path" (result image paths collapsed), from call number ``since``"""
+        with self._lock:
+            calls = self.calls[since:]
+        return dict(Counter(
+            f"{method} {host}{'/results/*' if host == RESULT_HOST else path}" for method, host, path in calls
+        ))
+
+    def _send(self, request: requests.PreparedRequest) -> requests.Response:
+        parts = urlsplit(request.url)
+        with self._lock:
+            self.calls.append((request.method, parts.hostname, parts.path))
+        if self.latency:
+            time.sleep(self.latency)
+
+        route = self.routes.get((request.method, parts.hostname, parts.path))
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        status, headers, content = route(request) if route else self.backend.handle(request.method, request.url, body)
+        return build_response(request, status, headers, content)
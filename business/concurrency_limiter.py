@@ -0,0 +1,344 @@
+"""
+J-Genix Studio - Tier-Aware Concurrency Limiter
+Enforces PricingTier concurrent_requests limits on outbound Bria and copywriter calls
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from analytics.tracing import span
+
+from .pricing_strategy import PricingTier
+
+# (user_id, tier_name) of whoever is driving the current call stack
+_current_caller: contextvars.ContextVar[Optional[Tuple[str, str]]] = contextvars.ContextVar(
+    "current_caller", default=None
+)
+
+# Calls made outside a caller context (batch jobs, workflows) share one slot
+# in the round-robin ring and are only bounded by the node-wide limit
+SYSTEM_CALLER = "__system__"
+
+# Longest a tier_limited call waits for its slot (TIER_LIMIT_TIMEOUT seconds, 0 waits forever)
+DEFAULT_SLOT_TIMEOUT = float(os.getenv("TIER_LIMIT_TIMEOUT", "120")) or None
+
+
+class SlotTimeoutError(TimeoutError):
+    """Raised when a call gives up waiting for its tier's request slot"""
+
+
+@contextmanager
+def caller_context(user_id: str, tier_name: str):
+    """Attribute every limited call made inside this block to a user and tier"""
+    token = _current_caller.set((user_id, tier_name))
+    try:
+        yield
+    finally:
+        _current_caller.reset(token)
+
+
+def get_current_caller() -> Optional[Tuple[str, str]]:
+    """Get the (user_id, tier_name) set by the enclosing caller_context"""
+    return _current_caller.get()
+
+
+class _Waiter:
+    """A queued request for a slot"""
+
+    __slots__ = ("user_id", "tier_name", "enqueued_at", "granted", "event", "future", "loop")
+
+    def __init__(self, user_id: str, tier_name: Optional[str], loop=None):
+        self.user_id = user_id
+        self.tier_name = tier_name
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.event = threading.Event()
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+
+    def grant(self):
+        self.granted = True
+        self.event.set()
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(self._resolve_future)
+
+    def _resolve_future(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class TierConcurrencyLimiter:
+    """Per-user semaphores sized by pricing tier, under a node-wide cap
+
+    Each user may hold at most ``concurrent_requests`` slots for their tier,
+    and the limiter as a whole holds at most ``max_in_flight`` so we stay
+    under the upstream provider's rate limits. When a slot frees up, waiting
+    users are served round-robin rather than in arrival order, so a large
+    enterprise batch cannot starve interactive free-tier users.
+    """
+
+    def __init__(self, name: str, max_in_flight: int = 8, idle_ttl: float = 300.0):
+        self.name = name
+        self.max_in_flight = max(1, max_in_flight)
+        self.idle_ttl = idle_ttl
+
+        self._lock = threading.Lock()
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._ready: "OrderedDict[str, None]" = OrderedDict()  # users with waiters, in service order
+        self._in_flight = 0
+        self._last_reap = time.monotonic()
+
+        # Metrics
+        self._acquired_total = 0
+        self._timeouts_total = 0
+        self._wait_total_s = 0.0
+        self._wait_max_s = 0.0
+        self._recent_waits = deque(maxlen=1000)
+
+    def acquire(self, user_id: str, tier_name: Optional[str], timeout: Optional[float] = None) -> bool:
+        """Block until a slot is available; returns False if the timeout expired"""
+        waiter = self._enqueue(user_id, tier_name)
+        if waiter.event.wait(timeout):
+            return True
+
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._abandon(waiter)
+            self._timeouts_total += 1
+        return False
+
+    async def acquire_async(self, user_id: str, tier_name: Optional[str],
+                            timeout: Optional[float] = None) -> bool:
+        """Await a slot without blocking the event loop"""
+        waiter = self._enqueue(user_id, tier_name, loop=asyncio.get_running_loop())
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._abandon(waiter)
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._timeouts_total += 1
+            if granted:
+                if isinstance(e, asyncio.TimeoutError):
+                    return True
+                self.release(user_id)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+
+    def release(self, user_id: str):
+        """Return a slot acquired by ``user_id``"""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None or entry["in_flight"] == 0:
+                return
+            entry["in_flight"] -= 1
+            entry["last_active"] = time.monotonic()
+            self._in_flight -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, user_id: str, tier_name: Optional[str], timeout: Optional[float] = None):
+        """Hold a slot for the duration of the block"""
+        with span(f"{self.name} slot wait"):
+            acquired = self.acquire(user_id, tier_name, timeout)
+        if not acquired:
+            raise self._timeout_error(tier_name, timeout)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+    @asynccontextmanager
+    async def slot_async(self, user_id: str, tier_name: Optional[str], timeout: Optional[float] = None):
+        """Async variant of ``slot``"""
+        with span(f"{self.name} slot wait"):
+            acquired = await self.acquire_async(user_id, tier_name, timeout)
+        if not acquired:
+            raise self._timeout_error(tier_name, timeout)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+    def _timeout_error(self, tier_name: Optional[str], timeout: Optional[float]) -> SlotTimeoutError:
+        limit = self._limit_for(tier_name)
+        return SlotTimeoutError(
+            f"Timed out after {timeout:g}s waiting for a {self.name} request slot "
+            f"({tier_name or 'system'} allows {limit} concurrent request{'s' if limit != 1 else ''}); "
+            f"please try again shortly"
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, in-flight and wait time metrics"""
+        with self._lock:
+            queue_depth_by_tier: Dict[str, int] = {}
+            for entry in self._users.values():
+                if entry["waiters"]:
+                    tier = entry["tier_name"] or "system"
+                    queue_depth_by_tier[tier] = queue_depth_by_tier.get(tier, 0) + len(entry["waiters"])
+
+            recent = sorted(self._recent_waits)
+            return {
+                "name": self.name,
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "queue_depth": sum(queue_depth_by_tier.values()),
+                "queue_depth_by_tier": queue_depth_by_tier,
+                "tracked_users": len(self._users),
+                "acquired_total": self._acquired_total,
+                "timeouts_total": self._timeouts_total,
+                "avg_wait_ms": (self._wait_total_s / self._acquired_total * 1000) if self._acquired_total else 0.0,
+                "max_wait_ms": self._wait_max_s * 1000,
+                "p95_wait_ms": recent[int(len(recent) * 0.95) - 1] * 1000 if recent else 0.0
+            }
+
+    def reap_idle(self):
+        """Drop per-user entries that have been idle for longer than idle_ttl"""
+        with self._lock:
+            self._reap_idle(time.monotonic())
+
+    def _enqueue(self, user_id: str, tier_name: Optional[str], loop=None) -> _Waiter:
+        waiter = _Waiter(user_id, tier_name, loop)
+        with self._lock:
+            now = waiter.enqueued_at
+            if now - self._last_reap > self.idle_ttl / 2:
+                self._reap_idle(now)
+
+            entry = self._users.get(user_id)
+            if entry is None:
+                entry = self._users[user_id] = {
+                    "tier_name": tier_name,
+                    "limit": self._limit_for(tier_name),
+                    "in_flight": 0,
+                    "waiters": deque(),
+                    "last_active": now
+                }
+            elif entry["tier_name"] != tier_name:
+                # Tier changed (upgrade/downgrade); takes effect for new slots
+                entry["tier_name"] = tier_name
+                entry["limit"] = self._limit_for(tier_name)
+
+            entry["waiters"].append(waiter)
+            entry["last_active"] = now
+            if user_id not in self._ready:
+                self._ready[user_id] = None
+            self._dispatch()
+        return waiter
+
+    def _dispatch(self):
+        """Grant free slots to waiting users, round-robin. Caller holds the lock."""
+        while self._in_flight < self.max_in_flight and self._ready:
+            for user_id in list(self._ready):
+                entry = self._users[user_id]
+                if entry["in_flight"] >= entry["limit"]:
+                    continue
+
+                waiter = entry["waiters"].popleft()
+                if entry["waiters"]:
+                    self._ready.move_to_end(user_id)
+                else:
+                    del self._ready[user_id]
+
+                entry["in_flight"] += 1
+                self._in_flight += 1
+                self._record_wait(time.monotonic() - waiter.enqueued_at)
+                waiter.grant()
+                break
+            else:
+                # Everyone waiting is already at their tier limit
+                return
+
+    def _abandon(self, waiter: _Waiter):
+        """Remove a waiter that gave up. Caller holds the lock."""
+        entry = self._users.get(waiter.user_id)
+        if entry is None:
+            return
+        try:
+            entry["waiters"].remove(waiter)
+        except ValueError:
+            return
+        if not entry["waiters"]:
+            self._ready.pop(waiter.user_id, None)
+
+    def _reap_idle(self, now: float):
+        cutoff = now - self.idle_ttl
+        for user_id in [uid for uid, entry in self._users.items()
+                        if entry["in_flight"] == 0 and not entry["waiters"] and entry["last_active"] < cutoff]:
+            del self._users[user_id]
+        self._last_reap = now
+
+    def _record_wait(self, wait_s: float):
+        self._acquired_total += 1
+        self._wait_total_s += wait_s
+        self._wait_max_s = max(self._wait_max_s, wait_s)
+        self._recent_waits.append(wait_s)
+
+    def _limit_for(self, tier_name: Optional[str]) -> int:
+        if tier_name is None:
+            return self.max_in_flight
+        return PricingTier.get_tier_info(tier_name)["limits"]["concurrent_requests"]
+
+
+# Node-wide caps per upstream provider group
+LIMITER_MAX_IN_FLIGHT = {
+    "bria": int(os.getenv("BRIA_MAX_CONCURRENCY", "8")),
+    "copywriter": int(os.getenv("COPYWRITER_MAX_CONCURRENCY", "8"))
+}
+
+_limiters: Dict[str, TierConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str) -> TierConcurrencyLimiter:
+    """Get the process-wide limiter for a provider group"""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                limiter = _limiters[name] = TierConcurrencyLimiter(
+                    name, LIMITER_MAX_IN_FLIGHT.get(name, 8)
+                )
+    return limiter
+
+
+def get_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for every limiter created so far"""
+    return {name: limiter.get_metrics() for name, limiter in list(_limiters.items())}
+
+
+def tier_limited(name: str, timeout: Optional[float] = DEFAULT_SLOT_TIMEOUT) -> Callable:
+    """Decorator gating a service call on the caller's tier slot in limiter ``name``
+
+    Raises SlotTimeoutError if no slot frees up within ``timeout`` seconds
+    (TIER_LIMIT_TIMEOUT by default), so a stuck upstream call can't pin
+    the scheduler's workers forever.
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                user_id, tier_name = get_current_caller() or (SYSTEM_CALLER, None)
+                async with get_limiter(name).slot_async(user_id, tier_name, timeout):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            user_id, tier_name = get_current_caller() or (SYSTEM_CALLER, None)
+            with get_limiter(name).slot(user_id, tier_name, timeout):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,9 +2,15 @@
 ProductAI Pro - Pricing Strategy & Business Model
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-import stripe  # For payment processing
+import itertools
+import threading
+import time
+
+# For payment processing. Imported by PaymentProcessor on first use, since
+# quota and concurrency checks import this module on every app start.
+stripe = None
 
 class PricingTier:
     """Define pricing tiers and their capabilities"""
@@ -151,6 +157,12 @@ class PaymentProcessor:
     """Handle payment processing and subscription management"""
     
     def __init__(self, stripe_secret_key: str):
+        global stripe
+        if stripe is None:
+            try:
+                import stripe
+            except ImportError:
+                raise ImportError("stripe is required for payment processing")
         stripe.api_key = stripe_secret_key
         self.webhook_secret = None
     
@@ -253,10 +265,23 @@ class PaymentProcessor:
         return {"status": "subscription_cancelled"}
 
 class UsageTracker:
-    """Track user usage across different features"""
+    """Track user usage across different features
+
+    Monthly totals are cached in-process so that limit checks do not run an
+    aggregation query per generation. ``record_usage`` writes through to the
+    cache, entries are reconciled against the database every
+    ``reconcile_interval`` seconds, and ``reserve``/``commit``/``release``
+    hold quota for in-flight requests so concurrent callers cannot overshoot
+    a limit between the check and the write.
+    """
     
-    def __init__(self, database_connection):
+    def __init__(self, database_connection, reconcile_interval: float = 300.0):
         self.db = database_connection
+        self.reconcile_interval = reconcile_interval
+        self._lock = threading.Lock()
+        self._usage_cache: Dict[str, Dict[str, Any]] = {}
+        self._reservations: Dict[int, Dict[str, Any]] = {}
+        self._reservation_ids = itertools.count(1)
     
     def record_usage(self, user_id: str, feature: str, quantity: int = 1):
         """Record feature usage for a user"""
@@ -268,6 +293,13 @@ class UsageTracker:
         """
         
         self.db.execute(query, (user_id, feature, quantity, datetime.now(), quantity))
+        
+        # Write through to the cache so the next check sees this usage
+        with self._lock:
+            entry = self._usage_cache.get(user_id)
+            if entry and entry["month"] == self._current_month():
+                entry["usage"][feature] = entry["usage"].get(feature, 0) + quantity
+                entry["version"] += 1
     
     def get_monthly_usage(self, user_id: str) -> Dict[str, int]:
         """Get user's usage for the current month"""
@@ -282,9 +314,48 @@ class UsageTracker:
         results = self.db.execute(query, (user_id,)).fetchall()
         return {row["feature"]: row["total"] for row in results}
     
+    def get_cached_usage(self, user_id: str) -> Dict[str, int]:
+        """Get user's usage for the current month, served from the cache when fresh"""
+        with self._lock:
+            entry = self._usage_cache.get(user_id)
+            if entry and not self._is_stale(entry):
+                return dict(entry["usage"])
+        
+        self.reconcile(user_id)
+        
+        with self._lock:
+            return dict(self._usage_cache[user_id]["usage"])
+    
+    def reconcile(self, user_id: Optional[str] = None):
+        """Reload cached usage from the database for one user, or all cached users"""
+        user_ids = [user_id] if user_id else list(self._usage_cache.keys())
+        
+        for uid in user_ids:
+            with self._lock:
+                entry = self._usage_cache.get(uid)
+                version = entry["version"] if entry else None
+            
+            # Query outside the lock so limit checks never wait on the database
+            usage = self.get_monthly_usage(uid)
+            
+            with self._lock:
+                entry = self._usage_cache.get(uid)
+                if entry and entry["version"] != version and not self._is_stale(entry, allow_expired=True):
+                    # A write landed while we were querying; the database
+                    # result may or may not include it, so keep the cache
+                    # and try again next interval
+                    entry["loaded_at"] = time.monotonic()
+                    continue
+                self._usage_cache[uid] = {
+                    "usage": usage,
+                    "month": self._current_month(),
+                    "loaded_at": time.monotonic(),
+                    "version": 0
+                }
+    
     def check_limits(self, user_id: str, tier_name: str) -> Dict[str, Any]:
         """Check if user is within their tier limits"""
-        usage = self.get_monthly_usage(user_id)
+        usage = self.get_cached_usage(user_id)
         limits_status = PricingTier.check_usage_limits(tier_name, usage)
         
         return {
@@ -292,6 +363,61 @@ class UsageTracker:
             "limits_status": limits_status,
             "can_use_feature": all(limits_status.values())
         }
+    
+    def reserve(self, user_id: str, tier_name: str, feature: str, quantity: int = 1) -> Optional[int]:
+        """Hold quota for an in-flight request
+
+        Returns a reservation id to pass to ``commit`` or ``release``, or
+        ``None`` if recorded plus reserved usage would exceed the tier limit.
+        """
+        self.get_cached_usage(user_id)
+        
+        with self._lock:
+            usage = dict(self._usage_cache[user_id]["usage"])
+            for reservation in self._reservations.values():
+                if reservation["user_id"] == user_id and reservation["feature"] == feature:
+                    usage[feature] = usage.get(feature, 0) + reservation["quantity"]
+            
+            usage[feature] = usage.get(feature, 0) + quantity - 1
+            if not PricingTier.check_usage_limits(tier_name, usage).get(feature, True):
+                return None
+            
+            reservation_id = next(self._reservation_ids)
+            self._reservations[reservation_id] = {
+                "user_id": user_id,
+                "feature": feature,
+                "quantity": quantity
+            }
+            return reservation_id
+    
+    def commit(self, reservation_id: int):
+        """Record the usage held by a reservation"""
+        with self._lock:
+            reservation = self._reservations.get(reservation_id)
+        if not reservation:
+            return
+        
+        self.record_usage(reservation["user_id"], reservation["feature"], reservation["quantity"])
+        
+        with self._lock:
+            self._reservations.pop(reservation_id, None)
+    
+    def release(self, reservation_id: int):
+        """Drop a reservation without recording usage (e.g. the request failed)"""
+        with self._lock:
+            self._reservations.pop(reservation_id, None)
+    
+    def _is_stale(self, entry: Dict[str, Any], allow_expired: bool = False) -> bool:
+        """Check whether a cache entry needs reconciling"""
+        if entry["month"] != self._current_month():
+            return True
+        if allow_expired:
+            return False
+        return time.monotonic() - entry["loaded_at"] > self.reconcile_interval
+    
+    @staticmethod
+    def _current_month() -> str:
+        return datetime.now().strftime("%Y-%m")
 
 # Business Metrics and KPIs
 class BusinessMetrics:
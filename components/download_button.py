@@ -0,0 +1,46 @@
+import streamlit as st
+from services.image_cache import fetch_image_bytes
+
+# st.download_button accepts a zero-argument callable as data from Streamlit 1.52,
+# in which case it only runs when the user clicks
+DEFERRED_DOWNLOADS = tuple(int(part) for part in st.__version__.split(".")[:2]) >= (1, 52)
+
+def render_lazy_download_button(url, label, file_name, mime="image/png", key=None, loader=None):
+    """Render a download button for an image URL that fetches the bytes only on demand.
+
+    ``loader`` turns ``url`` into bytes; it defaults to the image cache, and
+    can be swapped to serve other sources such as local files.
+    """
+
+    if not url:
+        return
+
+    key = key or f"download_{file_name}"
+    loader = loader or fetch_image_bytes
+
+    if DEFERRED_DOWNLOADS:
+        st.download_button(
+            label,
+            data=lambda: loader(url),
+            file_name=file_name,
+            mime=mime,
+            key=key
+        )
+        return
+
+    # Older Streamlit: prepare on click, then keep offering the cached bytes
+    prepared_key = f"{key}_prepared_url"
+    if st.session_state.get(prepared_key) != url:
+        if not st.button("📦 Prepare Download", key=f"{key}_prepare"):
+            return
+        st.session_state[prepared_key] = url
+
+    try:
+        with st.spinner("Preparing download..."):
+            image_data = loader(url)
+    except Exception as e:
+        st.session_state.pop(prepared_key, None)
+        st.error(f"Error downloading file: {str(e)}")
+        return
+
+    st.download_button(label, image_data, file_name, mime, key=key)
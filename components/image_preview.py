@@ -1,14 +1,27 @@
 import streamlit as st
-import requests
 from PIL import Image
 import io
+from services.image_cache import DEFAULT_THUMBNAIL_SIZE, fetch_image_bytes, get_image_cache, sniff_image_format
 
 def download_image(url):
     """Download image from URL and return as bytes."""
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.content
-    return None
+    try:
+        return fetch_image_bytes(url)
+    except Exception:
+        return None
+
+def _download_payload(image_bytes):
+    """Bytes, extension and mime for a download, re-encoding only unrecognised formats."""
+    sniffed = sniff_image_format(image_bytes)
+    if sniffed:
+        _, extension, mime = sniffed
+        return image_bytes, extension, mime
+
+    # Unknown container: decode and re-encode as PNG
+    image = Image.open(io.BytesIO(image_bytes))
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format='PNG')
+    return img_byte_arr.getvalue(), "png", "image/png"
 
 def render_image_preview(result):
     """Render the image preview with download options."""
@@ -21,30 +34,37 @@ def render_image_preview(result):
     
     # Create columns for multiple images
     cols = st.columns(len(result["images"]))
-    
+
+    # One placeholder per image, filled in as the concurrent fetches finish
+    placeholders = []
+    urls = []
     for idx, (col, image_data) in enumerate(zip(cols, result["images"])):
         with col:
             if "url" in image_data:
-                image_bytes = download_image(image_data["url"])
-                if image_bytes:
-                    st.image(image_bytes, caption=f"Generated Image {idx + 1}")
-                    
-                    # Convert to PIL Image for saving
-                    image = Image.open(io.BytesIO(image_bytes))
-                    
-                    # Save button
-                    img_byte_arr = io.BytesIO()
-                    image.save(img_byte_arr, format=image.format or 'PNG')
-                    img_byte_arr = img_byte_arr.getvalue()
-                    
-                    st.download_button(
-                        label=f"💾 Download Image {idx + 1}",
-                        data=img_byte_arr,
-                        file_name=f"adsnap_generated_{idx + 1}.png",
-                        mime="image/png"
-                    )
+                placeholder = st.empty()
+                placeholder.info(f"⏳ Loading image {idx + 1}...")
+                placeholders.append((idx, placeholder))
+                urls.append(image_data["url"])
             else:
                 st.error(f"Invalid image data for image {idx + 1}")
+
+    for url_idx, image_bytes, thumbnail, error in get_image_cache().fetch_many(urls, DEFAULT_THUMBNAIL_SIZE):
+        idx, placeholder = placeholders[url_idx]
+        with placeholder.container():
+            if error is not None:
+                st.error(f"Could not load image {idx + 1}: {str(error)}")
+                continue
+
+            st.image(thumbnail, caption=f"Generated Image {idx + 1}")
+
+            data, extension, mime = _download_payload(image_bytes)
+            st.download_button(
+                label=f"💾 Download Image {idx + 1}",
+                data=data,
+                file_name=f"adsnap_generated_{idx + 1}.{extension}",
+                mime=mime,
+                key=f"image_preview_download_{idx}"
+            )
     
     # Display API response details in expander
     with st.expander("🔍 Image Generation Details"):
@@ -1,6 +1,7 @@
 import streamlit as st
 import magic
 import io
+import services
 
 def is_valid_image(file_content):
     """Validate if the uploaded file is an image."""
@@ -27,7 +28,7 @@ def render_uploader():
             return None
         
         # Preview image
-        st.image(file_content, caption="Uploaded Image", use_container_width=True)
+        st.image(services.get_upload_preview(file_content), caption="Uploaded Image", use_container_width=True)
         
         return uploaded_file
         
@@ -1,68 +1,108 @@
-from .lifestyle_shot import lifestyle_shot_by_text, lifestyle_shot_by_image
-from .shadow import add_shadow
-from .packshot import create_packshot
-from .prompt_enhancement import enhance_prompt
+"""
+J-Genix Studio - Services
+Submodules are imported on first attribute access, so importing the package is cheap
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    'lifestyle_shot_by_text': 'lifestyle_shot',
+    'lifestyle_shot_by_image': 'lifestyle_shot',
+    'add_shadow': 'shadow',
+    'create_packshot': 'packshot',
+    'enhance_prompt': 'prompt_enhancement',
+    'generate_hd_image': 'hd_image_generation',
+    'generate_logo': 'logo_generation',
+    'get_logo_style_options': 'logo_generation',
+    'get_logo_type_options': 'logo_generation',
+    'get_color_scheme_options': 'logo_generation',
+    'validate_logo_prompt': 'logo_generation',
+    'get_logo_generation_tips': 'logo_generation',
+    'enhance_logo_prompt': 'logo_generation',
+    'LOGO_STYLE_INDEX': 'logo_generation',
+    'LOGO_TYPE_INDEX': 'logo_generation',
+    'COLOR_SCHEME_INDEX': 'logo_generation',
+    'plan_logo_exploration': 'logo_exploration',
+    'explore_logos': 'logo_exploration',
+    'summarize_exploration': 'logo_exploration',
+    'tier_concurrency': 'logo_exploration',
+    'extract_colors_from_image': 'brand_kit',
+    'create_brand_kit': 'brand_kit',
+    'apply_brand_to_prompt': 'brand_kit',
+    'save_brand_kit': 'brand_kit',
+    'load_brand_kit': 'brand_kit',
+    'get_available_brand_kits': 'brand_kit',
+    'validate_brand_kit': 'brand_kit',
+    # State backends for running services outside Streamlit
+    'StateStore': 'state',
+    'StreamlitStateStore': 'state',
+    'InMemoryStateStore': 'state',
+    'FileStateStore': 'state',
+    'get_state_store': 'state',
+    'set_state_store': 'state',
+    'generate_marketing_copy': 'copywriter',
+    'generate_multiple_copy_variations': 'copywriter',
+    'validate_api_key': 'copywriter',
+    'get_copy_type_options': 'copywriter',
+    'get_tone_options': 'copywriter',
+    'get_length_options': 'copywriter',
+    # Free copywriter service
+    'generate_marketing_copy_free': 'free_copywriter',
+    'generate_multiple_copy_variations_free': 'free_copywriter',
+    'get_copy_type_options_free': 'free_copywriter',
+    'test_free_copywriter_connection': 'free_copywriter',
+    # Image handling (NumPy and PIL load with these)
+    'canvas_to_mask_png': 'mask_pipeline',
+    'mask_has_strokes': 'mask_pipeline',
+    'get_canvas_background': 'image_decode',
+    'get_upload_preview': 'image_decode',
+    'fetch_image_bytes': 'image_cache',
+    'fetch_thumbnail': 'image_cache',
+    'extract_result_urls': 'responses'
+}
+
+# These two share their submodule's name. Bind them eagerly (the modules are
+# tiny) so an `import services.generative_fill` elsewhere can't leave the
+# package attribute pointing at the module instead of the function.
 from .generative_fill import generative_fill
-from .hd_image_generation import generate_hd_image
 from .erase_foreground import erase_foreground
-from .logo_generation import generate_logo, get_logo_style_options, get_logo_type_options, get_color_scheme_options, validate_logo_prompt, get_logo_generation_tips, enhance_logo_prompt
-from .brand_kit import (
-    extract_colors_from_image,
-    create_brand_kit,
-    apply_brand_to_prompt,
-    save_brand_kit,
-    load_brand_kit,
-    get_available_brand_kits,
-    validate_brand_kit
-)
-from .copywriter import (
-    generate_marketing_copy,
-    generate_multiple_copy_variations,
-    validate_api_key,
-    get_copy_type_options,
-    get_tone_options,
-    get_length_options
-)
 
-# Free copywriter service
-from .free_copywriter import (
-    generate_marketing_copy_free,
-    generate_multiple_copy_variations_free,
-    get_copy_type_options_free,
-    test_free_copywriter_connection
-)
+__all__ = ['generative_fill', 'erase_foreground'] + list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+def load_all():
+    """Import every service eagerly, e.g. to warm a worker before serving traffic"""
+    for name in _LAZY_ATTRS:
+        getattr(importlib.import_module(__name__), name)
+
 
-__all__ = [
-    'lifestyle_shot_by_text',
-    'lifestyle_shot_by_image',
-    'add_shadow',
-    'create_packshot',
-    'enhance_prompt',
-    'generative_fill',
-    'generate_hd_image',
-    'erase_foreground',
-    'generate_logo',
-    'get_logo_style_options',
-    'get_logo_type_options',
-    'get_color_scheme_options',
-    'validate_logo_prompt',
-    'get_logo_generation_tips',
-    'enhance_logo_prompt',
-    'extract_colors_from_image',
-    'create_brand_kit',
-    'apply_brand_to_prompt',
-    'save_brand_kit',
-    'load_brand_kit',
-    'get_available_brand_kits',
-    'validate_brand_kit',
-    'generate_marketing_copy',
-    'generate_multiple_copy_variations',
-    'validate_api_key',
-    'get_copy_type_options',
-    'get_tone_options',
-    'get_length_options',
-    'generate_marketing_copy_free',
-    'generate_multiple_copy_variations_free',
-    'get_copy_type_options_free',
-    'test_free_copywriter_connection'
-]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .lifestyle_shot import lifestyle_shot_by_text, lifestyle_shot_by_image
+    from .shadow import add_shadow
+    from .packshot import create_packshot
+    from .prompt_enhancement import enhance_prompt
+    from .hd_image_generation import generate_hd_image
+    from .logo_generation import generate_logo, get_logo_style_options, get_logo_type_options, get_color_scheme_options, validate_logo_prompt, get_logo_generation_tips, enhance_logo_prompt, LOGO_STYLE_INDEX, LOGO_TYPE_INDEX, COLOR_SCHEME_INDEX
+    from .logo_exploration import plan_logo_exploration, explore_logos, summarize_exploration
+    from .brand_kit import extract_colors_from_image, create_brand_kit, apply_brand_to_prompt, save_brand_kit, load_brand_kit, get_available_brand_kits, validate_brand_kit
+    from .state import StateStore, StreamlitStateStore, InMemoryStateStore, FileStateStore, get_state_store, set_state_store
+    from .copywriter import generate_marketing_copy, generate_multiple_copy_variations, validate_api_key, get_copy_type_options, get_tone_options, get_length_options
+    from .free_copywriter import generate_marketing_copy_free, generate_multiple_copy_variations_free, get_copy_type_options_free, test_free_copywriter_connection
+    from .mask_pipeline import canvas_to_mask_png, mask_has_strokes
+    from .image_decode import get_canvas_background, get_upload_preview
+    from .image_cache import fetch_image_bytes, fetch_thumbnail
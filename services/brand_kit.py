@@ -3,22 +3,25 @@ Brand Kit Generator & Manager
 Handles brand identity creation, color extraction, and brand asset management
 """
 
-import requests
-from PIL import Image
 import io
 import colorsys
 from collections import Counter
-import streamlit as st
 from typing import Dict, List, Tuple, Optional
 import json
 import base64
+from analytics.instrumentation import instrumented, note_http
+from .state import StateStore, get_state_store
 
 
+@instrumented("brand_kit.extract_colors_from_image")
 def extract_colors_from_image(image_url: str, num_colors: int = 5) -> List[str]:
     """Extract dominant colors from an image URL"""
+    import requests
+    from PIL import Image
     try:
         # Download image
         response = requests.get(image_url)
+        note_http(response)
         if response.status_code != 200:
             return ["#667eea", "#764ba2", "#f093fb", "#28a745", "#dc3545"]  # Default colors
 
@@ -93,8 +96,10 @@ def color_similarity(color1: str, color2: str) -> float:
     except:
         return 0
 
-def create_brand_kit(logo_url: str, brand_name: str, tagline: str = "") -> Dict:
+def create_brand_kit(logo_url: str, brand_name: str, tagline: str = "",
+                     store: Optional[StateStore] = None) -> Dict:
     """Create a complete brand kit from a logo"""
+    store = store or get_state_store()
     try:
         # Extract colors from logo
         colors = extract_colors_from_image(logo_url, 5)
@@ -116,13 +121,13 @@ def create_brand_kit(logo_url: str, brand_name: str, tagline: str = "") -> Dict:
                 "secondary": "Roboto, Arial, sans-serif",
                 "heading": "Montserrat, sans-serif"
             },
-            "created_at": st.session_state.get('current_time', 'Unknown')
+            "created_at": store.get('current_time', 'Unknown')
         }
 
         return brand_kit
 
     except Exception as e:
-        st.error(f"Error creating brand kit: {str(e)}")
+        print(f"Error creating brand kit: {str(e)}")
         return None
 
 
@@ -169,43 +174,48 @@ def apply_brand_to_prompt(prompt: str, brand_kit: Dict) -> str:
         print(f"Error applying brand to prompt: {str(e)}")
         return prompt
 
-def save_brand_kit(brand_kit: Dict) -> bool:
-    """Save brand kit to session state"""
+def save_brand_kit(brand_kit: Dict, store: Optional[StateStore] = None) -> bool:
+    """Save brand kit to the state store (session state in the app)"""
+    store = store or get_state_store()
     try:
-        if 'brand_kits' not in st.session_state:
-            st.session_state.brand_kits = {}
+        brand_kits = dict(store.get('brand_kits') or {})
 
         brand_name = brand_kit.get('brand_name', 'Default')
-        st.session_state.brand_kits[brand_name] = brand_kit
-        st.session_state.active_brand_kit = brand_kit
+        brand_kits[brand_name] = brand_kit
+        store.set('brand_kits', brand_kits)
+        store.set('active_brand_kit', brand_kit)
 
         return True
 
     except Exception as e:
-        st.error(f"Error saving brand kit: {str(e)}")
+        print(f"Error saving brand kit: {str(e)}")
         return False
 
 
-def load_brand_kit(brand_name: str) -> Optional[Dict]:
-    """Load brand kit from session state"""
+def load_brand_kit(brand_name: str, store: Optional[StateStore] = None) -> Optional[Dict]:
+    """Load brand kit from the state store (session state in the app)"""
+    store = store or get_state_store()
     try:
-        if 'brand_kits' not in st.session_state:
+        brand_kits = store.get('brand_kits')
+        if not brand_kits:
             return None
 
-        return st.session_state.brand_kits.get(brand_name)
+        return brand_kits.get(brand_name)
 
     except Exception as e:
-        st.error(f"Error loading brand kit: {str(e)}")
+        print(f"Error loading brand kit: {str(e)}")
         return None
 
 
-def get_available_brand_kits() -> List[str]:
+def get_available_brand_kits(store: Optional[StateStore] = None) -> List[str]:
     """Get list of available brand kit names"""
+    store = store or get_state_store()
     try:
-        if 'brand_kits' not in st.session_state:
+        brand_kits = store.get('brand_kits')
+        if not brand_kits:
             return []
 
-        return list(st.session_state.brand_kits.keys())
+        return list(brand_kits.keys())
 
     except Exception as e:
         return []
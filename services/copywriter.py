@@ -3,16 +3,19 @@ AI Content Copywriter
 Generates marketing copy, product descriptions, and social media content
 """
 
-import requests
 import json
-import streamlit as st
 from typing import Dict, List, Optional, Tuple
 import time
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
 
 
+@tier_limited("copywriter")
+@instrumented("copywriter.generate_copy_with_openai")
 def generate_copy_with_openai(prompt: str, api_key: str, copy_type: str = "product_description", 
                              tone: str = "professional", length: str = "medium") -> Optional[str]:
     """Generate copy using OpenAI API"""
+    import requests
     try:
         # OpenAI API endpoint
         url = "https://api.openai.com/v1/chat/completions"
@@ -58,6 +61,7 @@ def generate_copy_with_openai(prompt: str, api_key: str, copy_type: str = "produ
         }
         
         response = requests.post(url, headers=headers, json=data, timeout=30)
+        note_http(response)
         
         if response.status_code == 200:
             result = response.json()
@@ -72,9 +76,12 @@ def generate_copy_with_openai(prompt: str, api_key: str, copy_type: str = "produ
         return None
 
 
+@tier_limited("copywriter")
+@instrumented("copywriter.generate_copy_with_claude")
 def generate_copy_with_claude(prompt: str, api_key: str, copy_type: str = "product_description", 
                              tone: str = "professional", length: str = "medium") -> Optional[str]:
     """Generate copy using Claude API"""
+    import requests
     try:
         # Claude API endpoint
         url = "https://api.anthropic.com/v1/messages"
@@ -116,6 +123,7 @@ def generate_copy_with_claude(prompt: str, api_key: str, copy_type: str = "produ
         }
         
         response = requests.post(url, headers=headers, json=data, timeout=30)
+        note_http(response)
         
         if response.status_code == 200:
             result = response.json()
@@ -130,6 +138,7 @@ def generate_copy_with_claude(prompt: str, api_key: str, copy_type: str = "produ
         return None
 
 
+@instrumented("copywriter.generate_marketing_copy")
 def generate_marketing_copy(image_description: str, brand_kit: Optional[Dict] = None, 
                           copy_type: str = "product_description", tone: str = "professional",
                           length: str = "medium", api_provider: str = "openai", 
@@ -0,0 +1,28 @@
+"""
+J-Genix Studio - API Endpoints
+Base URLs of the external APIs, overridable so the services can point at a local stand-in
+"""
+
+import base64
+import os
+
+from analytics.tracing import span
+
+DEFAULT_BRIA_BASE_URL = "https://engine.prod.bria-api.com"
+DEFAULT_HF_BASE_URL = "https://api-inference.huggingface.co"
+
+
+def bria_url(path: str) -> str:
+    """Full URL for a Bria API path such as "/v1/gen_fill" (BRIA_API_BASE_URL)"""
+    return os.getenv("BRIA_API_BASE_URL", DEFAULT_BRIA_BASE_URL).rstrip("/") + path
+
+
+def hf_model_url(model: str) -> str:
+    """Hugging Face Inference API URL for a model (HF_API_BASE_URL)"""
+    return f"{os.getenv('HF_API_BASE_URL', DEFAULT_HF_BASE_URL).rstrip('/')}/models/{model}"
+
+
+def encode_image_payload(image_data: bytes) -> str:
+    """Base64-encode an image for a Bria JSON body, traced as its own step"""
+    with span("encode_image", **{"jgenix.image_bytes": len(image_data)}):
+        return base64.b64encode(image_data).decode('utf-8')
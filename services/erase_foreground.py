@@ -1,7 +1,10 @@
 from typing import Dict, Any, Optional
-import requests
-import base64
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url, encode_image_payload
 
+@tier_limited("bria")
+@instrumented("bria.erase_foreground")
 def erase_foreground(
     api_key: str,
     image_data: bytes = None,
@@ -17,7 +20,8 @@ def erase_foreground(
         image_url: URL of the image (optional if image_data provided)
         content_moderation: Whether to enable content moderation
     """
-    url = "https://engine.prod.bria-api.com/v1/erase_foreground"
+    import requests
+    url = bria_url("/v1/erase_foreground")
     
     headers = {
         'api_token': api_key,
@@ -34,7 +38,7 @@ def erase_foreground(
     if image_url:
         data['image_url'] = image_url
     elif image_data:
-        data['file'] = base64.b64encode(image_data).decode('utf-8')
+        data['file'] = encode_image_payload(image_data)
     else:
         raise ValueError("Either image_data or image_url must be provided")
     
@@ -44,6 +48,7 @@ def erase_foreground(
         print(f"Data: {data}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
@@ -3,11 +3,12 @@ Free AI Copywriter Service using Hugging Face Inference API
 Provides marketing copy generation without requiring paid API keys
 """
 
-import requests
 import json
 import time
 from typing import Dict, List, Optional, Tuple
-import streamlit as st
+from analytics.instrumentation import instrumented, note_http, note_retry
+from business.concurrency_limiter import tier_limited
+from .endpoints import hf_model_url
 
 # Hugging Face models for different tasks - using more reliable text generation models
 COPYWRITING_MODELS = {
@@ -64,9 +65,7 @@ TEMPLATE_RESPONSES = {
     ]
 }
 
-# Hugging Face Inference API endpoint
-HF_API_URL = "https://api-inference.huggingface.co/models/"
-
+@instrumented("copywriter.generate_marketing_copy_free")
 def generate_marketing_copy_free(
     image_description: str,
     brand_kit: Optional[Dict] = None,
@@ -281,14 +280,17 @@ def get_model_for_copy_type(copy_type: str) -> str:
     }
     return model_mapping.get(copy_type, "general")
 
+@tier_limited("copywriter")
+@instrumented("copywriter.query_huggingface_model")
 def query_huggingface_model(model_name: str, prompt: str, max_retries: int = 2) -> Optional[str]:
     """Query Hugging Face model with improved error handling and fallback"""
+    import requests
 
     # Try multiple models in order of preference
     models_to_try = [model_name, "gpt2", "microsoft/DialoGPT-medium"]
 
     for model in models_to_try:
-        url = f"{HF_API_URL}{model}"
+        url = hf_model_url(model)
 
         headers = {
             "Content-Type": "application/json",
@@ -322,6 +324,7 @@ def query_huggingface_model(model_name: str, prompt: str, max_retries: int = 2)
         for attempt in range(max_retries):
             try:
                 response = requests.post(url, headers=headers, json=payload, timeout=20)
+                note_http(response)
 
                 if response.status_code == 200:
                     result = response.json()
@@ -358,6 +361,7 @@ def query_huggingface_model(model_name: str, prompt: str, max_retries: int = 2)
             except requests.exceptions.RequestException as e:
                 # Silent error handling for better UX
                 if attempt < max_retries - 1:
+                    note_retry()
                     time.sleep(1)
                     continue
                 else:
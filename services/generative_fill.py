@@ -1,7 +1,10 @@
 from typing import Dict, Any, Optional
-import requests
-import base64
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url, encode_image_payload
 
+@tier_limited("bria")
+@instrumented("bria.generative_fill")
 def generative_fill(
     api_key: str,
     image_data: bytes,
@@ -29,7 +32,8 @@ def generative_fill(
         content_moderation: Whether to enable content moderation
         mask_type: Type of mask ('manual' or 'automatic')
     """
-    url = "https://engine.prod.bria-api.com/v1/gen_fill"
+    import requests
+    url = bria_url("/v1/gen_fill")
     
     headers = {
         'api_token': api_key,
@@ -38,8 +42,8 @@ def generative_fill(
     }
     
     # Convert image and mask to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    mask_base64 = base64.b64encode(mask_data).decode('utf-8')
+    image_base64 = encode_image_payload(image_data)
+    mask_base64 = encode_image_payload(mask_data)
     
     # Prepare request data
     data = {
@@ -64,6 +68,7 @@ def generative_fill(
         print(f"Data: {data}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
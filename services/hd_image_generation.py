@@ -1,7 +1,11 @@
 from typing import Dict, Any, Optional, Union
-import requests
 import json
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url
 
+@tier_limited("bria")
+@instrumented("bria.generate_hd_image")
 def generate_hd_image(
     prompt: str,
     api_key: str,
@@ -38,6 +42,7 @@ def generate_hd_image(
         content_moderation: Whether to enable content moderation
         ip_signal: Whether to flag potential IP content
     """
+    import requests
     
     if not prompt:
         raise ValueError("Prompt is required for image generation")
@@ -70,7 +75,7 @@ def generate_hd_image(
     if ip_signal:
         data["ip_signal"] = ip_signal
     
-    url = f"https://engine.prod.bria-api.com/v1/text-to-image/hd/{model_version}"
+    url = bria_url(f"/v1/text-to-image/hd/{model_version}")
     headers = {
         'api_token': api_key,
         'Accept': 'application/json',
@@ -82,6 +87,7 @@ def generate_hd_image(
         print(f"Headers: {headers}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
@@ -0,0 +1,309 @@
+"""
+J-Genix Studio - Image Fetch Cache
+Process-wide, byte-bounded cache of generated images and their preview thumbnails
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from analytics.instrumentation import instrumented, note_cache, note_http
+
+DEFAULT_THUMBNAIL_SIZE = (320, 320)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Leading bytes of the formats Bria and uploads produce: (format, extension, mime)
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ("PNG", "png", "image/png")),
+    (b"\xff\xd8\xff", ("JPEG", "jpg", "image/jpeg")),
+    (b"GIF87a", ("GIF", "gif", "image/gif")),
+    (b"GIF89a", ("GIF", "gif", "image/gif")),
+)
+
+
+class BoundedLRUCache:
+    """Thread-safe LRU cache bounded by the total size of its values
+
+    Values are sized with ``sizeof`` (``len`` by default, i.e. byte strings).
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value and mark it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value without touching recency or hit/miss counts"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting least recently used entries to stay under budget"""
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return  # Would evict everything and still not fit
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return a value"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._size -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def keys(self):
+        """Snapshot of the cached keys, least recently used first"""
+        with self._lock:
+            return list(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size, entry count and hit/miss/eviction counts"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+class _InFlight:
+    """A fetch other threads can wait on instead of issuing their own request"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class ImageFetchCache:
+    """Fetches image URLs once per process and serves repeats from memory
+
+    Concurrent requests for the same URL are coalesced onto a single HTTP
+    request. Full-size bytes and thumbnails have separate byte budgets so
+    thumbnails for the previews stay resident even when large downloads churn.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, thumbnail_max_bytes: int = 32 * 1024 * 1024,
+                 timeout: float = 30.0, max_download_bytes: int = 64 * 1024 * 1024,
+                 fetch_workers: int = 8):
+        self.timeout = timeout
+        self.max_download_bytes = max_download_bytes
+        self.images = BoundedLRUCache(max_bytes)
+        self.thumbnails = BoundedLRUCache(thumbnail_max_bytes)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self.requests_total = 0
+        self.coalesced_total = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.fetch_workers = fetch_workers
+
+    def fetch(self, url: str) -> bytes:
+        """Get the full-resolution bytes for a URL, downloading at most once"""
+        value = self.images.get(url)
+        if value is not None:
+            note_cache(hit=True)
+            return value
+
+        with self._lock:
+            # Re-check under the lock: another thread may have just finished
+            value = self.images.peek(url)
+            if value is not None:
+                note_cache(hit=True)
+                return value
+            pending = self._in_flight.get(url)
+            leader = pending is None
+            if leader:
+                pending = self._in_flight[url] = _InFlight()
+                self.requests_total += 1
+            else:
+                self.coalesced_total += 1
+        # A coalesced request waits on the leader's download but makes none itself
+        note_cache(hit=not leader)
+
+        if not leader:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = self._download(url)
+            self.images.put(url, pending.value)
+            return pending.value
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(url, None)
+            pending.event.set()
+
+    def thumbnail(self, url: str, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+        """Get a downscaled preview of a URL, encoded as PNG (alpha) or JPEG"""
+        key = (url, size)
+        value = self.thumbnails.get(key)
+        note_cache(hit=value is not None)
+        if value is None:
+            value = make_thumbnail(self.fetch(url), size)
+            self.thumbnails.put(key, value)
+        return value
+
+    def fetch_many(self, urls: List[str], thumbnail_size: Optional[Tuple[int, int]] = None
+                   ) -> Iterator[Tuple[int, Optional[bytes], Optional[bytes], Optional[BaseException]]]:
+        """Fetch URLs concurrently, yielding (index, image, thumbnail, error) as each finishes
+
+        Thumbnails are built on the worker threads too, so the caller only
+        has to display them. ``thumbnail`` is None unless thumbnail_size is set.
+        """
+        def load(url):
+            image = self.fetch(url)
+            return image, self.thumbnail(url, thumbnail_size) if thumbnail_size else None
+
+        futures = {self._get_pool().submit(load, url): index for index, url in enumerate(urls)}
+        for future in as_completed(futures):
+            try:
+                image, thumbnail = future.result()
+                yield futures[future], image, thumbnail, None
+            except Exception as e:
+                yield futures[future], None, None, e
+
+    def invalidate(self, url: str):
+        """Forget a URL and its thumbnails"""
+        self.images.pop(url)
+        for key in [key for key in self.thumbnails.keys() if key[0] == url]:
+            self.thumbnails.pop(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and request metrics"""
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {
+            "images": self.images.get_stats(),
+            "thumbnails": self.thumbnails.get_stats(),
+            "requests_total": self.requests_total,
+            "coalesced_total": self.coalesced_total,
+            "in_flight": in_flight
+        }
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="image-fetch")
+            return self._pool
+
+    def _download(self, url: str) -> bytes:
+        """Stream the response body in chunks, refusing bodies over max_download_bytes"""
+        import requests
+        body = bytearray()
+        with requests.get(url, timeout=self.timeout, stream=True) as response:
+            try:
+                response.raise_for_status()
+                declared = int(response.headers.get("Content-Length") or 0)
+                if declared > self.max_download_bytes:
+                    raise ValueError(f"Image is {declared} bytes; the limit is {self.max_download_bytes}")
+
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > self.max_download_bytes:
+                        raise ValueError(f"Image exceeds the {self.max_download_bytes} byte limit")
+                return bytes(body)
+            finally:
+                note_http(response, bytes_in=len(body))
+
+
+def sniff_image_format(image_bytes: bytes) -> Optional[Tuple[str, str, str]]:
+    """Identify (format, extension, mime) from an image's magic bytes, without decoding it"""
+    for signature, info in _IMAGE_SIGNATURES:
+        if image_bytes.startswith(signature):
+            return info
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return ("WEBP", "webp", "image/webp")
+    return None
+
+
+def make_thumbnail(image_bytes: bytes, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+    """Downscale encoded image bytes to fit within size"""
+    from .image_decode import decode_preview, encode_preview  # image_decode imports this module
+    return encode_preview(decode_preview(image_bytes, size))
+
+
+_image_cache: Optional[ImageFetchCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageFetchCache:
+    """Get the process-wide image cache (IMAGE_CACHE_MB, IMAGE_THUMBNAIL_CACHE_MB, IMAGE_FETCH_WORKERS)"""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ImageFetchCache(
+                    max_bytes=int(os.getenv("IMAGE_CACHE_MB", "256")) * 1024 * 1024,
+                    thumbnail_max_bytes=int(os.getenv("IMAGE_THUMBNAIL_CACHE_MB", "32")) * 1024 * 1024,
+                    fetch_workers=int(os.getenv("IMAGE_FETCH_WORKERS", "8"))
+                )
+    return _image_cache
+
+
+@instrumented("image_cache.fetch_image_bytes")
+def fetch_image_bytes(url: str) -> bytes:
+    """Get full-resolution image bytes for a URL through the shared cache"""
+    return get_image_cache().fetch(url)
+
+
+@instrumented("image_cache.fetch_thumbnail")
+def fetch_thumbnail(url: str, size: Tuple[int, int] = DEFAULT_THUMBNAIL_SIZE) -> bytes:
+    """Get a preview thumbnail for a URL through the shared cache"""
+    return get_image_cache().thumbnail(url, size)
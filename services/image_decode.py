@@ -0,0 +1,180 @@
+"""
+J-Genix Studio - Upload Decode Cache
+Keeps decoded, canvas-ready uploads in memory so Streamlit reruns don't re-decode them
+"""
+
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from .image_cache import BoundedLRUCache
+
+DEFAULT_CANVAS_MAX_WIDTH = 800
+DEFAULT_PREVIEW_SIZE = (1024, 1024)
+_REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA", "RGBa", "CMYK", "YCbCr", "I", "F")
+
+
+@dataclass(frozen=True)
+class CanvasBackground:
+    """A decoded upload resized for the drawing canvas"""
+    image: Image.Image
+    width: int
+    height: int
+    source_width: int
+    source_height: int
+    source_format: Optional[str]
+    content_hash: str
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the decoded image"""
+        return self.width * self.height * len(self.image.getbands())
+
+
+def content_hash(data: bytes) -> str:
+    """Short BLAKE2b digest identifying an upload's contents"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def canvas_size(source_size: Tuple[int, int], max_width: int = DEFAULT_CANVAS_MAX_WIDTH) -> Tuple[int, int]:
+    """Canvas dimensions for an image, capped at max_width and keeping the aspect ratio"""
+    img_width, img_height = source_size
+    aspect_ratio = img_height / img_width
+    canvas_width = min(img_width, max_width)
+    return canvas_width, int(canvas_width * aspect_ratio)
+
+
+def open_scaled(data: bytes, size: Tuple[int, int]) -> Tuple[Image.Image, Tuple[int, int], Optional[str]]:
+    """
+    Open image bytes decoded as close to ``size`` as possible without going below it.
+
+    JPEGs use draft() so libjpeg scales by 1/2, 1/4 or 1/8 in the DCT domain
+    and never materialises the full-resolution bitmap. Anything still at
+    least twice the target is shrunk with reduce(), a cheap box filter,
+    before the caller's final resample.
+
+    Returns:
+        The partially scaled image, the source (width, height) and format
+    """
+    img = Image.open(io.BytesIO(data))
+    source_size = img.size
+    source_format = img.format
+
+    if source_format == "JPEG":
+        img.draft("RGB", size)
+
+    factor = min(img.width // max(1, size[0]), img.height // max(1, size[1]))
+    if factor >= 2:
+        if img.mode not in _REDUCIBLE_MODES:
+            # Palette, bilevel and 16-bit images can't be box-reduced directly
+            img = img.convert("RGBA" if img.mode == "P" or "transparency" in img.info else "RGB")
+        img = img.reduce(factor)
+
+    return img, source_size, source_format
+
+
+def fit_size(source_size: Tuple[int, int], max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Largest size within max_size that keeps the aspect ratio, never upscaling"""
+    width, height = source_size
+    scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def decode_preview(data: bytes, max_size: Tuple[int, int]) -> Image.Image:
+    """Decode image bytes straight to a preview that fits within max_size"""
+    with Image.open(io.BytesIO(data)) as probe:
+        target = fit_size(probe.size, max_size)  # header only, no pixel decode
+    img, _, _ = open_scaled(data, target)
+    return img.resize(target) if img.size != target else img
+
+
+def encode_preview(img: Image.Image) -> bytes:
+    """Encode a preview as PNG when it has transparency, JPEG otherwise"""
+    output = io.BytesIO()
+    if img.mode in ("RGBA", "LA", "P"):
+        img.save(output, format="PNG", optimize=True)
+    else:
+        img.convert("RGB").save(output, format="JPEG", quality=85)
+    return output.getvalue()
+
+
+def decode_canvas_background(data: bytes, max_width: int = DEFAULT_CANVAS_MAX_WIDTH,
+                             digest: Optional[str] = None) -> CanvasBackground:
+    """Decode an upload at canvas size and convert it to RGB"""
+    with Image.open(io.BytesIO(data)) as probe:
+        width, height = canvas_size(probe.size, max_width)  # header only, no pixel decode
+
+    img, (source_width, source_height), source_format = open_scaled(data, (width, height))
+    img = img.resize((width, height))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    return CanvasBackground(
+        image=img,
+        width=width,
+        height=height,
+        source_width=source_width,
+        source_height=source_height,
+        source_format=source_format,
+        content_hash=digest or content_hash(data)
+    )
+
+
+class DecodeCache:
+    """Canvas backgrounds and encoded previews keyed by upload content hash and size, LRU within a byte budget"""
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self._backgrounds = BoundedLRUCache(max_bytes, sizeof=lambda background: background.nbytes)
+        self._previews = BoundedLRUCache(max_bytes // 4)
+
+    def canvas_background(self, data: bytes, max_width: int = DEFAULT_CANVAS_MAX_WIDTH) -> CanvasBackground:
+        """Get the canvas background for an upload, decoding only on first sight"""
+        digest = content_hash(data)
+        key = (digest, max_width)
+        background = self._backgrounds.get(key)
+        if background is None:
+            background = decode_canvas_background(data, max_width, digest)
+            self._backgrounds.put(key, background)
+        return background
+
+    def preview(self, data: bytes, max_size: Tuple[int, int] = DEFAULT_PREVIEW_SIZE) -> bytes:
+        """Get encoded preview bytes for an upload, decoding only on first sight"""
+        key = (content_hash(data), max_size)
+        preview = self._previews.get(key)
+        if preview is None:
+            preview = encode_preview(decode_preview(data, max_size))
+            self._previews.put(key, preview)
+        return preview
+
+    def get_stats(self):
+        """Get cache size and hit/miss counts"""
+        return {"backgrounds": self._backgrounds.get_stats(), "previews": self._previews.get_stats()}
+
+
+_decode_cache: Optional[DecodeCache] = None
+_decode_cache_lock = threading.Lock()
+
+
+def get_decode_cache() -> DecodeCache:
+    """Get the process-wide decode cache (DECODE_CACHE_MB)"""
+    global _decode_cache
+    if _decode_cache is None:
+        with _decode_cache_lock:
+            if _decode_cache is None:
+                _decode_cache = DecodeCache(int(os.getenv("DECODE_CACHE_MB", "128")) * 1024 * 1024)
+    return _decode_cache
+
+
+def get_canvas_background(data: bytes, max_width: int = DEFAULT_CANVAS_MAX_WIDTH) -> CanvasBackground:
+    """Get a canvas-ready upload through the shared decode cache"""
+    return get_decode_cache().canvas_background(data, max_width)
+
+
+def get_upload_preview(data: bytes, max_size: Tuple[int, int] = DEFAULT_PREVIEW_SIZE) -> bytes:
+    """Get a display-sized preview of an upload through the shared decode cache"""
+    return get_decode_cache().preview(data, max_size)
@@ -1,7 +1,10 @@
 from typing import Dict, Any, Optional, List
-import requests
-import base64
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url, encode_image_payload
 
+@tier_limited("bria")
+@instrumented("bria.lifestyle_shot_by_text")
 def lifestyle_shot_by_text(
     api_key: str,
     image_data: bytes,
@@ -45,7 +48,8 @@ def lifestyle_shot_by_text(
         content_moderation: Whether to enable content moderation
         sku: Optional SKU identifier
     """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_text"
+    import requests
+    url = bria_url("/v1/product/lifestyle_shot_by_text")
     
     headers = {
         'api_token': api_key,
@@ -54,7 +58,7 @@ def lifestyle_shot_by_text(
     }
     
     # Convert image to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
+    image_base64 = encode_image_payload(image_data)
     
     # Prepare request data
     data = {
@@ -98,6 +102,7 @@ def lifestyle_shot_by_text(
         print(f"Data: {data}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
@@ -107,6 +112,8 @@ def lifestyle_shot_by_text(
     except Exception as e:
         raise Exception(f"Lifestyle shot generation failed: {str(e)}")
 
+@tier_limited("bria")
+@instrumented("bria.lifestyle_shot_by_image")
 def lifestyle_shot_by_image(
     api_key: str,
     image_data: bytes,
@@ -129,7 +136,8 @@ def lifestyle_shot_by_image(
     """
     Generate a lifestyle shot using a reference image.
     """
-    url = "https://engine.prod.bria-api.com/v1/product/lifestyle_shot_by_image"
+    import requests
+    url = bria_url("/v1/product/lifestyle_shot_by_image")
     
     headers = {
         'api_token': api_key,
@@ -138,8 +146,8 @@ def lifestyle_shot_by_image(
     }
     
     # Convert images to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    reference_base64 = base64.b64encode(reference_image).decode('utf-8')
+    image_base64 = encode_image_payload(image_data)
+    reference_base64 = encode_image_payload(reference_image)
     
     # Prepare request data
     data = {
@@ -180,6 +188,7 @@ def lifestyle_shot_by_image(
         print(f"Data: {data}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
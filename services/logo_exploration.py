@@ -0,0 +1,195 @@
+"""
+J-Genix Studio - Logo Exploration
+Fans one brand prompt out over seeds and style/color combinations as concurrent logo requests
+"""
+
+import random
+import time
+import uuid
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from business.concurrency_limiter import get_current_caller
+from business.pricing_strategy import PricingTier
+from workflows.job_scheduler import get_scheduler
+
+from .logo_generation import COLOR_SCHEME_OPTIONS, LOGO_STYLE_OPTIONS, generate_logo
+from .responses import extract_result_urls
+
+# Upper bounds so one exploration cannot flood the request queue
+MAX_EXPLORATION_VARIANTS = 64
+DEFAULT_EXPLORATION_CONCURRENCY = 4
+
+
+def plan_logo_exploration(
+    prompt: str,
+    num_seeds: int = 2,
+    styles: Optional[Sequence[str]] = None,
+    color_schemes: Optional[Sequence[str]] = None,
+    logo_type: str = "combination",
+    base_seed: Optional[int] = None,
+    steps_num: Optional[int] = None,
+    text_guidance_scale: Optional[float] = None,
+    aspect_ratio: str = "1:1",
+    model_version: str = "2.2"
+) -> Dict[str, Any]:
+    """
+    Build the manifest for an exploration without calling the API.
+
+    Every variant carries the exact generate_logo parameters it will be sent
+    with, so any result can be reproduced by passing them back in.
+
+    Args:
+        prompt: The base prompt for logo generation
+        num_seeds: Number of seeds to try for every style/color combination
+        styles: Logo style values to explore (default: every style)
+        color_schemes: Color scheme values to explore (default: every scheme)
+        logo_type: Type of logo for all variants
+        base_seed: Seed for drawing variant seeds and parameters (random if omitted)
+        steps_num: Fixed refinement steps; drawn per variant if omitted
+        text_guidance_scale: Fixed guidance; drawn per variant if omitted
+        aspect_ratio: Logo aspect ratio for all variants
+        model_version: Model version to use
+
+    Returns:
+        Dict with the exploration id, base seed and list of variants
+    """
+    if not prompt:
+        raise ValueError("Prompt is required for logo exploration")
+
+    styles = list(styles) if styles else [opt["value"] for opt in LOGO_STYLE_OPTIONS]
+    color_schemes = list(color_schemes) if color_schemes else [opt["value"] for opt in COLOR_SCHEME_OPTIONS]
+    num_seeds = max(1, num_seeds)
+
+    total = num_seeds * len(styles) * len(color_schemes)
+    if total > MAX_EXPLORATION_VARIANTS:
+        raise ValueError(
+            f"Exploration would send {total} requests; the limit is {MAX_EXPLORATION_VARIANTS}. "
+            "Reduce seeds, styles or color schemes."
+        )
+
+    if base_seed is None:
+        base_seed = random.randint(1, 1000000)
+    rng = random.Random(base_seed)
+
+    variants = []
+    for style in styles:
+        for color_scheme in color_schemes:
+            for _ in range(num_seeds):
+                variants.append({
+                    "variant_id": len(variants),
+                    "params": {
+                        "prompt": prompt,
+                        "logo_style": style,
+                        "logo_type": logo_type,
+                        "color_scheme": color_scheme,
+                        "model_version": model_version,
+                        "num_results": 1,
+                        "aspect_ratio": aspect_ratio,
+                        "seed": rng.randint(1, 1000000),
+                        "steps_num": steps_num or rng.randint(35, 45),
+                        "text_guidance_scale": text_guidance_scale or round(rng.uniform(7.5, 8.5), 2)
+                    }
+                })
+
+    return {
+        "exploration_id": uuid.uuid4().hex,
+        "created_at": time.time(),
+        "base_seed": base_seed,
+        "variants": variants
+    }
+
+
+def explore_logos(
+    manifest: Dict[str, Any],
+    api_key: str,
+    max_concurrency: int = DEFAULT_EXPLORATION_CONCURRENCY,
+    deadline: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run a planned exploration and yield each variant as soon as it finishes.
+
+    Variants are submitted to the shared job scheduler under the caller's
+    tier, so an exploration is fair-queued against everyone else's
+    generations instead of running beside them. At most ``max_concurrency``
+    of its variants, and never more than the tier's concurrent_requests,
+    are submitted at a time; more would only hold scheduler workers while
+    they wait for the user's limiter slot. Yielded variants are also
+    updated in place in ``manifest``.
+
+    Args:
+        manifest: Manifest from plan_logo_exploration
+        api_key: API key for authentication
+        max_concurrency: Maximum number of variants submitted at once (capped by the tier)
+        deadline: Seconds a variant may wait in the queue before it is dropped
+
+    Yields:
+        The finished variant with status, urls, error and elapsed_ms filled in
+    """
+    variants = manifest["variants"]
+    if not variants:
+        return
+
+    caller = get_current_caller()
+    user_id, tier_name = caller if caller else (None, "free")
+    max_concurrency = max(1, min(max_concurrency, tier_concurrency(tier_name)))
+    scheduler = get_scheduler()
+    queued = list(variants)
+    running: Dict[Any, Dict[str, Any]] = {}
+    try:
+        while queued or running:
+            while queued and len(running) < max_concurrency:
+                variant = queued.pop(0)
+                # The scheduler runs the job in a copy of this context, so the tier limiter sees the right user
+                handle = scheduler.submit(_run_variant, args=(variant, api_key), tier_name=tier_name,
+                                          user_id=user_id, deadline=deadline)
+                running[handle] = variant
+
+            finished = [handle for handle in running if handle.done()]
+            if not finished:
+                next(iter(running)).wait(0.05)
+                continue
+            for handle in finished:
+                variant = running.pop(handle)
+                try:
+                    handle.result()
+                except Exception as e:
+                    # Expired or cancelled before it ran; _run_variant records its own failures
+                    variant.update(urls=[], status="failed", error=str(e), elapsed_ms=0.0)
+                yield variant
+    finally:
+        # Consumer stopped early; drop variants that haven't started
+        for handle in running:
+            handle.cancel()
+
+
+def tier_concurrency(tier_name: str) -> int:
+    """Variants a tier can usefully run at once: its concurrent_requests limit"""
+    return PricingTier.get_tier_info(tier_name)["limits"]["concurrent_requests"]
+
+
+def summarize_exploration(manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Count succeeded, failed and pending variants in a manifest"""
+    summary = {"total": len(manifest["variants"]), "succeeded": 0, "failed": 0, "pending": 0}
+    for variant in manifest["variants"]:
+        status = variant.get("status", "pending")
+        summary[status] = summary.get(status, 0) + 1
+    return summary
+
+
+def _run_variant(variant: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+    """Send one variant's request and record the outcome on the variant"""
+    start = time.perf_counter()
+    try:
+        # Explicit seed/steps/guidance with ensure_variety keeps the request reproducible
+        result = generate_logo(api_key=api_key, sync=True, ensure_variety=True, **variant["params"])
+        variant["urls"] = extract_result_urls(result)
+        variant["status"] = "succeeded" if variant["urls"] else "failed"
+        variant["error"] = None if variant["urls"] else "No logo URL in response"
+    except Exception as e:
+        print(f"Logo exploration variant {variant['variant_id']} failed: {str(e)}")
+        variant["urls"] = []
+        variant["status"] = "failed"
+        variant["error"] = str(e)
+    variant["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return variant
+
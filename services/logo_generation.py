@@ -1,9 +1,15 @@
-from typing import Dict, Any, Optional, List
-import requests
+from typing import Dict, Any, Optional, List, Mapping, Tuple
+from functools import lru_cache
+from types import MappingProxyType
 import json
 import random
 import re
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url
 
+@tier_limited("bria")
+@instrumented("bria.generate_logo")
 def generate_logo(
     prompt: str,
     api_key: str,
@@ -46,6 +52,7 @@ def generate_logo(
     Returns:
         Dict containing the API response with generated logo URLs
     """
+    import requests
     
     if not prompt:
         raise ValueError("Prompt is required for logo generation")
@@ -62,7 +69,7 @@ def generate_logo(
         seed = random.randint(1, 1000000)
     
     # Logo-optimized parameters
-    logo_steps = steps_num or random.randint(35, 45) if ensure_variety else 40
+    logo_steps = steps_num or (random.randint(35, 45) if ensure_variety else 40)
     logo_guidance = text_guidance_scale or (random.uniform(7.5, 8.5) if ensure_variety else 8.0)
     
     # Build request data with logo-specific optimizations
@@ -84,7 +91,7 @@ def generate_logo(
     if seed is not None:
         data["seed"] = seed
     
-    url = f"https://engine.prod.bria-api.com/v1/text-to-image/hd/{model_version}"
+    url = bria_url(f"/v1/text-to-image/hd/{model_version}")
     headers = {
         'api_token': api_key,
         'Accept': 'application/json',
@@ -97,6 +104,7 @@ def generate_logo(
         print(f"Logo parameters - Style: {logo_style}, Type: {logo_type}, Colors: {color_scheme}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
@@ -117,42 +125,54 @@ def generate_logo(
     except Exception as e:
         raise Exception(f"Logo generation failed: {str(e)}")
 
-def _extract_company_name(prompt: str) -> str:
-    """Extract the company name from the user prompt with advanced parsing"""
+# Company name patterns, in priority order. Each alternative sits inside a
+# lookahead so one scan reports the first match position of every pattern,
+# exactly as three separate re.search calls would.
+_COMPANY_NAME_SCAN = re.compile(
+    r'(?='
+    r'(?:["\'](?P<quoted_name>[^"\']+)["\'])'
+    r'|(?:(?:company|brand|business)\s+(?:name|called)\s+(?:is\s+)?(?P<explicit_name_pattern>[A-Za-z0-9\s&]+?)(?:\s|,|$))'
+    r'|(?:for\s+(?P<for_company_pattern>[A-Za-z0-9\s&]+?)\s+(?:company|brand|business|corp|inc|llc))'
+    r')',
+    re.IGNORECASE
+)
+_COMPANY_NAME_METHODS = ("quoted_name", "explicit_name_pattern", "for_company_pattern")
+_COMPANY_SUFFIX = re.compile(r'\s+(inc|llc|corp|ltd|co)\.?$', re.IGNORECASE)
+_NON_NAME_WORDS = frozenset(['logo', 'design', 'for', 'company', 'brand', 'business', 'create', 'make', 'generate', 'a', 'an', 'the'])
+
+@lru_cache(maxsize=1024)
+def _parse_company_name(prompt: str) -> Tuple[str, str]:
+    """Extract the company name and the method that found it, in one regex pass"""
 
     if not prompt or not prompt.strip():
-        return "Company"
+        return "Company", "empty_prompt"
 
     # Clean the prompt
     cleaned_prompt = prompt.strip()
+    words = cleaned_prompt.split()
 
     # Special case: If it's a single word that looks like a company name, use it directly
-    words = cleaned_prompt.split()
     if len(words) == 1 and len(words[0]) > 1 and words[0].isalpha():
-        return words[0]
-
-    # Pattern 1: Look for quoted company names
-    quoted_match = re.search(r'["\']([^"\']+)["\']', cleaned_prompt)
-    if quoted_match:
-        return quoted_match.group(1).strip()
-
-    # Pattern 2: Look for "company name is X" or "brand name is X"
-    name_pattern = re.search(r'(?:company|brand|business)\s+(?:name|called)\s+(?:is\s+)?([A-Za-z0-9\s&]+?)(?:\s|,|$)', cleaned_prompt, re.IGNORECASE)
-    if name_pattern:
-        return name_pattern.group(1).strip()
-
-    # Pattern 3: Look for "for X company" or "for X brand"
-    for_pattern = re.search(r'for\s+([A-Za-z0-9\s&]+?)\s+(?:company|brand|business|corp|inc|llc)', cleaned_prompt, re.IGNORECASE)
-    if for_pattern:
-        return for_pattern.group(1).strip()
+        return words[0], "capitalized_words"
+
+    # Patterns 1-3: quoted name, "company name is X", "for X company"
+    first_matches = {}
+    for match in _COMPANY_NAME_SCAN.finditer(cleaned_prompt):
+        method = match.lastgroup
+        if method not in first_matches:
+            first_matches[method] = match.group(method)
+            if method == "quoted_name":
+                break  # Highest priority; nothing later can win
+    for method in _COMPANY_NAME_METHODS:
+        if method in first_matches:
+            return first_matches[method].strip(), method
 
     # Pattern 4: Extract first 1-3 words that could be company names
-    words = cleaned_prompt.split()
     company_words = []
 
     for word in words[:5]:  # Check first 5 words
         # Skip common descriptive words
-        if word.lower() in ['logo', 'design', 'for', 'company', 'brand', 'business', 'create', 'make', 'generate', 'a', 'an', 'the']:
+        if word.lower() in _NON_NAME_WORDS:
             continue
 
         # Accept any word that could be a company name (including lowercase)
@@ -164,75 +184,94 @@ def _extract_company_name(prompt: str) -> str:
     if company_words:
         company_name = ' '.join(company_words[:3])  # Max 3 words
         # Clean up common suffixes
-        company_name = re.sub(r'\s+(inc|llc|corp|ltd|co)\.?$', '', company_name, flags=re.IGNORECASE)
-        return company_name.strip()
+        company_name = _COMPANY_SUFFIX.sub('', company_name)
+        return company_name.strip(), "capitalized_words"
 
     # Pattern 5: Fallback - take first word if it's reasonable length
     first_word = words[0] if words else "Company"
     if len(first_word) > 1 and first_word.isalpha():
-        return first_word
+        return first_word, "capitalized_words"
 
-    return "Company"
+    return "Company", "capitalized_words"
+
+def _extract_company_name(prompt: str) -> str:
+    """Extract the company name from the user prompt with advanced parsing"""
+    return _parse_company_name(prompt)[0]
 
 def validate_company_name_extraction(prompt: str) -> Dict[str, str]:
     """Validate and debug company name extraction"""
-    extracted_name = _extract_company_name(prompt)
+    extracted_name, extraction_method = _parse_company_name(prompt)
 
     return {
         "original_prompt": prompt,
         "extracted_company_name": extracted_name,
-        "extraction_method": _get_extraction_method(prompt),
+        "extraction_method": extraction_method,
         "is_valid": len(extracted_name) > 0 and extracted_name != "Company"
     }
 
 def _get_extraction_method(prompt: str) -> str:
     """Determine which method was used to extract the company name"""
-    if not prompt or not prompt.strip():
-        return "empty_prompt"
-
-    cleaned_prompt = prompt.strip()
-
-    if re.search(r'["\']([^"\']+)["\']', cleaned_prompt):
-        return "quoted_name"
-    elif re.search(r'(?:company|brand|business)\s+(?:name|called)\s+(?:is\s+)?([A-Za-z0-9\s&]+?)(?:\s|,|$)', cleaned_prompt, re.IGNORECASE):
-        return "explicit_name_pattern"
-    elif re.search(r'for\s+([A-Za-z0-9\s&]+?)\s+(?:company|brand|business|corp|inc|llc)', cleaned_prompt, re.IGNORECASE):
-        return "for_company_pattern"
-    else:
-        return "capitalized_words"
-
+    return _parse_company_name(prompt)[1]
+
+# Style modifiers
+LOGO_STYLE_MODIFIERS = MappingProxyType({
+    "modern": "modern, clean, contemporary, sleek",
+    "minimalist": "minimalist, simple, clean lines, geometric",
+    "vintage": "vintage, retro, classic, timeless",
+    "corporate": "corporate, professional, business, formal",
+    "creative": "creative, artistic, unique, innovative",
+    "tech": "tech, digital, futuristic, high-tech",
+    "elegant": "elegant, sophisticated, refined, luxury",
+    "playful": "playful, fun, friendly, approachable"
+})
+
+# Logo type modifiers
+LOGO_TYPE_MODIFIERS = MappingProxyType({
+    "text_based": "typography-focused, wordmark, text logo, lettering",
+    "icon_based": "icon, symbol, pictorial mark, graphic symbol",
+    "combination": "logo with text and icon, combination mark, text and symbol"
+})
+
+# Color scheme modifiers
+LOGO_COLOR_MODIFIERS = MappingProxyType({
+    "professional": "professional color palette, business colors",
+    "vibrant": "vibrant colors, bold color scheme, energetic colors",
+    "monochrome": "monochrome, black and white, single color",
+    "earth_tones": "earth tones, natural colors, organic palette",
+    "tech_colors": "tech colors, blue and gray, digital palette",
+    "luxury": "luxury colors, gold and black, premium palette"
+})
+
+LOGO_NEGATIVE_TERMS = (
+    # Quality issues
+    "blurry", "pixelated", "low quality", "distorted", "fuzzy",
+    "cluttered", "busy", "complex background", "photographic",
+    "realistic photo", "3D render", "overly detailed",
+    "multiple logos", "watermark", "copyright",
+
+    # Text and typography issues
+    "misspelled text", "incorrect spelling", "garbled text",
+    "unreadable text", "distorted letters", "broken typography",
+    "wrong spelling", "scrambled letters", "illegible text",
+    "corrupted text", "malformed letters", "text artifacts",
+    "gibberish text", "nonsense words", "random characters",
+    "backwards text", "upside down text", "rotated letters",
+    "overlapping text", "cut off text", "partial letters",
+    "blurred text", "faded text", "unclear lettering",
+    "wrong font", "inconsistent typography", "mixed fonts",
+
+    # Layout issues
+    "text overlay", "frame", "border", "multiple text elements",
+    "scattered text", "floating letters", "disconnected text",
+    "text outside logo", "misaligned text", "cropped text"
+)
+
+_LOGO_NEGATIVE_PROMPT = ", ".join(LOGO_NEGATIVE_TERMS)
+
+@lru_cache(maxsize=256)
 def _build_logo_prompt(base_prompt: str, style: str, logo_type: str, color_scheme: str) -> str:
     """Build an enhanced prompt specifically optimized for logo generation with accurate text rendering"""
 
-    # Style modifiers
-    style_modifiers = {
-        "modern": "modern, clean, contemporary, sleek",
-        "minimalist": "minimalist, simple, clean lines, geometric",
-        "vintage": "vintage, retro, classic, timeless",
-        "corporate": "corporate, professional, business, formal",
-        "creative": "creative, artistic, unique, innovative",
-        "tech": "tech, digital, futuristic, high-tech",
-        "elegant": "elegant, sophisticated, refined, luxury",
-        "playful": "playful, fun, friendly, approachable"
-    }
-    
-    # Logo type modifiers
-    type_modifiers = {
-        "text_based": "typography-focused, wordmark, text logo, lettering",
-        "icon_based": "icon, symbol, pictorial mark, graphic symbol",
-        "combination": "logo with text and icon, combination mark, text and symbol"
-    }
-    
-    # Color scheme modifiers
-    color_modifiers = {
-        "professional": "professional color palette, business colors",
-        "vibrant": "vibrant colors, bold color scheme, energetic colors",
-        "monochrome": "monochrome, black and white, single color",
-        "earth_tones": "earth tones, natural colors, organic palette",
-        "tech_colors": "tech colors, blue and gray, digital palette",
-        "luxury": "luxury colors, gold and black, premium palette"
-    }
-    
     # Extract company name with advanced parsing
     company_name = _extract_company_name(base_prompt)
 
@@ -242,9 +281,9 @@ def _build_logo_prompt(base_prompt: str, style: str, logo_type: str, color_schem
         f"exact text '{company_name}' spelled correctly",
         f"company name '{company_name}' in clear readable typography",
         f"text '{company_name}' must be spelled exactly as written",
-        style_modifiers.get(style, "modern, clean"),
-        type_modifiers.get(logo_type, "combination mark"),
-        color_modifiers.get(color_scheme, "professional color palette"),
+        LOGO_STYLE_MODIFIERS.get(style, "modern, clean"),
+        LOGO_TYPE_MODIFIERS.get(logo_type, "combination mark"),
+        LOGO_COLOR_MODIFIERS.get(color_scheme, "professional color palette"),
         "vector style logo design, scalable graphics",
         "professional typography, clear letterforms",
         "accurate text rendering, perfect spelling",
@@ -257,67 +296,60 @@ def _build_logo_prompt(base_prompt: str, style: str, logo_type: str, color_schem
 
 def _build_logo_negative_prompt(base_negative: str) -> str:
     """Build negative prompt to avoid common logo generation issues"""
-    
-    logo_negative_terms = [
-        # Quality issues
-        "blurry", "pixelated", "low quality", "distorted", "fuzzy",
-        "cluttered", "busy", "complex background", "photographic",
-        "realistic photo", "3D render", "overly detailed",
-        "multiple logos", "watermark", "copyright",
-
-        # Text and typography issues
-        "misspelled text", "incorrect spelling", "garbled text",
-        "unreadable text", "distorted letters", "broken typography",
-        "wrong spelling", "scrambled letters", "illegible text",
-        "corrupted text", "malformed letters", "text artifacts",
-        "gibberish text", "nonsense words", "random characters",
-        "backwards text", "upside down text", "rotated letters",
-        "overlapping text", "cut off text", "partial letters",
-        "blurred text", "faded text", "unclear lettering",
-        "wrong font", "inconsistent typography", "mixed fonts",
-
-        # Layout issues
-        "text overlay", "frame", "border", "multiple text elements",
-        "scattered text", "floating letters", "disconnected text",
-        "text outside logo", "misaligned text", "cropped text"
-    ]
-    
     if base_negative:
-        return f"{base_negative}, {', '.join(logo_negative_terms)}"
+        return f"{base_negative}, {_LOGO_NEGATIVE_PROMPT}"
     else:
-        return ", ".join(logo_negative_terms)
-
-def get_logo_style_options() -> List[Dict[str, str]]:
+        return _LOGO_NEGATIVE_PROMPT
+
+def _freeze_options(options: List[Dict[str, str]]) -> Tuple[Mapping[str, str], ...]:
+    """Make an option catalog immutable so it can be shared across reruns"""
+    return tuple(MappingProxyType(option) for option in options)
+
+def _index_options(options: Tuple[Mapping[str, str], ...]) -> Mapping[str, Mapping[str, str]]:
+    """Build an O(1) value -> option lookup for a catalog"""
+    return MappingProxyType({option["value"]: option for option in options})
+
+LOGO_STYLE_OPTIONS = _freeze_options([
+    {"value": "modern", "label": "Modern", "description": "Clean, contemporary design"},
+    {"value": "minimalist", "label": "Minimalist", "description": "Simple, geometric shapes"},
+    {"value": "vintage", "label": "Vintage", "description": "Retro, classic styling"},
+    {"value": "corporate", "label": "Corporate", "description": "Professional, business-focused"},
+    {"value": "creative", "label": "Creative", "description": "Artistic, unique approach"},
+    {"value": "tech", "label": "Tech", "description": "Digital, futuristic feel"},
+    {"value": "elegant", "label": "Elegant", "description": "Sophisticated, luxury appeal"},
+    {"value": "playful", "label": "Playful", "description": "Fun, friendly, approachable"}
+])
+
+LOGO_TYPE_OPTIONS = _freeze_options([
+    {"value": "combination", "label": "Combination", "description": "Text + Icon (most versatile)"},
+    {"value": "text_based", "label": "Text-Based", "description": "Typography-focused wordmark"},
+    {"value": "icon_based", "label": "Icon-Based", "description": "Symbol or pictorial mark"}
+])
+
+COLOR_SCHEME_OPTIONS = _freeze_options([
+    {"value": "professional", "label": "Professional", "description": "Business-appropriate colors"},
+    {"value": "vibrant", "label": "Vibrant", "description": "Bold, energetic colors"},
+    {"value": "monochrome", "label": "Monochrome", "description": "Black, white, and grays"},
+    {"value": "earth_tones", "label": "Earth Tones", "description": "Natural, organic colors"},
+    {"value": "tech_colors", "label": "Tech Colors", "description": "Blue, gray, digital palette"},
+    {"value": "luxury", "label": "Luxury", "description": "Premium gold, black, silver"}
+])
+
+LOGO_STYLE_INDEX = _index_options(LOGO_STYLE_OPTIONS)
+LOGO_TYPE_INDEX = _index_options(LOGO_TYPE_OPTIONS)
+COLOR_SCHEME_INDEX = _index_options(COLOR_SCHEME_OPTIONS)
+
+def get_logo_style_options() -> Tuple[Mapping[str, str], ...]:
     """Get available logo style options with descriptions"""
-    return [
-        {"value": "modern", "label": "Modern", "description": "Clean, contemporary design"},
-        {"value": "minimalist", "label": "Minimalist", "description": "Simple, geometric shapes"},
-        {"value": "vintage", "label": "Vintage", "description": "Retro, classic styling"},
-        {"value": "corporate", "label": "Corporate", "description": "Professional, business-focused"},
-        {"value": "creative", "label": "Creative", "description": "Artistic, unique approach"},
-        {"value": "tech", "label": "Tech", "description": "Digital, futuristic feel"},
-        {"value": "elegant", "label": "Elegant", "description": "Sophisticated, luxury appeal"},
-        {"value": "playful", "label": "Playful", "description": "Fun, friendly, approachable"}
-    ]
+    return LOGO_STYLE_OPTIONS
 
-def get_logo_type_options() -> List[Dict[str, str]]:
+def get_logo_type_options() -> Tuple[Mapping[str, str], ...]:
     """Get available logo type options with descriptions"""
-    return [
-        {"value": "combination", "label": "Combination", "description": "Text + Icon (most versatile)"},
-        {"value": "text_based", "label": "Text-Based", "description": "Typography-focused wordmark"},
-        {"value": "icon_based", "label": "Icon-Based", "description": "Symbol or pictorial mark"}
-    ]
+    return LOGO_TYPE_OPTIONS
 
-def get_color_scheme_options() -> List[Dict[str, str]]:
+def get_color_scheme_options() -> Tuple[Mapping[str, str], ...]:
     """Get available color scheme options with descriptions"""
-    return [
-        {"value": "professional", "label": "Professional", "description": "Business-appropriate colors"},
-        {"value": "vibrant", "label": "Vibrant", "description": "Bold, energetic colors"},
-        {"value": "monochrome", "label": "Monochrome", "description": "Black, white, and grays"},
-        {"value": "earth_tones", "label": "Earth Tones", "description": "Natural, organic colors"},
-        {"value": "tech_colors", "label": "Tech Colors", "description": "Blue, gray, digital palette"},
-        {"value": "luxury", "label": "Luxury", "description": "Premium gold, black, silver"}
-    ]
+    return COLOR_SCHEME_OPTIONS
 
 def validate_logo_prompt(prompt: str, is_enhanced: bool = False) -> tuple[bool, str]:
     """Validate logo generation prompt and provide suggestions"""
@@ -0,0 +1,62 @@
+"""
+J-Genix Studio - Mask Pipeline
+Turns drawable-canvas strokes into compact 1-bit masks at the source image's resolution
+"""
+
+import io
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+def canvas_alpha_mask(image_data: np.ndarray, threshold: float = 0) -> np.ndarray:
+    """
+    Threshold the canvas alpha channel into a boolean mask.
+
+    The alpha channel is taken as a view, so the only allocation is the
+    one-byte-per-pixel result, whatever dtype the canvas returns.
+
+    Args:
+        image_data: RGBA array from st_canvas (height x width x 4)
+        threshold: Alpha values above this count as painted
+    """
+    if image_data.ndim != 3 or image_data.shape[2] != 4:
+        raise ValueError(f"Expected an RGBA canvas array, got shape {image_data.shape}")
+    return np.greater(image_data[:, :, 3], threshold)
+
+
+def mask_has_strokes(image_data: Optional[np.ndarray], threshold: float = 0) -> bool:
+    """Whether anything has been painted on the canvas"""
+    return image_data is not None and bool(canvas_alpha_mask(image_data, threshold).any())
+
+
+def build_mask_image(image_data: np.ndarray, source_size: Optional[Tuple[int, int]] = None,
+                     threshold: float = 0) -> Image.Image:
+    """
+    Build a mode '1' mask, scaled to the source image with nearest-neighbor.
+
+    Args:
+        image_data: RGBA array from st_canvas
+        source_size: (width, height) of the image the mask applies to; canvas size if omitted
+        threshold: Alpha values above this count as painted
+    """
+    mask = Image.fromarray(canvas_alpha_mask(image_data, threshold))  # bool array -> mode '1'
+    if source_size and mask.size != tuple(source_size):
+        # Nearest-neighbor keeps the mask strictly binary
+        mask = mask.resize(tuple(source_size), Image.NEAREST)
+    return mask
+
+
+def encode_mask_png(mask: Image.Image) -> bytes:
+    """Encode a mask as a 1-bit PNG"""
+    # Default zlib level: optimize=True is ~5x slower for ~20% fewer bytes on 1-bit data
+    output = io.BytesIO()
+    mask.convert("1").save(output, format="PNG")
+    return output.getvalue()
+
+
+def canvas_to_mask_png(image_data: np.ndarray, source_size: Optional[Tuple[int, int]] = None,
+                       threshold: float = 0) -> bytes:
+    """Canvas strokes to PNG mask bytes at the source image's resolution"""
+    return encode_mask_png(build_mask_image(image_data, source_size, threshold))
@@ -1,7 +1,10 @@
 from typing import Dict, Any
-import requests
-import base64
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url, encode_image_payload
 
+@tier_limited("bria")
+@instrumented("bria.create_packshot")
 def create_packshot(
     api_key: str,
     image_data: bytes,
@@ -24,7 +27,8 @@ def create_packshot(
     Returns:
         Dict containing the API response
     """
-    url = "https://engine.prod.bria-api.com/v1/product/packshot"
+    import requests
+    url = bria_url("/v1/product/packshot")
     
     headers = {
         'api_token': api_key,
@@ -33,7 +37,7 @@ def create_packshot(
     }
     
     # Convert image data to base64
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
+    image_base64 = encode_image_payload(image_data)
     
     # Prepare request data
     data = {
@@ -53,6 +57,7 @@ def create_packshot(
         print(f"Data keys: {list(data.keys())}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
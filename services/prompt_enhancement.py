@@ -1,7 +1,11 @@
 from typing import Dict, Any, Optional
-import requests
 import json
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url
 
+@tier_limited("bria")
+@instrumented("bria.enhance_prompt")
 def enhance_prompt(
     api_key: str,
     prompt: str,
@@ -18,7 +22,8 @@ def enhance_prompt(
     Returns:
         Enhanced prompt string
     """
-    url = "https://engine.prod.bria-api.com/v1/prompt_enhancer"
+    import requests
+    url = bria_url("/v1/prompt_enhancer")
     
     headers = {
         'api_token': api_key,
@@ -36,6 +41,7 @@ def enhance_prompt(
         print(f"Headers: {headers}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
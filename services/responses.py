@@ -0,0 +1,30 @@
+"""
+J-Genix Studio - API Responses
+Helpers for reading the response bodies Bria returns
+"""
+
+from typing import Any, List
+
+
+def extract_result_urls(response: Any) -> List[str]:
+    """Collect result URLs from the response shapes Bria returns"""
+    urls: List[str] = []
+    if not isinstance(response, dict):
+        return urls
+
+    if response.get("urls"):
+        urls.extend(response["urls"])
+    elif response.get("result_urls"):
+        urls.extend(response["result_urls"])
+    elif response.get("result_url"):
+        urls.append(response["result_url"])
+    elif isinstance(response.get("result"), list):
+        for item in response["result"]:
+            if isinstance(item, dict) and "urls" in item:
+                urls.extend(item["urls"])
+            elif isinstance(item, list):
+                urls.extend(item)
+            elif isinstance(item, str):
+                urls.append(item)
+
+    return [url for url in urls if isinstance(url, str)]
@@ -1,7 +1,10 @@
 from typing import Dict, Any, List, Optional
-import requests
-import base64
+from analytics.instrumentation import instrumented, note_http
+from business.concurrency_limiter import tier_limited
+from .endpoints import bria_url, encode_image_payload
 
+@tier_limited("bria")
+@instrumented("bria.add_shadow")
 def add_shadow(
     api_key: str,
     image_data: bytes = None,
@@ -40,7 +43,8 @@ def add_shadow(
     Returns:
         Dict containing the API response
     """
-    url = "https://engine.prod.bria-api.com/v1/product/shadow"
+    import requests
+    url = bria_url("/v1/product/shadow")
     
     headers = {
         'api_token': api_key,
@@ -62,7 +66,7 @@ def add_shadow(
     if image_url:
         data['image_url'] = image_url
     elif image_data:
-        data['file'] = base64.b64encode(image_data).decode('utf-8')
+        data['file'] = encode_image_payload(image_data)
     else:
         raise ValueError("Either image_data or image_url must be provided")
     
@@ -84,6 +88,7 @@ def add_shadow(
         print(f"Data: {data}")
         
         response = requests.post(url, headers=headers, json=data)
+        note_http(response)
         response.raise_for_status()
         
         print(f"Response status: {response.status_code}")
@@ -0,0 +1,164 @@
+"""
+J-Genix Studio - State Store
+Session/storage backends so services run the same under Streamlit, in worker processes and in CLI batch jobs
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+_MISSING = object()
+
+
+class StateStore:
+    """Interface for key/value state backends used by the services"""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a value"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any):
+        """Store a value"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Remove a value if present"""
+        raise NotImplementedError
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class StreamlitStateStore(StateStore):
+    """Adapter over st.session_state, for use inside a running Streamlit app"""
+
+    def __init__(self):
+        import streamlit as st
+        self._session_state = st.session_state
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._session_state.get(key, default)
+
+    def set(self, key: str, value: Any):
+        self._session_state[key] = value
+
+    def delete(self, key: str):
+        if key in self._session_state:
+            del self._session_state[key]
+
+
+class InMemoryStateStore(StateStore):
+    """Process-local store, for worker pools, tests and one-off scripts"""
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = dict(initial or {})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._values[key] = value
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+
+class FileStateStore(StateStore):
+    """JSON file store, so CLI batch runs can share brand kits between invocations
+
+    Values must be JSON-serialisable. Every write replaces the file
+    atomically, so a crashed job never leaves a truncated store behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._values: Optional[Dict[str, Any]] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._load().get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            values = self._load()
+            values[key] = value
+            self._write(values)
+
+    def delete(self, key: str):
+        with self._lock:
+            values = self._load()
+            if values.pop(key, _MISSING) is not _MISSING:
+                self._write(values)
+
+    def _load(self) -> Dict[str, Any]:
+        if self._values is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._values = json.load(f)
+            except FileNotFoundError:
+                self._values = {}
+        return self._values
+
+    def _write(self, values: Dict[str, Any]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".state-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(values, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+def _streamlit_running() -> bool:
+    """Whether we're inside a Streamlit script run (never imports Streamlit itself)"""
+    if "streamlit" not in sys.modules:
+        return False
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    return get_script_run_ctx(suppress_warning=True) is not None
+
+
+# A store installed with set_state_store wins everywhere. The fallback is only
+# ever used outside a script run, so creating it lazily (from a worker thread,
+# a batch job or at import) can't stand in for any user's session state.
+_installed_store: Optional[StateStore] = None
+_fallback_store: Optional[StateStore] = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """Get the state store for the current context
+
+    A store installed with set_state_store is always used. Otherwise, inside
+    a Streamlit run this is the user's session state, and elsewhere a
+    process-wide store: a JSON file when STATE_STORE_PATH is set, memory otherwise.
+    """
+    global _fallback_store
+    if _installed_store is not None:
+        return _installed_store
+    if _streamlit_running():
+        return StreamlitStateStore()
+
+    if _fallback_store is None:
+        with _state_store_lock:
+            if _fallback_store is None:
+                path = os.getenv("STATE_STORE_PATH")
+                _fallback_store = FileStateStore(path) if path else InMemoryStateStore()
+    return _fallback_store
+
+
+def set_state_store(store: Optional[StateStore]):
+    """Install a store for every context, or None to go back to auto-detection"""
+    global _installed_store
+    with _state_store_lock:
+        _installed_store = store
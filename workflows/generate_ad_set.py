@@ -3,9 +3,13 @@ from services import (
     lifestyle_shot_by_text,
     add_shadow,
     create_packshot,
-    generate_hd_image
+    generate_hd_image,
+    fetch_image_bytes,
+    extract_result_urls
 )
+from analytics.instrumentation import instrumented
 
+@instrumented("workflow.generate_ad_set")
 def generate_ad_set(
     api_key: str,
     image: Optional[bytes] = None,
@@ -30,7 +34,14 @@ def generate_ad_set(
             sync=config.get("sync", True)
         )
         result["hd_image"] = hd_response
-        image = hd_response.get("result_url")
+        # The product steps need image bytes, not the result URL. Async results
+        # aren't downloadable yet, so those steps are skipped for them.
+        result_urls = extract_result_urls(hd_response)
+        if result_urls and config.get("sync", True):
+            try:
+                image = fetch_image_bytes(result_urls[0])
+            except Exception as e:
+                print(f"Could not download generated image, skipping product steps: {str(e)}")
     
     # Create packshot if requested
     if config.get("create_packshot", False) and image:
@@ -0,0 +1,384 @@
+"""
+J-Genix Studio - Generation Job Scheduler
+Weighted fair queuing of generation requests by pricing tier onto a bounded worker pool
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from business.pricing_strategy import PricingTier
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+EXPIRED = "expired"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED, EXPIRED)
+
+# Share of dispatch capacity per tier, proportional to its concurrency allowance
+TIER_WEIGHTS = {
+    tier_name: float(tier["limits"]["concurrent_requests"])
+    for tier_name, tier in PricingTier.TIERS.items()
+}
+
+# Jobs one user may run at once; more would only block in that user's limiter slot
+USER_RUNNING_LIMITS = {
+    tier_name: tier["limits"]["concurrent_requests"]
+    for tier_name, tier in PricingTier.TIERS.items()
+}
+
+
+class JobCancelledError(Exception):
+    """Raised by JobHandle.result() for a cancelled job"""
+
+
+class JobExpiredError(Exception):
+    """Raised by JobHandle.result() for a job whose deadline passed before it started"""
+
+
+class JobHandle:
+    """Handle returned by JobScheduler.submit for polling a job"""
+
+    def __init__(self, scheduler: "JobScheduler", job_id: str, tier_name: str, user_id: Optional[str]):
+        self.job_id = job_id
+        self.tier_name = tier_name
+        self.user_id = user_id
+        self._scheduler = scheduler
+        self._done = threading.Event()
+        self._status = QUEUED
+        self._result = None
+        self._error: Optional[BaseException] = None
+        self.cancel_requested = False
+
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        return self._status
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self) -> bool:
+        """Cancel the job if it has not started
+
+        A running job can't be interrupted, so it is flagged instead: it
+        runs to completion and then finishes as cancelled, dropping its result.
+        """
+        return self._scheduler._cancel(self)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait up to ``timeout`` seconds for the job to finish; returns whether it has"""
+        return self._done.wait(timeout)
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Wait for the job and return its result, re-raising any failure"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Job {self.job_id} still {self._status}")
+        if self._status == CANCELLED:
+            raise JobCancelledError(f"Job {self.job_id} was cancelled")
+        if self._status == EXPIRED:
+            raise JobExpiredError(f"Job {self.job_id} missed its deadline while queued")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a JSON-friendly view of the job for status displays"""
+        now = time.time()
+        return {
+            "job_id": self.job_id,
+            "status": self._status,
+            "tier": self.tier_name,
+            "queue_position": self._scheduler.queue_position(self) if self._status == QUEUED else None,
+            "queued_seconds": (self.started_at or self.finished_at or now) - self.submitted_at,
+            "run_seconds": ((self.finished_at or now) - self.started_at) if self.started_at else None,
+            "error": str(self._error) if self._error else None
+        }
+
+    def _finish(self, status: str, result: Any = None, error: Optional[BaseException] = None):
+        self._status = status
+        self._result = result
+        self._error = error
+        self.finished_at = time.time()
+        self._done.set()
+
+
+class _Job:
+    __slots__ = ("handle", "func", "args", "kwargs", "context", "priority", "cost", "deadline", "seq")
+
+    def __init__(self, handle, func, args, kwargs, context, priority, cost, deadline, seq):
+        self.handle = handle
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context
+        self.priority = priority
+        self.cost = cost
+        self.deadline = deadline
+        self.seq = seq
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class JobScheduler:
+    """Priority queue with weighted fair queuing across tiers
+
+    Each tier is a flow with weight ``TIER_WEIGHTS[tier]``. Dispatch uses
+    start-time fair queuing: the next job comes from the tier with the
+    smallest virtual finish tag, so under contention paying tiers get a
+    proportionally larger share of workers while lower tiers still make
+    progress. Within a tier, lower ``priority`` values run first.
+
+    A user already running as many jobs as their tier's concurrent_requests
+    is skipped until one finishes: their next job would only wait on a
+    worker for that user's limiter slot while other users queue behind it.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 1000, job_ttl: float = 3600.0):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max_queue_size
+        self.job_ttl = job_ttl
+
+        self._lock = threading.Condition()
+        self._flows: Dict[str, List[_Job]] = {}
+        self._finish_tags: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._queued = 0
+        self._running = 0
+        self._seq = itertools.count()
+        self._jobs: Dict[str, JobHandle] = {}
+        self._running_by_user: Dict[str, int] = {}
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+        # Metrics
+        self._completed_by_status: Dict[str, int] = {}
+        self._queue_wait_total = 0.0
+        self._started_total = 0
+
+    def submit(self, func: Callable, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+               tier_name: str = "free", user_id: Optional[str] = None, priority: int = 0,
+               deadline: Optional[float] = None, cost: float = 1.0) -> JobHandle:
+        """Queue ``func(*args, **kwargs)`` and return a handle to poll
+
+        Args:
+            func: Callable to run on a worker thread
+            args: Positional arguments for func
+            kwargs: Keyword arguments for func
+            tier_name: Pricing tier of the requester, used for fair queuing
+            user_id: Optional requester id, for display and lookup
+            priority: Lower runs earlier within the tier
+            deadline: Seconds from now after which the job is dropped if not yet started
+            cost: Relative cost of the job against the tier's share
+        """
+        tier_name = tier_name if tier_name in TIER_WEIGHTS else "free"
+        handle = JobHandle(self, uuid.uuid4().hex, tier_name, user_id)
+        job = _Job(
+            handle, func, args, kwargs or {},
+            contextvars.copy_context(),  # carry caller/tier context onto the worker
+            priority, max(cost, 1e-6),
+            time.monotonic() + deadline if deadline is not None else None,
+            next(self._seq)
+        )
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Job scheduler is shut down")
+            if self._queued >= self.max_queue_size:
+                raise RuntimeError("Job queue is full, please try again shortly")
+
+            self._ensure_workers()
+            self._reap_finished()
+            heapq.heappush(self._flows.setdefault(tier_name, []), job)
+            self._queued += 1
+            self._jobs[handle.job_id] = handle
+            self._lock.notify()
+
+        return handle
+
+    def get_job(self, job_id: str) -> Optional[JobHandle]:
+        """Look up a job handle by id, e.g. after a Streamlit rerun"""
+        return self._jobs.get(job_id)
+
+    def queue_position(self, handle: JobHandle) -> Optional[int]:
+        """Approximate position of a queued job within its tier's queue"""
+        with self._lock:
+            flow = self._flows.get(handle.tier_name, [])
+            ahead = sorted(job for job in flow if job.handle._status == QUEUED)
+            for position, job in enumerate(ahead):
+                if job.handle is handle:
+                    return position
+        return None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, worker utilisation and outcome counts"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "queued_by_tier": {tier: len(flow) for tier, flow in self._flows.items() if flow},
+                "completed": dict(self._completed_by_status),
+                "avg_queue_wait_ms": (self._queue_wait_total / self._started_total * 1000) if self._started_total else 0.0
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and let workers exit once the queue drains"""
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _cancel(self, handle: JobHandle) -> bool:
+        with self._lock:
+            if handle._status == QUEUED:
+                # Left in its heap and skipped on dispatch
+                handle._finish(CANCELLED)
+                self._count_outcome(CANCELLED)
+                return True
+            if handle._status == RUNNING:
+                handle.cancel_requested = True
+            return False
+
+    def _ensure_workers(self):
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"job-worker-{len(self._workers)}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _has_capacity(self, job: _Job) -> bool:
+        user_id = job.handle.user_id
+        if user_id is None:
+            return True
+        return self._running_by_user.get(user_id, 0) < USER_RUNNING_LIMITS[job.handle.tier_name]
+
+    def _first_runnable(self, flow: List[_Job]) -> Optional[_Job]:
+        """First queued job in the flow, in priority order, whose user can run another. Caller holds the lock."""
+        if self._has_capacity(flow[0]):
+            return flow[0]
+        for job in sorted(flow):
+            if job.handle._status == QUEUED and self._has_capacity(job):
+                return job
+        return None
+
+    def _next_job(self) -> Optional[_Job]:
+        """Pop the next runnable job by virtual finish tag. Caller holds the lock."""
+        while True:
+            best_job = None
+            best_tier = None
+            best_tag = None
+            for tier_name, flow in self._flows.items():
+                # Drop cancelled entries and expired jobs from the head of the flow
+                while flow and flow[0].handle._status != QUEUED:
+                    heapq.heappop(flow)
+                    self._queued -= 1
+                if not flow:
+                    continue
+                job = self._first_runnable(flow)
+                if job is None:
+                    continue
+                start = max(self._virtual_time, self._finish_tags.get(tier_name, 0.0))
+                tag = start + job.cost / TIER_WEIGHTS[tier_name]
+                if best_tag is None or tag < best_tag:
+                    best_job, best_tier, best_tag = job, tier_name, tag
+
+            if best_job is None:
+                return None
+
+            job = best_job
+            flow = self._flows[best_tier]
+            if flow[0] is job:
+                heapq.heappop(flow)
+            else:
+                flow.remove(job)
+                heapq.heapify(flow)
+            self._queued -= 1
+            self._virtual_time = max(self._virtual_time, self._finish_tags.get(best_tier, 0.0))
+            self._finish_tags[best_tier] = best_tag
+
+            if job.deadline is not None and time.monotonic() > job.deadline:
+                job.handle._finish(EXPIRED)
+                self._count_outcome(EXPIRED)
+                continue
+            return job
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                while job is None:
+                    if self._shutdown:
+                        return
+                    self._lock.wait()
+                    job = self._next_job()
+
+                handle = job.handle
+                handle._status = RUNNING
+                handle.started_at = time.time()
+                self._running += 1
+                if handle.user_id is not None:
+                    self._running_by_user[handle.user_id] = self._running_by_user.get(handle.user_id, 0) + 1
+                self._started_total += 1
+                self._queue_wait_total += handle.started_at - handle.submitted_at
+
+            try:
+                result = job.context.run(job.func, *job.args, **job.kwargs)
+                status, error = SUCCEEDED, None
+            except Exception as e:
+                result, status, error = None, FAILED, e
+
+            with self._lock:
+                if handle.cancel_requested:
+                    result, status, error = None, CANCELLED, None
+                handle._finish(status, result, error)
+                self._running -= 1
+                if handle.user_id is not None:
+                    remaining = self._running_by_user.pop(handle.user_id) - 1
+                    if remaining:
+                        self._running_by_user[handle.user_id] = remaining
+                self._count_outcome(status)
+                # A job held back for this user's capacity may be runnable now
+                self._lock.notify()
+
+    def _count_outcome(self, status: str):
+        self._completed_by_status[status] = self._completed_by_status.get(status, 0) + 1
+
+    def _reap_finished(self):
+        """Forget finished jobs older than job_ttl. Caller holds the lock."""
+        cutoff = time.time() - self.job_ttl
+        for job_id in [job_id for job_id, handle in self._jobs.items()
+                       if handle.finished_at is not None and handle.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Get the process-wide job scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = JobScheduler(max_workers=int(os.getenv("JOB_SCHEDULER_WORKERS", "4")))
+    return _scheduler
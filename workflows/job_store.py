@@ -0,0 +1,288 @@
+"""
+J-Genix Studio - Generation Job Store
+Persists async Bria generations so any session or worker can reattach to in-flight work
+"""
+
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from services.responses import extract_result_urls
+
+# Job states
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_RECORD_FIELDS = (
+    "job_id", "fingerprint", "endpoint", "session_id", "status", "response",
+    "result_urls", "ready_urls", "created_at", "updated_at", "completed_at",
+    "request_ms", "error"
+)
+_JSON_FIELDS = ("response", "result_urls", "ready_urls")
+
+
+def request_fingerprint(endpoint: str, params: Dict[str, Any]) -> str:
+    """Stable hash of an endpoint and its request parameters
+
+    Byte payloads (uploaded images, masks) are reduced to their SHA-256 so
+    identical uploads fingerprint identically without storing the image.
+    Credentials should be removed from ``params`` by the caller.
+    """
+    def normalize(value):
+        if isinstance(value, (bytes, bytearray)):
+            return {"sha256": hashlib.sha256(value).hexdigest()}
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in sorted(value.items())}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    canonical = json.dumps({"endpoint": endpoint, "params": normalize(params)},
+                           sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """Interface for job persistence backends"""
+
+    def create(self, fingerprint: str, endpoint: str, session_id: Optional[str],
+               response: Any, request_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Record a newly submitted generation and return the stored record"""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id"""
+        raise NotImplementedError
+
+    def find_in_flight(self, fingerprint: str, max_age: float,
+                       exclude_session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Most recent pending job for a fingerprint, if younger than max_age seconds
+
+        Completed and failed jobs are never returned, so an identical request
+        made after a generation finishes is a new generation. Jobs started by
+        ``exclude_session_id`` are skipped too: a session repeating its own
+        request wants another result.
+        """
+        raise NotImplementedError
+
+    def mark_ready(self, job_id: str, ready_urls: List[str]) -> Optional[Dict[str, Any]]:
+        """Record result URLs that are now available; completes the job when all are ready"""
+        raise NotImplementedError
+
+    def mark_failed(self, job_id: str, error: str):
+        """Mark a job as failed (errored or timed out) so it is never reattached"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _new_record(fingerprint: str, endpoint: str, session_id: Optional[str],
+                    response: Any, request_ms: Optional[float]) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "job_id": uuid.uuid4().hex,
+            "fingerprint": fingerprint,
+            "endpoint": endpoint,
+            "session_id": session_id,
+            "status": PENDING,
+            "response": response,
+            "result_urls": extract_result_urls(response),
+            "ready_urls": [],
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None,
+            "request_ms": request_ms,
+            "error": None
+        }
+
+    @staticmethod
+    def _apply_ready(record: Dict[str, Any], ready_urls: List[str]):
+        now = time.time()
+        ready = list(record["ready_urls"])
+        ready.extend(url for url in ready_urls if url not in ready)
+        record["ready_urls"] = ready
+        record["updated_at"] = now
+        if record["status"] == PENDING and set(record["result_urls"]) <= set(ready):
+            record["status"] = COMPLETED
+            record["completed_at"] = now
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job store, for development and single-worker deployments"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, fingerprint, endpoint, session_id, response, request_ms=None):
+        record = self._new_record(fingerprint, endpoint, session_id, response, request_ms)
+        with self._lock:
+            self._jobs[record["job_id"]] = record
+        return dict(record)
+
+    def get(self, job_id):
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record else None
+
+    def find_in_flight(self, fingerprint, max_age, exclude_session_id=None):
+        cutoff = time.time() - max_age
+        with self._lock:
+            matches = [r for r in self._jobs.values()
+                       if r["fingerprint"] == fingerprint and r["status"] == PENDING
+                       and r["created_at"] >= cutoff
+                       and (exclude_session_id is None or r["session_id"] != exclude_session_id)]
+        return dict(max(matches, key=lambda r: r["created_at"])) if matches else None
+
+    def mark_ready(self, job_id, ready_urls):
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None:
+                return None
+            self._apply_ready(record, ready_urls)
+            return dict(record)
+
+    def mark_failed(self, job_id, error):
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record:
+                record.update(status=FAILED, error=error, updated_at=time.time())
+
+
+class SQLiteJobStore(JobStore):
+    """SQLite-backed job store shared by every session and worker on a host"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS generation_jobs (
+                job_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                session_id TEXT,
+                status TEXT NOT NULL,
+                response TEXT,
+                result_urls TEXT NOT NULL,
+                ready_urls TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                completed_at REAL,
+                request_ms REAL,
+                error TEXT
+            )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_generation_jobs_fingerprint "
+                "ON generation_jobs (fingerprint, created_at)"
+            )
+
+    def create(self, fingerprint, endpoint, session_id, response, request_ms=None):
+        record = self._new_record(fingerprint, endpoint, session_id, response, request_ms)
+        row = self._to_row(record)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO generation_jobs ({', '.join(_RECORD_FIELDS)}) "
+                f"VALUES ({', '.join('?' for _ in _RECORD_FIELDS)})",
+                [row[field] for field in _RECORD_FIELDS]
+            )
+        return record
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM generation_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._from_row(row)
+
+    def find_in_flight(self, fingerprint, max_age, exclude_session_id=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM generation_jobs WHERE fingerprint = ? AND status = ? "
+                "AND created_at >= ? AND (? IS NULL OR session_id IS NOT ?) "
+                "ORDER BY created_at DESC LIMIT 1",
+                (fingerprint, PENDING, time.time() - max_age, exclude_session_id, exclude_session_id)
+            ).fetchone()
+        return self._from_row(row)
+
+    def mark_ready(self, job_id, ready_urls):
+        # Read-modify-write in one transaction so concurrent pollers don't lose URLs
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            record = self._from_row(self._conn.execute(
+                "SELECT * FROM generation_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone())
+            if record is None:
+                return None
+            self._apply_ready(record, ready_urls)
+            row = self._to_row(record)
+            self._conn.execute(
+                "UPDATE generation_jobs SET status = ?, ready_urls = ?, updated_at = ?, "
+                "completed_at = ? WHERE job_id = ?",
+                (row["status"], row["ready_urls"], row["updated_at"], row["completed_at"], job_id)
+            )
+        return record
+
+    def mark_failed(self, job_id, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE generation_jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (FAILED, error, time.time(), job_id)
+            )
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(record)
+        for field in _JSON_FIELDS:
+            row[field] = json.dumps(row[field], default=_json_default)
+        return row
+
+    @staticmethod
+    def _from_row(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        record = {field: row[field] for field in _RECORD_FIELDS}
+        for field in _JSON_FIELDS:
+            record[field] = json.loads(record[field]) if record[field] is not None else None
+        return record
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode("ascii")
+    return str(value)
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """Get the process-wide job store (JOB_STORE=sqlite|memory, JOB_STORE_PATH for sqlite)"""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                if os.getenv("JOB_STORE", "sqlite") == "memory":
+                    _job_store = InMemoryJobStore()
+                else:
+                    _job_store = SQLiteJobStore(os.getenv("JOB_STORE_PATH", ".jgenix/jobs.sqlite3"))
+    return _job_store
+
+
+def set_job_store(store: JobStore):
+    """Install a custom job store backend"""
+    global _job_store
+    with _job_store_lock:
+        _job_store = store